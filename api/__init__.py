@@ -2,7 +2,9 @@
 APIパッケージ
 """
 
+from .api_rate_limiter import AIMDConcurrencyLimiter
 from .api_rate_limiter import APIRateLimiter as _APIRateLimiter
+from .api_rate_limiter import SlidingWindowRateLimiter
 from .keirin_mappings import KeirinMappings
 from .winticket import (
     WinticketStep1API,
@@ -24,6 +26,8 @@ __all__ = [
     "YenjoyAPI",
     "APIRateLimiter",
     "ApiRateLimiter",  # 後方互換性のために追加
+    "SlidingWindowRateLimiter",
+    "AIMDConcurrencyLimiter",
     "KeirinMappings",
     # 分割したステップAPI
     "WinticketStep1API",
@@ -4,7 +4,9 @@ APIリクエストのレート制限とバックオフを管理するモジュ
 
 import logging
 import random
+import threading
 import time
+from collections import deque
 from datetime import datetime
 
 
@@ -173,3 +175,118 @@ class ApiBackoff:
         self.last_retry_time[endpoint] = datetime.now()
 
         return True
+
+
+class SlidingWindowRateLimiter:
+    """
+    直近 period 秒間のリクエスト数を max_calls 回までに制限するクラス
+
+    固定間隔で待機する APIRateLimiter と異なり、上限に達していなければ待機せずに通す。
+    複数スレッドから同じインスタンスを共有できる。
+    """
+
+    def __init__(self, max_calls=5, period=1.0, logger=None):
+        """
+        初期化
+
+        Args:
+            max_calls (int): period 秒間に許可するリクエスト数
+            period (float): 計測する時間窓（秒）
+            logger: ロガーオブジェクト（省略時は標準ロガーを使用）
+        """
+        self.max_calls = max(1, int(max_calls))
+        self.period = period
+        self.logger = logger or logging.getLogger(__name__)
+        self._timestamps = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """上限を超える場合だけ、時間窓に空きが出るまで待機してから1回分を記録する"""
+        with self._lock:
+            now = time.monotonic()
+            while self._timestamps and now - self._timestamps[0] >= self.period:
+                self._timestamps.popleft()
+            if len(self._timestamps) >= self.max_calls:
+                sleep_time = self.period - (now - self._timestamps[0])
+                if sleep_time > 0:
+                    self.logger.debug(f"APIレート制限: {sleep_time:.2f}秒待機")
+                    time.sleep(sleep_time)
+                self._timestamps.popleft()
+                now = time.monotonic()
+            self._timestamps.append(now)
+
+
+class AIMDConcurrencyLimiter:
+    """
+    同時リクエスト数の上限を AIMD (加算増加・乗算減少) で調整するクラス
+
+    直近 window 件の平均応答時間が target_latency 以下なら上限を 0.5 ずつ増やし、
+    失敗時や平均応答時間が target_latency の2倍を超えた場合は上限を半分にする。
+    複数スレッドから同じインスタンスを共有できる。
+    """
+
+    def __init__(
+        self,
+        max_limit,
+        min_limit=1,
+        initial_limit=None,
+        target_latency=1.0,
+        window=20,
+        logger=None,
+    ):
+        """
+        初期化
+
+        Args:
+            max_limit (int): 同時リクエスト数の上限の最大値（スレッドプールのサイズ）
+            min_limit (int): 同時リクエスト数の上限の最小値
+            initial_limit (float): 開始時の上限（省略時は max_limit の半分）
+            target_latency (float): 目標とする平均応答時間（秒）
+            window (int): 平均応答時間の計算に使う直近のリクエスト数
+            logger: ロガーオブジェクト（省略時は標準ロガーを使用）
+        """
+        self.max_limit = max(1, int(max_limit))
+        self.min_limit = max(1, min(int(min_limit), self.max_limit))
+        if initial_limit is None:
+            initial_limit = self.max_limit / 2
+        self.limit = float(min(self.max_limit, max(self.min_limit, initial_limit)))
+        self.target_latency = target_latency
+        self.logger = logger or logging.getLogger(__name__)
+        self._latencies = deque(maxlen=max(1, int(window)))
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """実行中のリクエスト数が現在の上限未満になるまで待ってから1枠を確保する"""
+        with self._cond:
+            while self._in_flight >= int(self.limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self, latency=None, failed=False):
+        """
+        確保した枠を返し、結果に応じて上限を調整する
+
+        Args:
+            latency (float): このリクエストの応答時間（秒）
+            failed (bool): リクエストが失敗したかどうか
+        """
+        with self._cond:
+            self._in_flight -= 1
+            previous = self.limit
+            if latency is not None:
+                self._latencies.append(latency)
+            average = (
+                sum(self._latencies) / len(self._latencies) if self._latencies else 0.0
+            )
+            if failed or average > self.target_latency * 2:
+                self.limit = max(self.min_limit, self.limit * 0.5)
+                self._latencies.clear()
+            elif average <= self.target_latency:
+                self.limit = min(self.max_limit, self.limit + 0.5)
+            if int(self.limit) != int(previous):
+                self.logger.debug(
+                    f"同時リクエスト数の上限を変更: {int(previous)} -> {int(self.limit)} "
+                    f"(平均応答時間: {average:.2f}秒)"
+                )
+            self._cond.notify_all()
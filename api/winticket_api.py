@@ -2,15 +2,31 @@
 Winticketサイトの情報を取得するためのAPIクライアント
 """
 
+import calendar
 import json
 import logging
+import os
+import threading
 import time
-from datetime import datetime
+from datetime import date, datetime, timedelta
 
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # 入っていれば大きなJSONのデコードに使う (任意依存)
+except ImportError:
+    orjson = None
+
+from utils.date_util import iter_months
 
 from .api_rate_limiter import ApiBackoff, APIRateLimiter  # noqa: F401
 
+# 条件付きリクエストに 304 Not Modified が返ったことを示す _make_api_request の戻り値
+_NOT_MODIFIED = object()
+
 # バージョン情報（setup.pyや他の方法で動的に設定することも検討）
 __version__ = "0.1.0"
 
@@ -31,6 +47,9 @@ class WinticketAPI:
     # API基本URL
     BASE_URL = "https://api.winticket.jp/v1/keirin"
 
+    # 同一ホストに保持する接続数の上限
+    POOL_MAXSIZE = 8
+
     # APIエンドポイント
     ENDPOINTS = {
         "cups": "/cups",
@@ -50,7 +69,18 @@ class WinticketAPI:
         self.logger = logger or logging.getLogger(__name__)
 
         # セッション初期化
+        # 月単位などの並列取得でも接続 (TCP/TLS) を使い回せるよう、接続プールを広げておく。
+        # 切れた keep-alive 接続などの接続エラーはアダプタ側ですぐ張り直す
+        # (HTTPステータスによるリトライは _make_api_request で行う)。
+        # UpdateService 経由の場合は max_workers に合わせたアダプタで上書きされる
         self.session = requests.Session()
+        pooled_adapter = HTTPAdapter(
+            pool_connections=self.POOL_MAXSIZE,
+            pool_maxsize=self.POOL_MAXSIZE,
+            max_retries=Retry(total=3, status=0, backoff_factor=0.5),
+        )
+        self.session.mount("https://", pooled_adapter)
+        self.session.mount("http://", pooled_adapter)
 
         # ユーザーエージェント設定
         self.session.headers.update(
@@ -67,6 +97,17 @@ class WinticketAPI:
         # 最後のリクエスト時刻
         self.last_request_time = 0
 
+        # 月間開催情報のディスクキャッシュの保存先 (None の場合はキャッシュしない)
+        self.monthly_cache_dir = None
+        # 終了からこの日数が経った月は内容が変わらないとみなし、キャッシュがあればAPIを呼ばない
+        self.monthly_cache_settled_days = 30
+        # 開催詳細のディスクキャッシュの保存先 (None の場合はキャッシュしない)。
+        # ETag / Last-Modified 付きで保存し、次回は条件付きリクエストで取得する
+        self.cup_detail_cache_dir = None
+        # 304 が返りキャッシュを使った開催詳細の件数
+        self.cup_detail_cache_hits = 0
+        self._cache_hits_lock = threading.Lock()
+
         # 初期化済みフラグ
         self._initialized = True
 
@@ -89,7 +130,14 @@ class WinticketAPI:
         self.last_request_time = time.time()
 
     def _make_api_request(
-        self, endpoint, params=None, data=None, method="GET", retry_count=3
+        self,
+        endpoint,
+        params=None,
+        data=None,
+        method="GET",
+        retry_count=3,
+        headers=None,
+        response_headers=None,
     ):
         """
         APIリクエストを実行
@@ -100,6 +148,8 @@ class WinticketAPI:
             data (dict, optional): POSTリクエストのボディデータ
             method (str, optional): HTTPメソッド (GET, POSTなど)
             retry_count (int, optional): リトライ回数
+            headers (dict, optional): このリクエストだけに付けるヘッダー
+            response_headers (dict, optional): 渡された場合、成功時のレスポンスヘッダーを格納する
 
         Returns:
             dict or None: APIレスポンス（JSONをパースしたもの）、エラー時はNone
@@ -115,23 +165,25 @@ class WinticketAPI:
                 self._throttle_request()
 
                 # リクエスト前にログ出力
-                # 認証ヘッダーを除いたヘッダー情報（ログ出力用）
-                headers_for_log = {
-                    k: v
-                    for k, v in headers_with_auth.items()
-                    if k.lower() != "authorization"
-                }
-                # ボディ部分を事前に文字列化
-                body_for_log = json.dumps(data) if data else "{}"
-                debug_message = (
-                    f"API Request: {method.upper()} {url} | Params: {params} | "
-                    f"Headers: {headers_for_log} | Body: {body_for_log}"
-                )
-                self.logger.debug(debug_message)
+                debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+                if debug_enabled:
+                    # 認証ヘッダーを除いたヘッダー情報（ログ出力用）
+                    headers_for_log = {
+                        k: v
+                        for k, v in headers_with_auth.items()
+                        if k.lower() != "authorization"
+                    }
+                    # ボディ部分を事前に文字列化
+                    body_for_log = json.dumps(data) if data else "{}"
+                    debug_message = (
+                        f"API Request: {method.upper()} {url} | Params: {params} | "
+                        f"Headers: {headers_for_log} | Body: {body_for_log}"
+                    )
+                    self.logger.debug(debug_message)
 
                 # リクエスト実行
                 response = self.session.request(
-                    method, url, params=params, json=data, timeout=30
+                    method, url, params=params, json=data, headers=headers, timeout=30
                 )
 
                 # リクエスト完了ログ
@@ -140,31 +192,43 @@ class WinticketAPI:
                     f"APIレスポンス受信: {url} (ステータスコード: {response.status_code}, 処理時間: {elapsed:.2f}秒)"
                 )
 
-                # レスポンスボディをログ出力 (デバッグ用に常に出力、または status code で分岐)
-                # response.text は負荷が高い場合があるので注意。必要なら DEBUG レベルにする。
-                try:
-                    response_body_preview = response.text[
-                        :1000
-                    ]  # 長すぎる場合は切り詰める
-                    self.logger.debug(
-                        f"APIレスポンスボディ (プレビュー): {response_body_preview}"
-                    )
-                except Exception as log_err:
-                    self.logger.warning(
-                        f"レスポンスボディのロギング中にエラー: {log_err}"
-                    )
+                # レスポンスボディをログ出力
+                # response.text はボディ全体を文字列にデコードするため DEBUG のときだけ作る。
+                # 成功時のJSONデコードは response.content (バイト列) から直接行う
+                if debug_enabled:
+                    try:
+                        response_body_preview = response.text[
+                            :1000
+                        ]  # 長すぎる場合は切り詰める
+                        self.logger.debug(
+                            f"APIレスポンスボディ (プレビュー): {response_body_preview}"
+                        )
+                    except Exception as log_err:
+                        self.logger.warning(
+                            f"レスポンスボディのロギング中にエラー: {log_err}"
+                        )
 
                 # ステータスコードチェック
+                if response.status_code == 304:
+                    # 条件付きリクエストで内容が変わっていない (ボディなし)
+                    return _NOT_MODIFIED
                 if response.status_code == 200:
+                    if response_headers is not None:
+                        response_headers.update(response.headers)
                     # 成功時でも中身を確認するために DEBUG ログ
                     try:
-                        json_data = response.json()
-                        json_str = json.dumps(json_data, ensure_ascii=False, indent=2)
-                        self.logger.debug(
-                            f"API成功レスポンス (JSON): {json_str}"
-                        )  # 詳細なJSONログを追加
+                        if orjson is not None:
+                            json_data = orjson.loads(response.content)
+                        else:
+                            json_data = response.json()
+                        # 整形はコストが大きいため DEBUG が有効なときだけ行う
+                        if debug_enabled:
+                            json_str = json.dumps(
+                                json_data, ensure_ascii=False, indent=2
+                            )
+                            self.logger.debug(f"API成功レスポンス (JSON): {json_str}")
                         return json_data
-                    except json.JSONDecodeError as json_err:
+                    except ValueError as json_err:
                         self.logger.error(
                             f"API成功レスポンスのJSONデコードに失敗: {json_err}. Body: {response.text[:500]}"
                         )
@@ -235,8 +299,25 @@ class WinticketAPI:
             self.logger.error(f"無効な日付形式です: {date_str}")
             return None
 
+        cache_path = self._settled_month_cache_path(target_date)
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, encoding="utf-8") as f:
+                    cached = json.load(f)
+                self.logger.info(
+                    "%d年%02d月の開催情報をキャッシュから読み込みました",
+                    target_date.year,
+                    target_date.month,
+                )
+                return cached
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"月間開催情報キャッシュの読み込みに失敗: {e}")
+
         # APIリクエスト
-        self.logger.info(f"{target_date.strftime('%Y年%m月')}の開催情報を取得します")
+        # 月ごとに呼ばれるため、INFO を出さない設定では整形しない %-形式にしている
+        self.logger.info(
+            "%d年%02d月の開催情報を取得します", target_date.year, target_date.month
+        )
         endpoint = self.ENDPOINTS["cups"]
         params = {"date": date_str, "fields": "month", "pfm": "web"}
 
@@ -246,9 +327,13 @@ class WinticketAPI:
                 self.logger.error(f"開催情報の取得に失敗しました: {date_str}")
                 return None
 
-            self.logger.info(
-                f"{len(response.get('month', {}).get('cups', []))}件の開催情報を取得しました"
-            )
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(
+                    "%d件の開催情報を取得しました",
+                    len(response.get("month", {}).get("cups", [])),
+                )
+            if cache_path and "month" in response:
+                self._write_monthly_cache(cache_path, response)
             return response
 
         except Exception as e:
@@ -257,6 +342,55 @@ class WinticketAPI:
             )
             return None
 
+    def _settled_month_cache_path(self, target_date):
+        """
+        月間開催情報のキャッシュファイルのパスを返す。
+        キャッシュが無効な場合や、まだ内容が変わりうる月の場合は None を返す。
+        """
+        if not self.monthly_cache_dir:
+            return None
+        last_day = calendar.monthrange(target_date.year, target_date.month)[1]
+        month_end = date(target_date.year, target_date.month, last_day)
+        if date.today() - month_end < timedelta(days=self.monthly_cache_settled_days):
+            return None
+        return os.path.join(
+            os.path.expanduser(self.monthly_cache_dir),
+            f"{target_date.year}{target_date.month:02d}.json",
+        )
+
+    def _write_monthly_cache(self, cache_path, data, description="月間開催情報"):
+        """月間開催情報などをキャッシュに書き込む (書き込み途中のファイルを読まないよう置き換えで保存)"""
+        tmp_path = f"{cache_path}.tmp{os.getpid()}"
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            self.logger.warning(f"{description}キャッシュの書き込みに失敗: {e}")
+
+    def _cup_detail_cache_path(self, cup_id):
+        """開催詳細のキャッシュファイルのパス。キャッシュが無効な場合は None"""
+        if not self.cup_detail_cache_dir:
+            return None
+        return os.path.join(
+            os.path.expanduser(self.cup_detail_cache_dir), f"{cup_id}.json"
+        )
+
+    def _read_cup_detail_cache(self, cache_path):
+        """開催詳細のキャッシュ ({'etag', 'last_modified', 'data'}) を読む。無ければ None"""
+        if not cache_path or not os.path.exists(cache_path):
+            return None
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"開催詳細キャッシュの読み込みに失敗: {e}")
+            return None
+        if not isinstance(cached, dict) or "data" not in cached:
+            return None
+        return cached
+
     def get_cup_detail(self, cup_id):
         """
         特定の開催の詳細情報を取得
@@ -274,12 +408,46 @@ class WinticketAPI:
         # クエリパラメータ
         params = {"fields": "cup,schedules,races", "pfm": "web"}
 
+        # 前回の ETag / Last-Modified があれば条件付きリクエストにし、
+        # 変わっていなければ (304) ボディを受け取らずキャッシュを返す
+        cache_path = self._cup_detail_cache_path(cup_id)
+        cached = self._read_cup_detail_cache(cache_path)
+        conditional_headers = None
+        if cached:
+            conditional_headers = {}
+            if cached.get("etag"):
+                conditional_headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                conditional_headers["If-Modified-Since"] = cached["last_modified"]
+        response_headers = CaseInsensitiveDict()
+
         try:
-            response = self._make_api_request(endpoint, params)
+            response = self._make_api_request(
+                endpoint,
+                params,
+                headers=conditional_headers or None,
+                response_headers=response_headers,
+            )
+            if response is _NOT_MODIFIED:
+                with self._cache_hits_lock:
+                    self.cup_detail_cache_hits += 1
+                self.logger.info(
+                    f"開催 {cup_id} の詳細情報は更新されていないためキャッシュを使用します"
+                )
+                return cached["data"]
             if not response:
                 self.logger.error(f"開催詳細情報の取得に失敗しました: {cup_id}")
                 return None
 
+            etag = response_headers.get("ETag")
+            last_modified = response_headers.get("Last-Modified")
+            if cache_path and (etag or last_modified):
+                self._write_monthly_cache(
+                    cache_path,
+                    {"etag": etag, "last_modified": last_modified, "data": response},
+                    description="開催詳細",
+                )
+
             self.logger.info(f"開催 {cup_id} の詳細情報を取得しました")
             return response
 
@@ -626,17 +794,8 @@ class WinticketAPI:
         # 期間をカバーする月ごとのデータを取得
         events = []
 
-        # 開始年月を取得
-        current_year = start_date.year
-        current_month = start_date.month
-
-        # 終了年月を取得
-        end_year = end_date.year
-        end_month = end_date.month
-
-        while (current_year < end_year) or (
-            current_year == end_year and current_month <= end_month
-        ):
+        # 期間にかかる (年, 月) を先に列挙しておく
+        for current_year, current_month in iter_months(start_date, end_date):
             # 月初日のYYYYMMDD形式を取得
             month_str = f"{current_year}{current_month:02d}01"
 
@@ -713,13 +872,6 @@ class WinticketAPI:
             except Exception as e:
                 self.logger.error(f"{month_str}の月間データ取得中にエラー: {str(e)}")
 
-            # 次の月へ
-            if current_month == 12:
-                current_year += 1
-                current_month = 1
-            else:
-                current_month += 1
-
         self.logger.info(f"期間内のイベント {len(events)}件を取得しました")
         return events
 
@@ -5,6 +5,7 @@ YenjoyサイトからAPI経由でレースの周回情報などを取得する
 import logging
 import re
 import time
+from operator import itemgetter
 from typing import Any, Dict, List, Optional, Union  # noqa: F401
 
 # import json # 未使用のため削除
@@ -859,7 +860,7 @@ class YenjoyAPI:
                 results.append(result)
 
             # 着順でソート
-            results.sort(key=lambda x: x["rank"])
+            results.sort(key=itemgetter("rank"))
 
             return results
 
@@ -5,7 +5,9 @@
 import configparser
 import logging
 import os
+import threading
 import time
+from contextlib import contextmanager
 from datetime import date, datetime
 
 # from threading import Lock # Lock は現在未使用のためコメントアウト
@@ -13,6 +15,9 @@ from typing import Any, Dict, List, Optional, Union, Callable
 
 import mysql.connector
 from mysql.connector import pooling  # 接続プーリングのために追加
+from mysql.connector.constants import ClientFlag
+
+from utils.date_util import to_ymd
 
 
 class KeirinDataAccessor:
@@ -85,6 +90,9 @@ class KeirinDataAccessor:
         self.MAX_RETRY_ATTEMPTS = 3
         self.RETRY_DELAY_BASE = 0.5  # 基本待機時間（秒）
 
+        # transaction() で開始したスレッドごとのトランザクション (conn, broken, savepoint_seq)
+        self._tx_local = threading.local()
+
         # ロック順序設定の読み込み（一時的にスキップ）
         # self.lock_order = self._load_lock_order_config(config_path)
         self.lock_order = []
@@ -184,6 +192,11 @@ class KeirinDataAccessor:
                     config_details["port"] = 3306
             else:
                 config_details["port"] = 3306
+            if "allow_local_infile" in config_details:
+                # Step5Saver の LOAD DATA LOCAL INFILE 保存用 (文字列のままだと常に真になる)
+                config_details["allow_local_infile"] = config_details[
+                    "allow_local_infile"
+                ].strip().lower() in ("1", "true", "yes", "on")
             return config_details
         else:
             self.logger.error("MySQLの設定がconfig.iniに見つかりません。")
@@ -220,6 +233,9 @@ class KeirinDataAccessor:
                         "autocommit": True,  # 自動コミットを有効化
                     }
                 )
+                # multi_statements() の中で開く接続だけ複数文の送信を許可する
+                if getattr(self._tx_local, "multi_statements", False):
+                    config_for_direct["client_flags"] = [ClientFlag.MULTI_STATEMENTS]
 
                 conn = mysql.connector.connect(**config_for_direct)
                 self.logger.info(
@@ -333,6 +349,109 @@ class KeirinDataAccessor:
                 finally:
                     self.conn = None
 
+    def _ambient_connection(
+        self,
+    ) -> Optional[mysql.connector.connection.MySQLConnection]:
+        """このスレッドで transaction() が開始済みならその接続を返す"""
+        return getattr(self._tx_local, "conn", None)
+
+    def _mark_ambient_error(self, error: Exception) -> None:
+        """デッドロックでトランザクション全体がロールバックされた場合に記録する"""
+        if (
+            self._ambient_connection() is not None
+            and isinstance(error, mysql.connector.Error)
+            and error.errno == 1213
+        ):
+            self._tx_local.broken = True
+
+    def _raise_if_ambient_broken(self) -> None:
+        """
+        デッドロックでトランザクションがロールバック済みなら、SQL を実行せずに例外を送出する。
+        ロールバック後の接続は autocommit 相当になり、続けて実行した文が個別にコミットされてしまうため
+        """
+        if getattr(self._tx_local, "broken", False):
+            raise mysql.connector.Error(
+                msg="デッドロックによりトランザクションがロールバック済みのため、以降の処理を中断します",
+                errno=1213,
+            )
+
+    @contextmanager
+    def multi_statements(self):
+        """
+        ブロック内でこのスレッドが新しく開く直接接続だけ CLIENT_MULTI_STATEMENTS を有効にする
+        (Step5Saver の複数文一括送信用)。
+
+        Yields:
+            bool: 有効にできた場合は True。接続プール使用中や transaction() の中など、
+                既存の接続が使われる場合は False
+        """
+        tx_local = getattr(self, "_tx_local", None)
+        if (
+            tx_local is None
+            or (self.use_connection_pool and self.cnxpool)
+            or self._ambient_connection() is not None
+        ):
+            yield False
+            return
+        previous = getattr(tx_local, "multi_statements", False)
+        tx_local.multi_statements = True
+        try:
+            yield True
+        finally:
+            tx_local.multi_statements = previous
+
+    @contextmanager
+    def transaction(self):
+        """
+        ブロック内でこのスレッドから実行される execute_query / execute_many /
+        execute_in_transaction を1つの接続・1つのトランザクションにまとめ、
+        ブロック終了時に1回だけコミットする。
+
+        - execute_in_transaction はセーブポイント単位で実行され、失敗時はその呼び出し分だけ戻す
+        - ネストした場合は外側のトランザクションにそのまま参加する
+        - 別スレッドからの呼び出しは従来どおり個別の接続で実行される
+
+        Yields:
+            mysql.connector.connection.MySQLConnection: トランザクション中の接続
+        """
+        ambient_conn = self._ambient_connection()
+        if ambient_conn is not None:
+            yield ambient_conn
+            return
+
+        conn = self._get_new_connection()
+        conn.start_transaction()
+        self._tx_local.conn = conn
+        self._tx_local.broken = False
+        self._tx_local.savepoint_seq = 0
+        self.logger.debug(f"トランザクション開始 (接続ID: {conn.connection_id})")
+        try:
+            yield conn
+            if self._tx_local.broken:
+                raise mysql.connector.Error(
+                    msg="デッドロックによりトランザクションがロールバックされたためコミットできません",
+                    errno=1213,
+                )
+            conn.commit()
+            self.logger.info(
+                f"トランザクション正常終了、コミットしました (接続ID: {conn.connection_id})"
+            )
+        except Exception as e:
+            self.logger.error(
+                f"トランザクション中にエラー発生 (接続ID: {conn.connection_id}): {e}"
+            )
+            try:
+                conn.rollback()
+                self.logger.warning(
+                    f"エラーのためロールバックしました (接続ID: {conn.connection_id})"
+                )
+            except mysql.connector.Error as rb_err:
+                self.logger.error(f"ロールバック試行中エラー: {rb_err}")
+            raise
+        finally:
+            self._tx_local.conn = None
+            conn.close()
+
     def execute_query(
         self,
         query: str,
@@ -349,11 +468,17 @@ class KeirinDataAccessor:
         """
         conn = None
         cursor = None
+        ambient_conn = self._ambient_connection()
         try:
             # 既存の接続がある場合はそれを使用、なければ新しい直接接続を作成
             if existing_conn and existing_cursor:
                 conn = existing_conn
                 cursor = existing_cursor
+            elif ambient_conn is not None:
+                # transaction() 内ではその接続を使う
+                self._raise_if_ambient_broken()
+                conn = ambient_conn
+                cursor = conn.cursor(dictionary=dictionary)
             else:
                 self.logger.debug("MySQL直接接続を作成...")
                 conn = mysql.connector.connect(
@@ -389,6 +514,7 @@ class KeirinDataAccessor:
 
         except mysql.connector.Error as e:
             self.logger.error(f"execute_queryエラー: {e}", exc_info=True)
+            self._mark_ambient_error(e)
             raise
         finally:
             if cursor and not existing_cursor:
@@ -396,7 +522,7 @@ class KeirinDataAccessor:
                     cursor.close()
                 except Exception:
                     pass
-            if conn and not existing_conn:
+            if conn and not existing_conn and conn is not ambient_conn:
                 try:
                     conn.close()
                 except Exception:
@@ -436,11 +562,17 @@ class KeirinDataAccessor:
 
         conn = None
         cursor = None
+        ambient_conn = self._ambient_connection()
         try:
             # 既存の接続がある場合はそれを使用、なければ新しい直接接続を作成
             if existing_conn and existing_cursor:
                 conn = existing_conn
                 cursor = existing_cursor
+            elif ambient_conn is not None:
+                # transaction() 内ではその接続を使う
+                self._raise_if_ambient_broken()
+                conn = ambient_conn
+                cursor = conn.cursor()
             else:
                 self.logger.debug("MySQL直接接続を作成...")
                 conn = mysql.connector.connect(
@@ -466,6 +598,7 @@ class KeirinDataAccessor:
 
         except mysql.connector.Error as e:
             self.logger.error(f"execute_manyエラー: {e}", exc_info=True)
+            self._mark_ambient_error(e)
             raise
         finally:
             if cursor and not existing_cursor:
@@ -473,7 +606,7 @@ class KeirinDataAccessor:
                     cursor.close()
                 except Exception:
                     pass
-            if conn and not existing_conn:
+            if conn and not existing_conn and conn is not ambient_conn:
                 try:
                     conn.close()
                 except Exception:
@@ -493,6 +626,13 @@ class KeirinDataAccessor:
         Raises:
             Exception: トランザクション内でエラーが発生した場合
         """
+        ambient_conn = self._ambient_connection()
+        if ambient_conn is not None:
+            # transaction() 内ではセーブポイントで区切り、コミットは transaction() に任せる
+            return self._execute_in_savepoint(
+                ambient_conn, transaction_func, *args, **kwargs
+            )
+
         conn = None
         try:
             conn = self._get_new_connection()
@@ -569,6 +709,38 @@ class KeirinDataAccessor:
                     f"トランザクション後、接続をプールに返却しました (接続ID: {conn_id})"
                 )
 
+    def _execute_in_savepoint(
+        self,
+        conn: mysql.connector.connection.MySQLConnection,
+        transaction_func,
+        *args,
+        **kwargs,
+    ) -> Any:
+        """transaction() の接続上で、セーブポイントを切って関数を実行する"""
+        self._raise_if_ambient_broken()
+        self._tx_local.savepoint_seq += 1
+        savepoint = f"sp_{self._tx_local.savepoint_seq}"
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"SAVEPOINT {savepoint}")
+            result = transaction_func(conn, *args, **kwargs)
+            cursor.execute(f"RELEASE SAVEPOINT {savepoint}")
+            return result
+        except Exception as e:
+            self._mark_ambient_error(e)
+            if not self._tx_local.broken:
+                try:
+                    cursor.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+                    self.logger.warning(
+                        f"エラーのためセーブポイント {savepoint} までロールバックしました "
+                        f"(接続ID: {conn.connection_id})"
+                    )
+                except mysql.connector.Error as rb_err:
+                    self.logger.error(f"セーブポイントへのロールバック中エラー: {rb_err}")
+            raise
+        finally:
+            cursor.close()
+
     def get_winticket_races_to_update(
         self,
         venue_id: str,
@@ -921,14 +1093,9 @@ WHERE table_schema = DATABASE()
                     race_date_val = row.get("race_date_db")
                     if isinstance(
                         race_date_val,
-                        datetime,
-                    ):
-                        row["race_date_db"] = race_date_val.strftime("%Y-%m-%d")
-                    elif isinstance(
-                        race_date_val,
-                        date,
+                        date,  # datetime も含む
                     ):
-                        row["race_date_db"] = race_date_val.isoformat()
+                        row["race_date_db"] = to_ymd(race_date_val)
                     elif race_date_val is not None:
                         try:
                             if isinstance(
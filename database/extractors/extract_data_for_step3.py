@@ -2,6 +2,9 @@ import logging
 import threading
 from typing import Any, Dict, List, Optional  # noqa: F401
 
+# extract_bulk で1回のIN句に入れる開催IDの数
+_CUP_ID_CHUNK_SIZE = 500
+
 
 class Step3DataExtractor:
     def __init__(self, database, logger: Optional[logging.Logger] = None):
@@ -58,22 +61,13 @@ class Step3DataExtractor:
             f"{status_condition}"
         )
         try:
-            rows = self.database.execute_query(query, (start_date, end_date))
-            if rows:
-                for row in rows:
-                    extracted_data["races_for_update"].append(
-                        {
-                            "race_id": str(row.get("race_id")),
-                            "cup_id": str(row.get("cup_id")),
-                            "schedule_id": (
-                                str(row.get("schedule_id"))
-                                if row.get("schedule_id")
-                                else None
-                            ),
-                            "number": row.get("number"),
-                            "race_index": row.get("race_index"),
-                        }
-                    )
+            # 行数が多いので辞書カーソルではなくタプルで受け取る (列順は SELECT 句の順)
+            rows = self.database.execute_query(
+                query, (start_date, end_date), dictionary=False
+            )
+            extracted_data["races_for_update"] = [
+                self._row_to_race(row) for row in rows or []
+            ]
             self.logger.info(
                 f"スレッド {thread_id}: ステップ3のデータ抽出完了 (更新対象レース: {len(extracted_data['races_for_update'])} 件)"
             )
@@ -82,6 +76,73 @@ class Step3DataExtractor:
             self.logger.error(f"Step3抽出中にエラー: {e}", exc_info=True)
             return extracted_data
 
+    def extract_bulk(
+        self, cup_ids: List[str], force_update_all: bool = False
+    ) -> Dict[str, List[Dict]]:
+        """
+        複数の開催IDについて、ステップ3の更新対象レースを1回のクエリ (IN句) でまとめて抽出する。
+
+        Args:
+            cup_ids (list of str): 対象の開催IDのリスト
+            force_update_all (bool, optional): race_status の step3_status を無視して抽出するかどうか。
+
+        Returns:
+            dict: {cup_id: [{'race_id': str, 'cup_id': str, ...}, ...]}
+                  (対象レースがない開催IDも空リストで含む)
+        """
+        races_by_cup: Dict[str, List[Dict]] = {
+            str(cup_id): [] for cup_id in cup_ids
+        }
+        if not races_by_cup:
+            return races_by_cup
+
+        status_condition = ""
+        if not force_update_all:
+            status_condition = (
+                " AND (rs.step3_status != 'completed' OR rs.step3_status IS NULL)"
+            )
+
+        cup_id_list = list(races_by_cup)
+        try:
+            for i in range(0, len(cup_id_list), _CUP_ID_CHUNK_SIZE):
+                chunk = cup_id_list[i : i + _CUP_ID_CHUNK_SIZE]
+                placeholders = ", ".join(["%s"] * len(chunk))
+                query = (
+                    "SELECT r.race_id, r.cup_id, r.schedule_id, r.number, s.schedule_index AS race_index "
+                    "FROM races r JOIN schedules s ON r.schedule_id = s.schedule_id "
+                    "LEFT JOIN race_status rs ON r.race_id = rs.race_id "
+                    f"WHERE r.cup_id IN ({placeholders})"
+                    f"{status_condition}"
+                )
+                rows = self.database.execute_query(
+                    query, tuple(chunk), dictionary=False
+                )
+                for row in rows or []:
+                    race = self._row_to_race(row)
+                    races_by_cup.setdefault(race["cup_id"], []).append(race)
+            self.logger.info(
+                f"ステップ3のデータ抽出完了 (開催 {len(cup_id_list)} 件, 更新対象レース: "
+                f"{sum(len(races) for races in races_by_cup.values())} 件)"
+            )
+        except Exception as e:
+            self.logger.error(f"Step3抽出中にエラー: {e}", exc_info=True)
+        return races_by_cup
+
+    @staticmethod
+    def _row_to_race(row: tuple) -> Dict[str, Any]:
+        """
+        抽出結果の1行 (race_id, cup_id, schedule_id, number, race_index) を
+        Step3Updater に渡すレース情報の辞書に変換する
+        """
+        race_id, cup_id, schedule_id, number, race_index = row
+        return {
+            "race_id": str(race_id),
+            "cup_id": str(cup_id),
+            "schedule_id": str(schedule_id) if schedule_id else None,
+            "number": number,
+            "race_index": race_index,
+        }
+
     def _extract_existing_player_ids(self) -> List[str]:
         """既存のプレイヤーIDリストを抽出するヘルパーメソッド（例）"""
         try:
@@ -18,6 +18,7 @@ class Step5DataExtractor:
         start_date_filter: Optional[str] = None,
         end_date_filter: Optional[str] = None,
         force: bool = False,
+        venue_codes: Optional[List[str]] = None,
     ) -> List[Dict]:
         """
         指定された日付範囲のレース情報から、結果取得用 URL 構築に必要な情報を抽出する。
@@ -27,10 +28,14 @@ class Step5DataExtractor:
             end_date_filter (Optional[str]): 抽出対象のレース開催日の終了日 (YYYY-MM-DD)
             force (bool, optional): 処理済み (lap_data_status.is_processed=1) のレースも強制的に抽出するかどうか。
                                     Defaults to False.
+            venue_codes (Optional[List[str]], optional): 対象の会場コード。None の場合は全会場。
 
         Returns:
             List[Dict]: 抽出されたレース情報のリスト。各辞書には URL 構築に必要なキーが含まれる。
                         日付範囲が無効またはデータがない場合は空リスト。
+
+        Raises:
+            Exception: DB からの抽出に失敗した場合
         """
         thread_id = threading.get_ident()
         self.logger.info(
@@ -51,7 +56,7 @@ class Step5DataExtractor:
                 rows = self.database.get_yenjoy_races_to_update_for_step5(
                     start_date_filter,
                     end_date_filter,
-                    venue_codes=None,
+                    venue_codes=venue_codes,
                     force_update_all=force,
                 )
                 self.logger.info(
@@ -79,7 +84,58 @@ class Step5DataExtractor:
             )
             return rows or []
         except Exception as e:
+            # 空リストを返すと「対象なし」と区別できないため、呼び出し元へ送出する
             self.logger.error(
                 f"[Thread-{thread_id}] Step 5 抽出中にエラー: {e}", exc_info=True
             )
+            raise
+
+    def extract_by_race_ids(
+        self, race_ids: List[str], force: bool = False
+    ) -> List[Dict]:
+        """
+        指定されたレースIDについて、結果取得用 URL 構築に必要な情報を1回のクエリで抽出する。
+
+        Args:
+            race_ids (List[str]): 対象のレースIDのリスト
+            force (bool, optional): 処理済み (lap_data_status.is_processed=1) のレースも抽出するかどうか。
+                                    Defaults to False.
+
+        Returns:
+            List[Dict]: extract と同じ形式のレース情報のリスト。
+
+        Raises:
+            Exception: DB からの抽出に失敗した場合
+        """
+        thread_id = threading.get_ident()
+        if not race_ids:
             return []
+
+        placeholders = ", ".join(["%s"] * len(race_ids))
+        status_condition = ""
+        if not force:
+            status_condition = " AND (lds.is_processed = 0 OR lds.race_id IS NULL)"
+        sql = (
+            "SELECT r.race_id, "
+            "COALESCE(DATE_FORMAT(FROM_UNIXTIME(r.start_at),'%Y-%m-%d'), DATE_FORMAT(STR_TO_DATE(s.date,'%Y%m%d'),'%Y-%m-%d')) AS race_date_db, "
+            "c.venue_id AS venue_code, r.number AS race_number, "
+            "s.date AS race_date_yyyymmdd, DATE_FORMAT(c.start_date,'%Y%m%d') AS cup_start_date_yyyymmdd "
+            "FROM races r JOIN schedules s ON r.schedule_id=s.schedule_id "
+            "JOIN cups c ON s.cup_id=c.cup_id "
+            "LEFT JOIN lap_data_status lds ON r.race_id = lds.race_id "
+            f"WHERE r.race_id IN ({placeholders}){status_condition} "
+            "ORDER BY r.start_at, c.venue_id, r.number"
+        )
+        try:
+            rows = self.database.execute_query(sql, tuple(race_ids))
+            self.logger.info(
+                f"[Thread-{thread_id}] Step 5 抽出(レースID指定): {len(rows) if rows else 0} 件 "
+                f"(指定: {len(race_ids)} 件)"
+            )
+            return rows or []
+        except Exception as e:
+            # 空リストを返すと「対象なし」と区別できないため、呼び出し元へ送出する
+            self.logger.error(
+                f"[Thread-{thread_id}] Step 5 抽出中にエラー: {e}", exc_info=True
+            )
+            raise
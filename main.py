@@ -580,13 +580,10 @@ class KeirinDataCLI:
             return
 
         print("\n=== 更新結果 ===")
-        for step, result in results.items():
-            if isinstance(result, dict):
-                status = "成功" if result.get("success", False) else "失敗"
-                count = result.get("count", 0)
-                print(f"{step}: {status} ({count}件)")
-            else:
-                print(f"{step}: {result}")
+        for step, result in results.get("steps", {}).items():
+            # result は UpdateService の StepResult
+            status = "成功" if result.success else "失敗"
+            print(f"{step}: {status} ({result.count}件)")
 
     def _check_database_status(self):
         """データベース接続状態の確認"""
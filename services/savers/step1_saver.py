@@ -3,14 +3,28 @@
 """
 
 import logging
+import os
+import tempfile
 from datetime import datetime
+from itertools import chain
 from typing import Any, Dict, List, Optional  # 型ヒントのため追加
 
 # KeirinDataAccessorをインポートする想定
 from database.db_accessor import KeirinDataAccessor  # パスは環境に合わせてください
+from utils.date_util import to_ymd
 
 # import pandas as pd # pandas は使用しないので削除
 
+# 複数行 INSERT 1文あたりの最大行数 (max_allowed_packet を超えないように分割する)
+MULTI_ROW_INSERT_CHUNK_SIZE = 5000
+
+# LOAD DATA LOCAL INFILE で cups を保存する際の一時テーブル。
+# cups に REPLACE すると DELETE 扱いになり schedules などが ON DELETE CASCADE で
+# 消えるため、一時テーブルに読み込んでから ON DUPLICATE KEY UPDATE で反映する
+_CUPS_LOAD_TABLE = "cups_load_tmp"
+# LOAD DATA のデフォルトエスケープ (ESCAPED BY '\\') に合わせたフィールド変換
+_LOAD_DATA_ESCAPE_TABLE = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n"})
+
 
 class Step1Saver:
     """
@@ -18,7 +32,10 @@ class Step1Saver:
     """
 
     def __init__(
-        self, accessor: KeirinDataAccessor, logger: logging.Logger = None
+        self,
+        accessor: KeirinDataAccessor,
+        logger: logging.Logger = None,
+        cups_load_infile_threshold: int = 0,
     ):  # db_instance を accessor に変更し型ヒント追加
         """
         初期化
@@ -26,9 +43,13 @@ class Step1Saver:
         Args:
             accessor (KeirinDataAccessor): データベースアクセサーインスタンス
             logger (logging.Logger, optional): ロガーオブジェクト。 Defaults to None.
+            cups_load_infile_threshold (int, optional): この件数以上のカップ情報は
+                LOAD DATA LOCAL INFILE で保存する (0 で無効)。接続の allow_local_infile と
+                サーバの local_infile=1 が必要。 Defaults to 0.
         """
         self.accessor = accessor  # KeirinDataAccessor のインスタンスを保持
         self.logger = logger or logging.getLogger(__name__)
+        self.cups_load_infile_threshold = cups_load_infile_threshold
 
     def save_regions_batch(self, regions_data: List[Dict[str, Any]]):
         """
@@ -66,29 +87,23 @@ class Step1Saver:
             self.logger.info("整形後、保存対象の地域データがありませんでした。")
             return
 
-        query = """
-        INSERT INTO regions (region_id, region_name)
-        VALUES (%s, %s)
-        ON DUPLICATE KEY UPDATE region_name = VALUES(region_name)
-        """
+        cols = ["region_id", "region_name"]
         params_list = [(data["region_id"], data["region_name"]) for data in to_save]
 
         self.logger.info(f"地域情報保存開始: {len(params_list)}件のデータ")
         self.logger.debug(
             f"地域情報データ例: {params_list[:2] if params_list else 'なし'}"
         )
-        self.logger.debug(f"使用クエリ: {query}")
 
         try:
-            self.logger.info("execute_many実行中...")
-            affected = self.accessor.execute_many(query, params_list)
-            self.logger.info(f"execute_many完了! 影響行数: {affected}")
-            self.logger.info("地域情報の保存処理が正常に完了しました。")
+            sent = self._upsert_multi_row("regions", cols, "region_id", params_list)
+            self.logger.info(
+                f"地域情報の保存処理が正常に完了しました。送信行数: {sent}"
+            )
         except Exception as e:
             self.logger.error(
                 f"地域情報の保存中にエラーが発生しました: {e}", exc_info=True
             )
-            self.logger.error(f"失敗したクエリ: {query}")
             self.logger.error(
                 f"失敗したデータ: {params_list[:3] if params_list else 'なし'}"
             )
@@ -177,26 +192,14 @@ class Step1Saver:
             "centerWidth",
         ]
 
-        cols_sql = ", ".join([f"`{col}`" for col in cols])
-        values_sql = ", ".join(["%s"] * len(cols))
-        update_sql_parts = [
-            f"`{col}` = VALUES(`{col}`)" for col in cols if col != "venue_id"
-        ]
-        update_sql = ", ".join(update_sql_parts)
-
-        query = f"""
-        INSERT INTO venues ({cols_sql})
-        VALUES ({values_sql})
-        ON DUPLICATE KEY UPDATE {update_sql}
-        """
         params_list = []
         for data_dict in to_save:
             params_list.append(tuple(data_dict.get(col) for col in cols))
 
         try:
-            affected = self.accessor.execute_many(query, params_list)
+            sent = self._upsert_multi_row("venues", cols, "venue_id", params_list)
             self.logger.info(
-                f"会場情報の保存処理が正常に完了しました。影響行数: {affected}"
+                f"会場情報の保存処理が正常に完了しました。送信行数: {sent}"
             )
         except Exception as e:
             self.logger.error(
@@ -285,26 +288,18 @@ class Step1Saver:
             "players_unfixed",
         ]
 
-        cols_sql = ", ".join([f"`{col}`" for col in cols])
-        values_sql = ", ".join(["%s"] * len(cols))
-        update_sql_parts = [
-            f"`{col}` = VALUES(`{col}`)" for col in cols if col != "cup_id"
-        ]
-        update_sql = ", ".join(update_sql_parts)
-
-        query = f"""
-        INSERT INTO cups ({cols_sql})
-        VALUES ({values_sql})
-        ON DUPLICATE KEY UPDATE {update_sql}
-        """
         params_list = []
         for data_dict in to_save:
             params_list.append(tuple(data_dict.get(col) for col in cols))
 
         try:
-            affected = self.accessor.execute_many(query, params_list)
+            threshold = self.cups_load_infile_threshold
+            if threshold and len(params_list) >= threshold:
+                sent = self._load_cups_infile(cols, params_list)
+            else:
+                sent = self._upsert_multi_row("cups", cols, "cup_id", params_list)
             self.logger.info(
-                f"カップ情報の保存処理が正常に完了しました。影響行数: {affected}"
+                f"カップ情報の保存処理が正常に完了しました。送信行数: {sent}"
             )
         except Exception as e:
             self.logger.error(
@@ -312,6 +307,105 @@ class Step1Saver:
             )
             raise
 
+    def _upsert_multi_row(
+        self, table: str, cols: List[str], key_col: str, params_list: List[tuple]
+    ) -> int:
+        """
+        INSERT ... VALUES (...),(...),... ON DUPLICATE KEY UPDATE を
+        MULTI_ROW_INSERT_CHUNK_SIZE 行ごとに1文で実行する。
+        行ごとに往復しないので、件数が多いほど executemany より速い。
+
+        Returns:
+            int: 送信した行数の合計
+        """
+        cols_sql = ", ".join([f"`{col}`" for col in cols])
+        row_sql = "(" + ", ".join(["%s"] * len(cols)) + ")"
+        update_sql = ", ".join(
+            [f"`{col}` = VALUES(`{col}`)" for col in cols if col != key_col]
+        )
+
+        sent = 0
+        for start in range(0, len(params_list), MULTI_ROW_INSERT_CHUNK_SIZE):
+            chunk = params_list[start : start + MULTI_ROW_INSERT_CHUNK_SIZE]
+            query = (
+                f"INSERT INTO {table} ({cols_sql}) VALUES "
+                + ", ".join([row_sql] * len(chunk))
+                + f" ON DUPLICATE KEY UPDATE {update_sql}"
+            )
+            # transaction() 内ならその接続、外なら autocommit 接続で実行される
+            self.accessor.execute_query(
+                query, tuple(chain.from_iterable(chunk)), dictionary=False
+            )
+            sent += len(chunk)
+        return sent
+
+    def _load_cups_infile(self, cols: List[str], params_list: List[tuple]) -> int:
+        """
+        カップ情報をタブ区切りの一時ファイルに書き出し、LOAD DATA LOCAL INFILE で
+        一時テーブルに読み込んでから cups に INSERT ... SELECT で反映する。
+        一時テーブルは接続ごとなので、全体を1つの transaction() 内で実行する。
+
+        Returns:
+            int: 読み込んだ行数
+        """
+        cols_sql = ", ".join([f"`{col}`" for col in cols])
+        update_sql = ", ".join(
+            [f"`{col}` = VALUES(`{col}`)" for col in cols if col != "cup_id"]
+        )
+
+        with tempfile.NamedTemporaryFile(
+            mode="w",
+            encoding="utf-8",
+            newline="\n",
+            suffix=".tsv",
+            prefix="cups_",
+            delete=False,
+        ) as f:
+            tmp_path = f.name
+            for row in params_list:
+                f.write(
+                    "\t".join(
+                        (
+                            "\\N"
+                            if v is None
+                            else str(v).translate(_LOAD_DATA_ESCAPE_TABLE)
+                        )
+                        for v in row
+                    )
+                )
+                f.write("\n")
+
+        try:
+            with self.accessor.transaction():
+                self.accessor.execute_query(
+                    f"DROP TEMPORARY TABLE IF EXISTS {_CUPS_LOAD_TABLE}"
+                )
+                # LIKE では外部キーは複製されない
+                self.accessor.execute_query(
+                    f"CREATE TEMPORARY TABLE {_CUPS_LOAD_TABLE} LIKE cups"
+                )
+                self.accessor.execute_query(
+                    f"LOAD DATA LOCAL INFILE %s INTO TABLE {_CUPS_LOAD_TABLE} "
+                    "CHARACTER SET utf8mb4 "
+                    "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+                    f"LINES TERMINATED BY '\\n' ({cols_sql})",
+                    (tmp_path,),
+                )
+                self.accessor.execute_query(
+                    f"INSERT INTO cups ({cols_sql}) "
+                    f"SELECT {cols_sql} FROM {_CUPS_LOAD_TABLE} "
+                    f"ON DUPLICATE KEY UPDATE {update_sql}"
+                )
+                self.accessor.execute_query(
+                    f"DROP TEMPORARY TABLE IF EXISTS {_CUPS_LOAD_TABLE}"
+                )
+            self.logger.info(
+                f"{len(params_list)}件のカップ情報を LOAD DATA LOCAL INFILE で保存/更新"
+            )
+            return len(params_list)
+        finally:
+            os.remove(tmp_path)
+
     def _format_date(self, date_str: Any) -> Optional[str]:
         """日付文字列を YYYY-MM-DD 形式に変換、不正な場合はNoneを返す"""
         if not date_str or not isinstance(date_str, str):
@@ -322,7 +416,7 @@ class Step1Saver:
                 return datetime.strptime(date_str, "%Y%m%d").strftime("%Y-%m-%d")
             # YYYY-MM-DD HH:MM:SS (または YYYY-MM-DD) 形式を試す
             dt_obj = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-            return dt_obj.strftime("%Y-%m-%d")
+            return to_ymd(dt_obj)
         except ValueError:
             # YYYY-MM-DD 単独の形式も試す
             try:
@@ -332,15 +426,39 @@ class Step1Saver:
                 self.logger.warning(f"不正な日付形式です: {date_str}")
                 return None
 
+    def save_monthly_bulk(
+        self,
+        regions_data: List[Dict[str, Any]],
+        venues_data: List[Dict[str, Any]],
+        cups_data: List[Dict[str, Any]],
+    ):
+        """
+        整形済みの地域・会場・カップ情報を1つのトランザクションで保存/更新する。
+        コミットは1回だけで、どれかの保存に失敗した場合は3テーブル分とも取り消して例外を送出する。
+        (呼び出し元で transaction() 中の場合は、その中のセーブポイントまで戻す)
+
+        Args:
+            regions_data (List[Dict[str, Any]]): save_regions_batch と同じ形式の地域情報
+            venues_data (List[Dict[str, Any]]): save_venues_batch と同じ形式の会場情報
+            cups_data (List[Dict[str, Any]]): save_cups_batch と同じ形式のカップ情報
+        """
+
+        def _save_all(_conn):
+            # transaction() 内なので各 save_*_batch の execute_many は同じ接続で実行される
+            self.save_regions_batch(regions_data)
+            self.save_venues_batch(venues_data)
+            self.save_cups_batch(cups_data)
+
+        with self.accessor.transaction():
+            self.accessor.execute_in_transaction(_save_all)
+
     def save_monthly_cups(self, monthly_data: Dict[str, Any]):
         """
         月間開催情報をアトミックに保存するメソッド。
         regions, venues, cups のデータをトランザクション内で処理する。
         """
         if not monthly_data or "month" not in monthly_data:
-            self.logger.error(
-                "月間開催情報データが不正です。'month' キーが見つかりません。"
-            )
+            self.logger.error("月間開催情報データが不正です。'month' キーが見つかりません。")
             return False, []
 
         month_content = monthly_data.get("month", {})
@@ -458,9 +576,7 @@ class Step1Saver:
                 )
 
         if not to_save:
-            self.logger.info(
-                "(Atomic) 整形後、保存対象の地域データがありませんでした。"
-            )
+            self.logger.info("(Atomic) 整形後、保存対象の地域データがありませんでした。")
             return
 
         query = """
@@ -527,9 +643,7 @@ class Step1Saver:
             to_save.append(data)
 
         if not to_save:
-            self.logger.info(
-                "(Atomic) 整形後、保存対象の会場データがありませんでした。"
-            )
+            self.logger.info("(Atomic) 整形後、保存対象の会場データがありませんでした。")
             return
 
         cols = [
@@ -638,9 +752,7 @@ class Step1Saver:
             to_save.append(data)
 
         if not to_save:
-            self.logger.info(
-                "(Atomic) 整形後、保存対象のカップデータがありませんでした。"
-            )
+            self.logger.info("(Atomic) 整形後、保存対象のカップデータがありませんでした。")
             return
 
         cols = [
@@ -4,10 +4,46 @@
 
 import logging
 from datetime import datetime, timezone
+from itertools import chain
 from typing import Any, Dict, List, Optional, Tuple
 
 # KeirinDataAccessorをインポート
 from database.db_accessor import KeirinDataAccessor  # パスは環境に合わせてください
+from utils.date_util import to_ymd
+
+# schedules / races テーブルに保存するカラム (保存用タプルの並び順)
+_SCHEDULE_COLS = [
+    "schedule_id",
+    "cup_id",
+    "date",
+    "day",
+    "schedule_index",
+    "entries_unfixed",
+]
+_RACE_COLS = [
+    "race_id",
+    "cup_id",
+    "schedule_id",
+    "number",
+    "class",
+    "race_type",
+    "start_at",
+    "close_at",
+    "status",
+    "cancel",
+    "cancel_reason",
+    "weather",
+    "wind_speed",
+    "race_type3",
+    "distance",
+    "lap",
+    "entries_number",
+    "is_grade_race",
+    "has_digest_video",
+    "digest_video",
+    "digest_video_provider",
+    "decided_at",
+]
 
 
 class Step2Saver:
@@ -15,16 +51,24 @@ class Step2Saver:
     ステップ2: 開催詳細情報を保存するクラス (MySQL対応)
     """
 
-    def __init__(self, accessor: KeirinDataAccessor, logger: logging.Logger = None):
+    def __init__(
+        self,
+        accessor: KeirinDataAccessor,
+        logger: logging.Logger = None,
+        bulk_chunk_size: int = 5000,
+    ):
         """
         初期化
 
         Args:
             accessor (KeirinDataAccessor): データベースアクセサーインスタンス
             logger (logging.Logger, optional): ロガーオブジェクト。 Defaults to None.
+            bulk_chunk_size (int, optional): save_*_bulk で複数行 INSERT 1文にまとめる
+                最大行数 (max_allowed_packet を超えないように分割する)。 Defaults to 5000.
         """
         self.accessor = accessor
         self.logger = logger or logging.getLogger(__name__)
+        self.bulk_chunk_size = max(1, bulk_chunk_size)
 
     def _to_timestamp(self, datetime_str: Optional[str]) -> Optional[int]:
         """
@@ -63,7 +107,7 @@ class Step2Saver:
             dt_obj = datetime.fromisoformat(
                 date_str.split(" ")[0].replace("Z", "+00:00")
             )
-            return dt_obj.strftime("%Y-%m-%d")
+            return to_ymd(dt_obj)
         except ValueError:
             # YYYY-MM-DD 単独の形式も試す
             try:
@@ -73,6 +117,35 @@ class Step2Saver:
                 self.logger.warning(f"不正な日付形式です: {date_str}")
             return None
 
+    def _schedule_params(
+        self, schedule_data: Dict[str, Any], cup_id: str
+    ) -> Optional[tuple]:
+        """
+        スケジュール情報1件を schedules テーブル保存用のタプル (_SCHEDULE_COLS の順) にする。
+        スケジュールIDが無い場合は警告を出して None を返す。
+        """
+        schedule_id = str(schedule_data.get("id", ""))
+        if not schedule_id:
+            self.logger.warning(f"スケジュールIDが不足しています: {schedule_data}")
+            return None
+
+        return (
+            schedule_id,
+            cup_id,
+            self._format_date(schedule_data.get("date")),
+            (
+                int(schedule_data.get("day", 0))
+                if schedule_data.get("day") is not None
+                else None
+            ),
+            (
+                int(schedule_data.get("index", 0))
+                if schedule_data.get("index") is not None
+                else None
+            ),
+            1 if schedule_data.get("entriesUnfixed") else 0,
+        )
+
     def save_schedules_batch(
         self, schedules_api_data: List[Dict[str, Any]], cup_id: str
     ):
@@ -97,71 +170,25 @@ class Step2Saver:
             )
             return
 
-        to_save = []
+        params_list = []
         for schedule_data in schedules_api_data:
-            schedule_id = str(schedule_data.get("id", ""))
-            if not schedule_id:
-                self.logger.warning(f"スケジュールIDが不足しています: {schedule_data}")
-                continue
+            params = self._schedule_params(schedule_data, cup_id)
+            if params is not None:
+                params_list.append(params)
 
-            formatted_date = self._format_date(schedule_data.get("date"))
-
-            data = {
-                "schedule_id": schedule_id,
-                "cup_id": cup_id,
-                "date": formatted_date,
-                "day": (
-                    int(schedule_data.get("day", 0))
-                    if schedule_data.get("day") is not None
-                    else None
-                ),
-                "schedule_index": (
-                    int(schedule_data.get("index", 0))
-                    if schedule_data.get("index") is not None
-                    else None
-                ),
-                "entries_unfixed": 1 if schedule_data.get("entriesUnfixed") else 0,
-            }
-            to_save.append(data)
-
-        if not to_save:
+        if not params_list:
             self.logger.info(
                 f"カップID {cup_id} の整形後、保存対象のスケジュールデータがありませんでした。"
             )
             return
 
-        cols = [
-            "schedule_id",
-            "cup_id",
-            "date",
-            "day",
-            "schedule_index",
-            "entries_unfixed",
-        ]
-        cols_sql = ", ".join([f"`{col}`" for col in cols])
-        values_sql = ", ".join(["%s"] * len(cols))
-        update_sql_parts = [
-            f"`{col}` = VALUES(`{col}`)" for col in cols if col != "schedule_id"
-        ]
-        update_sql = ", ".join(update_sql_parts)
-
-        query = f"""
-        INSERT INTO schedules ({cols_sql})
-        VALUES ({values_sql})
-        ON DUPLICATE KEY UPDATE {update_sql}
-        """
-        params_list = [
-            tuple(data_dict.get(col) for col in cols) for data_dict in to_save
-        ]
-
         try:
-            # Linux/低メモリ(1GB)向けに安全なバルク保存: アクセサ側で
-            #   - チャンク分割 executemany
-            #   - チャンク失敗時はrow-by-rowフォールバック
-            # を実装済み。ここでは一括で委譲する。
-            affected = self.accessor.execute_many(query, params_list)
+            # 1文の複数行 INSERT ... ON DUPLICATE KEY UPDATE で送る
+            sent = self._upsert_multi_row(
+                "schedules", _SCHEDULE_COLS, "schedule_id", params_list
+            )
             self.logger.info(
-                f"カップID {cup_id}: {len(params_list)}件のスケジュール情報を保存/更新しました。影響行数: {affected}"
+                f"カップID {cup_id}: {sent}件のスケジュール情報を保存/更新しました。"
             )
         except Exception as e:
             self.logger.error(
@@ -198,140 +225,8 @@ class Step2Saver:
 
         for race_info in races_data:
             try:
-                race_id = str(race_info["race_id"])  # 必須キー
-
-                schedule_id_original = race_info.get("schedule_id")
-                schedule_id_to_save = (
-                    str(schedule_id_original)
-                    if schedule_id_original is not None
-                    else None
-                )
-
-                cup_id_to_save = str(race_info.get("cup_id", cup_id))
-
-                race_number_val = race_info.get("number")
-                race_number = (
-                    int(race_number_val) if race_number_val is not None else None
-                )
-
-                race_class_name = (
-                    str(race_info.get("class"))
-                    if race_info.get("class") is not None
-                    else None
-                )
-                race_type_val = race_info.get("race_type")
-                race_type = (
-                    str(race_type_val) if race_type_val is not None else None
-                )  # 明示的にstr変換
-
-                start_at = race_info.get("start_at")
-                close_at = race_info.get("close_at")
-
-                status_val = race_info.get("status")
-                status = int(status_val) if status_val is not None else None
-
-                cancel_val = race_info.get("cancel")
-                cancel = (
-                    cancel_val
-                    if isinstance(cancel_val, bool)
-                    else (
-                        str(cancel_val).lower() == "true"
-                        if cancel_val is not None
-                        else False
-                    )
-                )
-
-                cancel_reason = (
-                    str(race_info.get("cancel_reason"))
-                    if race_info.get("cancel_reason") is not None
-                    else None
-                )
-                weather = (
-                    str(race_info.get("weather"))
-                    if race_info.get("weather") is not None
-                    else None
-                )
-
-                wind_speed_val = race_info.get("wind_speed")
-                # wind_speed は VARCHAR なので、float変換は不要。そのまま文字列で。
-                wind_speed = str(wind_speed_val) if wind_speed_val is not None else None
-
-                race_type3 = (
-                    str(race_info.get("race_type3"))
-                    if race_info.get("race_type3") is not None
-                    else None
-                )
-
-                distance_val = race_info.get("distance")
-                distance = int(distance_val) if distance_val is not None else None
-
-                lap_val = race_info.get("lap")
-                lap = int(lap_val) if lap_val is not None else None
-
-                entries_number_val = race_info.get("entries_number")
-                entries_number = (
-                    int(entries_number_val) if entries_number_val is not None else None
-                )
-
-                is_grade_race_val = race_info.get("is_grade_race")
-                is_grade_race = (
-                    is_grade_race_val
-                    if isinstance(is_grade_race_val, bool)
-                    else (
-                        str(is_grade_race_val).lower() == "true"
-                        if is_grade_race_val is not None
-                        else False
-                    )
-                )
-
-                has_digest_video_val = race_info.get("has_digest_video")
-                has_digest_video = (
-                    has_digest_video_val
-                    if isinstance(has_digest_video_val, bool)
-                    else (
-                        str(has_digest_video_val).lower() == "true"
-                        if has_digest_video_val is not None
-                        else False
-                    )
-                )
-
-                digest_video = (
-                    str(race_info.get("digest_video"))
-                    if race_info.get("digest_video") is not None
-                    else None
-                )
-                # digest_video_provider は VARCHAR(255) なので文字列でOK
-                digest_video_provider = (
-                    str(race_info.get("digest_video_provider"))
-                    if race_info.get("digest_video_provider") is not None
-                    else None
-                )
-                decided_at = race_info.get("decided_at")
-
-                race_params = (
-                    race_id,
-                    cup_id_to_save,
-                    schedule_id_to_save,
-                    race_number,
-                    race_class_name,
-                    race_type,
-                    start_at,
-                    close_at,
-                    status,
-                    cancel,
-                    cancel_reason,
-                    weather,
-                    wind_speed,
-                    race_type3,
-                    distance,
-                    lap,
-                    entries_number,
-                    is_grade_race,
-                    has_digest_video,
-                    digest_video,
-                    digest_video_provider,
-                    decided_at,
-                )
+                race_params = self._race_params(race_info, cup_id)
+                race_id = race_params[0]
                 params_list_races.append(race_params)
                 successfully_prepared_race_ids.append(
                     race_id
@@ -379,32 +274,7 @@ class Step2Saver:
                 "error_details": "No races to save after processing / filtering",
             }
 
-        cols = [
-            "race_id",
-            "cup_id",
-            "schedule_id",
-            "number",
-            "`class`",
-            "race_type",
-            "start_at",
-            "close_at",
-            "status",
-            "cancel",
-            "cancel_reason",
-            "weather",
-            "wind_speed",
-            "race_type3",
-            "distance",
-            "lap",
-            "entries_number",
-            "is_grade_race",
-            "has_digest_video",
-            "digest_video",
-            "digest_video_provider",
-            "decided_at",
-        ]
-
-        num_expected_params = len(cols)
+        num_expected_params = len(_RACE_COLS)
         if params_list_races and len(params_list_races[0]) != num_expected_params:
             msg = (
                 f"カップID {cup_id}: Racesテーブルへのパラメータ数が一致しません。"
@@ -418,37 +288,20 @@ class Step2Saver:
                 "error_details": "Races parameter count mismatch",
             }
 
-        cols_sql = ", ".join(cols)
-        values_sql = ", ".join(["%s"] * len(cols))
-        update_sql_parts = [
-            f"{col_name} = VALUES({col_name})"
-            for col_name in cols
-            if col_name != "race_id"
-        ]
-        update_sql = ", ".join(update_sql_parts)
-
-        query_races = f"""
-        INSERT INTO races ({cols_sql})
-        VALUES ({values_sql})
-        ON DUPLICATE KEY UPDATE {update_sql}
-        """
-
         saved_race_count = 0
         try:
-            affected = self.accessor.execute_many(query_races, params_list_races)
-            saved_race_count = len(params_list_races)
+            # レース全件を複数行の INSERT ... ON DUPLICATE KEY UPDATE
+            # (bulk_chunk_size 行ごとに1文) で送る
+            saved_race_count = self._upsert_multi_row(
+                "races", _RACE_COLS, "race_id", params_list_races
+            )
             self.logger.info(
-                f"カップID {cup_id}: {saved_race_count} 件のレース情報をDBに保存/更新しました。影響行数: {affected}"
+                f"カップID {cup_id}: {saved_race_count} 件のレース情報をDBに保存/更新しました。"
             )
 
             if (
                 successfully_prepared_race_ids
             ):  # race_status は保存試行した全IDに対して行う
-                status_query = """
-                INSERT INTO race_status (race_id)
-                VALUES (%s)
-                ON DUPLICATE KEY UPDATE race_id = VALUES(race_id)
-                """
                 # ここで使うIDは、実際にINSERT/UPDATEが試みられたID (エラーで中断された場合も含む)
                 # ただし、racesテーブルへのFK制約で失敗する前にrace_statusを更新しても意味がないので、
                 # やはりracesテーブルへの書き込みが成功したIDのみを対象とすべき。
@@ -461,7 +314,9 @@ class Step2Saver:
                 ]
                 if status_params_list:  # リストが空でないことを確認
                     try:
-                        self.accessor.execute_many(status_query, status_params_list)
+                        self._upsert_multi_row(
+                            "race_status", ["race_id"], "race_id", status_params_list
+                        )
                         self.logger.info(
                             f"カップID {cup_id}: {len(status_params_list)}件のrace_statusレコードを初期化/確認しました。"
                         )
@@ -490,6 +345,302 @@ class Step2Saver:
                 "error_details": str(e),
             }
 
+    def _upsert_multi_row(
+        self, table: str, cols: List[str], key_col: str, params_list: List[tuple]
+    ) -> int:
+        """
+        INSERT ... VALUES (...),(...),... ON DUPLICATE KEY UPDATE を
+        bulk_chunk_size 行ごとに1文で実行し、送信した行数を返す
+        """
+        cols_sql = ", ".join([f"`{col}`" for col in cols])
+        row_sql = "(" + ", ".join(["%s"] * len(cols)) + ")"
+        # キー列しか無いテーブル (race_status など) はキー自身を更新して重複を無視する
+        update_cols = [col for col in cols if col != key_col] or [key_col]
+        update_sql = ", ".join([f"`{col}` = VALUES(`{col}`)" for col in update_cols])
+
+        sent = 0
+        chunk_size = self.bulk_chunk_size
+        for start in range(0, len(params_list), chunk_size):
+            chunk = params_list[start : start + chunk_size]
+            self.accessor.execute_query(
+                f"INSERT INTO {table} ({cols_sql}) VALUES "
+                + ", ".join([row_sql] * len(chunk))
+                + f" ON DUPLICATE KEY UPDATE {update_sql}",
+                tuple(chain.from_iterable(chunk)),
+                dictionary=False,
+            )
+            sent += len(chunk)
+        return sent
+
+    def save_cups_bulk(
+        self, schedules_data: List[Dict[str, Any]], races_data: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        複数開催分のスケジュール・レース情報 (と race_status の行) を1つのトランザクションで
+        保存/更新する。各要素は save_schedules_batch / save_races_batch と同じ形式で、
+        加えて 'cup_id' を持つこと。
+
+        整形できない行は schedule_skipped / skipped に記録して除外する。まとめて送った INSERT が失敗した場合は、同じトランザクション内で開催ごとに
+        セーブポイントを切って送り直し、失敗した開催の行だけを errors に記録する。
+        トランザクション自体が失敗した場合 (デッドロック等) は呼び出し元へ送出する。
+
+        Returns:
+            Dict[str, Any]: {'saved_schedules': 保存スケジュール数, 'count': 保存レース数,
+                             'processed_race_ids': 保存した race_id のリスト,
+                             'schedule_errors': [(schedules_data の添字, エラー内容), ...],
+                             'errors': [(races_data の添字, エラー内容), ...],
+                             'schedule_skipped': [(schedules_data の添字, 整形エラー内容), ...],
+                             'skipped': [(races_data の添字, 整形エラー内容), ...]}
+        """
+        schedule_rows: List[Tuple[int, tuple]] = []
+        schedule_skipped: List[Tuple[int, str]] = []
+        for idx, schedule_data in enumerate(schedules_data):
+            cup_id = str(schedule_data.get("cup_id"))
+            try:
+                params = self._schedule_params(schedule_data, cup_id)
+            except (KeyError, ValueError, TypeError) as e:
+                self.logger.error(
+                    f"カップID {cup_id} のスケジュールデータ {schedule_data.get('id', 'N/A')} の整形中にエラー: {e}"
+                )
+                schedule_skipped.append((idx, str(e)))
+                continue
+            if params is not None:
+                schedule_rows.append((idx, params))
+
+        race_rows: List[Tuple[int, tuple]] = []
+        skipped: List[Tuple[int, str]] = []
+        for idx, race_info in enumerate(races_data):
+            cup_id = str(race_info.get("cup_id"))
+            try:
+                race_rows.append((idx, self._race_params(race_info, cup_id)))
+            except (KeyError, ValueError, TypeError) as e:
+                self.logger.error(
+                    f"カップID {cup_id} のレースデータ {race_info.get('race_id', 'N/A')} の整形中にエラー: {e}"
+                )
+                skipped.append((idx, str(e)))
+
+        schedule_errors: List[Tuple[int, str]] = []
+        errors: List[Tuple[int, str]] = []
+        if not schedule_rows and not race_rows:
+            self.logger.info("一括保存対象のスケジュール・レースデータがありません。")
+        else:
+            with self.accessor.transaction():
+                try:
+                    self.accessor.execute_in_transaction(
+                        self._upsert_cup_rows, schedule_rows, race_rows
+                    )
+                except Exception as e:
+                    self.logger.warning(
+                        f"スケジュール・レースの一括保存に失敗したため、開催ごとに保存し直します: {e}"
+                    )
+                    rows_by_cup: Dict[str, Tuple[list, list]] = {}
+                    for idx, params in schedule_rows:
+                        rows_by_cup.setdefault(params[1], ([], []))[0].append(
+                            (idx, params)
+                        )
+                    for idx, params in race_rows:
+                        rows_by_cup.setdefault(params[1], ([], []))[1].append(
+                            (idx, params)
+                        )
+                    for cup_id, cup_rows in rows_by_cup.items():
+                        cup_schedule_rows, cup_race_rows = cup_rows
+                        try:
+                            self.accessor.execute_in_transaction(
+                                self._upsert_cup_rows, cup_schedule_rows, cup_race_rows
+                            )
+                        except Exception as e_cup:
+                            self.logger.error(
+                                f"カップID {cup_id} のスケジュール・レース保存中にエラー: {e_cup}"
+                            )
+                            schedule_errors.extend(
+                                (idx, str(e_cup)) for idx, _ in cup_schedule_rows
+                            )
+                            errors.extend((idx, str(e_cup)) for idx, _ in cup_race_rows)
+
+        failed_schedule_idx = {idx for idx, _ in schedule_errors}
+        failed_race_idx = {idx for idx, _ in errors}
+        saved_schedules = sum(
+            1 for idx, _ in schedule_rows if idx not in failed_schedule_idx
+        )
+        race_ids = [
+            params[0] for idx, params in race_rows if idx not in failed_race_idx
+        ]
+        self.logger.info(
+            f"{saved_schedules}件のスケジュール情報と {len(race_ids)}件のレース情報"
+            f" (race_status 含む) を一括保存/更新しました。"
+            f" 保存できなかった行: スケジュール {len(schedule_errors)}件, レース {len(errors)}件"
+        )
+        return {
+            "saved_schedules": saved_schedules,
+            "count": len(race_ids),
+            "processed_race_ids": race_ids,
+            "schedule_errors": schedule_errors,
+            "errors": errors,
+            "schedule_skipped": schedule_skipped,
+            "skipped": skipped,
+        }
+
+    def _upsert_cup_rows(
+        self,
+        conn,
+        schedule_rows: List[Tuple[int, tuple]],
+        race_rows: List[Tuple[int, tuple]],
+    ) -> None:
+        """
+        save_cups_bulk 用: (添字, 保存用タプル) のリストを schedules → races → race_status
+        の順に複数行 INSERT で送る (races は schedules を参照するためスケジュールが先)。
+        conn は execute_in_transaction から渡されるが、各文は transaction() の接続で実行される
+        """
+        if schedule_rows:
+            self._upsert_multi_row(
+                "schedules",
+                _SCHEDULE_COLS,
+                "schedule_id",
+                [params for _, params in schedule_rows],
+            )
+        if race_rows:
+            self._upsert_multi_row(
+                "races", _RACE_COLS, "race_id", [params for _, params in race_rows]
+            )
+            self._upsert_multi_row(
+                "race_status",
+                ["race_id"],
+                "race_id",
+                [(params[0],) for _, params in race_rows],
+            )
+
+    def _race_params(self, race_info: Dict[str, Any], cup_id: str) -> tuple:
+        """
+        整形済みのレース情報1件を races テーブル保存用のタプル (_RACE_COLS の順) にする。
+        race_id が無い場合は KeyError、数値項目が不正な場合は ValueError を送出する。
+        """
+        race_id = str(race_info["race_id"])  # 必須キー
+
+        schedule_id_original = race_info.get("schedule_id")
+        schedule_id_to_save = (
+            str(schedule_id_original) if schedule_id_original is not None else None
+        )
+
+        cup_id_to_save = str(race_info.get("cup_id", cup_id))
+
+        race_number_val = race_info.get("number")
+        race_number = int(race_number_val) if race_number_val is not None else None
+
+        race_class_name = (
+            str(race_info.get("class")) if race_info.get("class") is not None else None
+        )
+        race_type_val = race_info.get("race_type")
+        race_type = (
+            str(race_type_val) if race_type_val is not None else None
+        )  # 明示的にstr変換
+
+        start_at = race_info.get("start_at")
+        close_at = race_info.get("close_at")
+
+        status_val = race_info.get("status")
+        status = int(status_val) if status_val is not None else None
+
+        cancel_val = race_info.get("cancel")
+        cancel = (
+            cancel_val
+            if isinstance(cancel_val, bool)
+            else (
+                str(cancel_val).lower() == "true" if cancel_val is not None else False
+            )
+        )
+
+        cancel_reason = (
+            str(race_info.get("cancel_reason"))
+            if race_info.get("cancel_reason") is not None
+            else None
+        )
+        weather = (
+            str(race_info.get("weather"))
+            if race_info.get("weather") is not None
+            else None
+        )
+
+        wind_speed_val = race_info.get("wind_speed")
+        # wind_speed は VARCHAR なので、float変換は不要。そのまま文字列で。
+        wind_speed = str(wind_speed_val) if wind_speed_val is not None else None
+
+        race_type3 = (
+            str(race_info.get("race_type3"))
+            if race_info.get("race_type3") is not None
+            else None
+        )
+
+        distance_val = race_info.get("distance")
+        distance = int(distance_val) if distance_val is not None else None
+
+        lap_val = race_info.get("lap")
+        lap = int(lap_val) if lap_val is not None else None
+
+        entries_number_val = race_info.get("entries_number")
+        entries_number = (
+            int(entries_number_val) if entries_number_val is not None else None
+        )
+
+        is_grade_race_val = race_info.get("is_grade_race")
+        is_grade_race = (
+            is_grade_race_val
+            if isinstance(is_grade_race_val, bool)
+            else (
+                str(is_grade_race_val).lower() == "true"
+                if is_grade_race_val is not None
+                else False
+            )
+        )
+
+        has_digest_video_val = race_info.get("has_digest_video")
+        has_digest_video = (
+            has_digest_video_val
+            if isinstance(has_digest_video_val, bool)
+            else (
+                str(has_digest_video_val).lower() == "true"
+                if has_digest_video_val is not None
+                else False
+            )
+        )
+
+        digest_video = (
+            str(race_info.get("digest_video"))
+            if race_info.get("digest_video") is not None
+            else None
+        )
+        # digest_video_provider は VARCHAR(255) なので文字列でOK
+        digest_video_provider = (
+            str(race_info.get("digest_video_provider"))
+            if race_info.get("digest_video_provider") is not None
+            else None
+        )
+        decided_at = race_info.get("decided_at")
+
+        return (
+            race_id,
+            cup_id_to_save,
+            schedule_id_to_save,
+            race_number,
+            race_class_name,
+            race_type,
+            start_at,
+            close_at,
+            status,
+            cancel,
+            cancel_reason,
+            weather,
+            wind_speed,
+            race_type3,
+            distance,
+            lap,
+            entries_number,
+            is_grade_race,
+            has_digest_video,
+            digest_video,
+            digest_video_provider,
+            decided_at,
+        )
+
     def _atomic_save_schedules(
         self, conn, cursor, schedules_api_data: List[Dict[str, Any]], cup_id: str
     ):
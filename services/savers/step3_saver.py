@@ -8,6 +8,7 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
 from database.db_accessor import KeirinDataAccessor
+from utils.date_util import to_ymd
 
 
 class Step3Saver:
@@ -73,7 +74,7 @@ class Step3Saver:
             dt_obj = datetime.fromisoformat(
                 date_str.split(" ")[0].replace("Z", "+00:00")
             )  # YYYY-MM-DD HH:MM:SS or YYYY-MM-DD
-            return dt_obj.strftime("%Y-%m-%d")
+            return to_ymd(dt_obj)
         except ValueError:
             try:  # YYYY-MM-DD
                 datetime.strptime(date_str, "%Y-%m-%d")
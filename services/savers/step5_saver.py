@@ -2,33 +2,462 @@
 ステップ5: HTMLパース結果 (レース結果、周回、コメント等) のデータセーバー (MySQL対応)
 """
 
+import json
 import logging
+import os
+import queue
 import re
+import tempfile
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from database.db_accessor import KeirinDataAccessor
 
+# 周回位置JSONのエンコーダ/デコーダ（区切り文字の空白を省いてDB転送量を削減）
+_LAP_JSON_ENCODE = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+_LAP_JSON_DECODE = json.JSONDecoder().decode
+
+# 周回セクション名 -> lap_positionsテーブルのカラム名
+_SECTION_KEY_MAPPING = {
+    "周回": "lap_shuukai",
+    "赤板": "lap_akaban",
+    "打鐘": "lap_dasho",
+    "HS": "lap_hs",
+    "BS": "lap_bs",
+}
+_LAP_SECTION_KEYS = frozenset(_SECTION_KEY_MAPPING)
+_EMPTY_SECTIONS = ("lap_shuukai", "lap_akaban", "lap_dasho", "lap_hs", "lap_bs")
+
+_LAP_POSITIONS_INSERT_SQL = (
+    "INSERT INTO lap_positions "
+    "(`race_id`, `lap_shuukai`, `lap_akaban`, `lap_dasho`, `lap_hs`, `lap_bs`) "
+    "VALUES (%s, %s, %s, %s, %s, %s) "
+    "ON DUPLICATE KEY UPDATE "
+    "`lap_shuukai` = VALUES(`lap_shuukai`), `lap_akaban` = VALUES(`lap_akaban`), "
+    "`lap_dasho` = VALUES(`lap_dasho`), `lap_hs` = VALUES(`lap_hs`), "
+    "`lap_bs` = VALUES(`lap_bs`)"
+)
+
+# 大量の周回データを LOAD DATA LOCAL INFILE で読み込む場合のSQL (ファイルパスはパラメータ)
+_LAP_POSITIONS_LOAD_DATA_SQL = (
+    "LOAD DATA LOCAL INFILE %s REPLACE INTO TABLE lap_positions "
+    "CHARACTER SET utf8mb4 "
+    "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+    "LINES TERMINATED BY '\\n' "
+    "(`race_id`, `lap_shuukai`, `lap_akaban`, `lap_dasho`, `lap_hs`, `lap_bs`)"
+)
+# LOAD DATA のデフォルトエスケープ (ESCAPED BY '\\') に合わせたフィールド変換
+_LOAD_DATA_ESCAPE_TABLE = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n"})
+
+# save_parsed_html_data が保存対象とする parsed_data のキー
+_PARSED_HTML_DATA_KEYS = (
+    "race_results",
+    "race_comments",
+    "inspection_reports",
+    "lap_positions",
+)
+
+# lap_positionsテーブルのカラム名 -> 周回番号（step5_updater_old.pyと同じ）
+_SECTION_LAP_NUMBERS = {
+    "lap_shuukai": 1,
+    "lap_akaban": 2,
+    "lap_dasho": 3,
+    "lap_hs": 4,
+    "lap_bs": 5,
+}
+
+_RACE_RESULT_COLS = (
+    "race_id",
+    "bracket_number",
+    "rank",
+    "rank_text",
+    "mark",
+    "player_name",
+    "player_id",
+    "age",
+    "prefecture",
+    "period",
+    "class",
+    "diff",
+    "time",
+    "last_lap_time",
+    "winning_technique",
+    "symbols",
+    "win_factor",
+    "personal_status",
+)
+_RACE_RESULTS_INSERT_SQL = (
+    "INSERT INTO race_results ({cols}) VALUES ({values}) "
+    "ON DUPLICATE KEY UPDATE {updates}".format(
+        cols=", ".join(f"`{col}`" for col in _RACE_RESULT_COLS),
+        values=", ".join(["%s"] * len(_RACE_RESULT_COLS)),
+        updates=", ".join(
+            f"`{col}` = VALUES(`{col}`)"
+            for col in _RACE_RESULT_COLS
+            if col not in ("race_id", "bracket_number")
+        ),
+    )
+)
+
+_RACE_COMMENTS_INSERT_SQL = (
+    "INSERT INTO race_comments (`race_id`, `comment`) VALUES (%s, %s) "
+    "ON DUPLICATE KEY UPDATE `comment` = VALUES(`comment`)"
+)
+
+_INSPECTION_REPORTS_INSERT_SQL = (
+    "INSERT INTO inspection_reports (`race_id`, `player`, `comment`) "
+    "VALUES (%s, %s, %s) "
+    "ON DUPLICATE KEY UPDATE `player` = VALUES(`player`), `comment` = VALUES(`comment`)"
+)
+
+_LAP_DATA_STATUS_BULK_UPSERT_SQL = (
+    "INSERT INTO lap_data_status (`race_id`, `is_processed`, `last_checked_at`) "
+    "VALUES (%s, %s, %s) "
+    "ON DUPLICATE KEY UPDATE "
+    "`is_processed` = IFNULL(VALUES(`is_processed`), `is_processed`), "
+    "`last_checked_at` = IFNULL(VALUES(`last_checked_at`), `last_checked_at`)"
+)
+
+# 単一レース用の lap_data_status 保存で使う列とSQL。
+# 列は固定なので、(is_processed あり, last_checked_at あり) の組み合わせごとに
+# 完成したSQL文を import 時に作っておく。
+_LAP_STATUS_COLS = ("race_id", "is_processed", "last_checked_at")
+_LAP_STATUS_INSERT_PREFIX = "INSERT INTO lap_data_status ({}) VALUES ({})".format(
+    ", ".join(f"`{col}`" for col in _LAP_STATUS_COLS),
+    ", ".join(["%s"] * len(_LAP_STATUS_COLS)),
+)
+_LAP_STATUS_ODKU_SQL = {
+    (True, True): _LAP_STATUS_INSERT_PREFIX
+    + " ON DUPLICATE KEY UPDATE `is_processed` = VALUES(`is_processed`), "
+    "`last_checked_at` = VALUES(`last_checked_at`)",
+    (True, False): _LAP_STATUS_INSERT_PREFIX
+    + " ON DUPLICATE KEY UPDATE `is_processed` = VALUES(`is_processed`)",
+    (False, True): _LAP_STATUS_INSERT_PREFIX
+    + " ON DUPLICATE KEY UPDATE `last_checked_at` = VALUES(`last_checked_at`)",
+    # INSERT IGNORE は重複以外のエラーも握りつぶすため、衝突時のみ何もしない形にする
+    (False, False): _LAP_STATUS_INSERT_PREFIX
+    + " ON DUPLICATE KEY UPDATE `race_id` = `race_id`",
+}
+# 全列を更新する lap_data_status 保存を ON DUPLICATE KEY UPDATE ではなく REPLACE INTO で行う。
+# lap_data_status は race_id が主キーで、他テーブルから参照されていないため
+# delete+insert になっても影響しない。一部の列だけ更新する場合は REPLACE だと
+# 未指定の列が NULL/デフォルトに戻るため、従来どおり ON DUPLICATE KEY UPDATE を使う。
+USE_REPLACE_INTO = True
+_LAP_STATUS_REPLACE_SQL = "REPLACE" + _LAP_STATUS_INSERT_PREFIX[len("INSERT") :]
+
+# executemany を複数行INSERT1文に書き換えてもらうための形式チェック (PyMySQL の
+# INSERT_VALUES_RE と同じ。mysql-connector-python の書き換え条件もこれで満たされる)。
+# 末尾コメントや複数のVALUES句が入ると行ごとのINSERTに退化するため、import時に検証する。
+_INSERT_VALUES_RE = re.compile(
+    r"\s*((?:INSERT|REPLACE)\b.+\bVALUES?\s*)"
+    r"(\(\s*(?:%s|%\(.+\)s)\s*(?:,\s*(?:%s|%\(.+\)s)\s*)*\))"
+    r"(\s*(?:AS\s.*)?(?:ON DUPLICATE.*)?);?\s*\Z",
+    re.IGNORECASE | re.DOTALL,
+)
+for _batch_sql in (
+    _RACE_RESULTS_INSERT_SQL,
+    _LAP_POSITIONS_INSERT_SQL,
+    _INSPECTION_REPORTS_INSERT_SQL,
+    _LAP_DATA_STATUS_BULK_UPSERT_SQL,
+):
+    assert _INSERT_VALUES_RE.match(
+        _batch_sql
+    ), f"一括INSERT形式ではありません: {_batch_sql}"
+del _batch_sql
+
+# lap_positions をドライバの executemany 書き換えに頼らず、自前で複数行VALUESの1文にする
+(
+    _LAP_POSITIONS_MULTI_INSERT_PREFIX,
+    _LAP_POSITIONS_ROW_PLACEHOLDER,
+    _LAP_POSITIONS_MULTI_INSERT_SUFFIX,
+) = _INSERT_VALUES_RE.match(_LAP_POSITIONS_INSERT_SQL).groups()
+
+# 大量の lap_positions 保存中だけセッションの制約検査を止める/戻すSQL
+_SESSION_RELAX_CHECKS_SQL = "SET SESSION unique_checks = 0, foreign_key_checks = 0"
+_SESSION_RESTORE_CHECKS_SQL = "SET SESSION unique_checks = 1, foreign_key_checks = 1"
+
+# update_race_step5_status_batch で1文のINSERTにまとめるレース数 (max_allowed_packet 対策)
+_LAP_STATUS_TOUCH_CHUNK_SIZE = 1000
+
+_MYSQL_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# 検車場レポートの選手名に付く順位情報 "(1着)" など
+_RANK_SUFFIX_RE = re.compile(r"\([^)]*\)")
+
+
+# 周回位置の行タプル:
+# (lap_number, section_key, player_order, bracket_number, player_name, x, y, has_arrow)
+# section_key は lap_positions テーブルのカラム名 (lap_shuukai 等)
+_LAP_ORDER_KEY = itemgetter(2)
+
+
+# 周回位置データ(辞書形式)の各項目について、優先順に参照するキー
+_BRACKET_KEYS = ("bracket_number_snapshot", "bike_no", "bracket_number")
+_PLAYER_NAME_KEYS = ("player_name_snapshot", "racer_name", "player_name")
+_X_COORD_KEYS = ("x_coord", "x_position")
+_Y_COORD_KEYS = ("y_coord", "y_position")
+_INDICATOR_KEYS = ("indicator_type", "arrow", "has_arrow")
+
+
+def _first(d: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    """keys を順に参照し、最初に見つかったNone以外の値を返す"""
+    for k in keys:
+        v = d.get(k)
+        if v is not None:
+            return v
+    return None
+
+
+@lru_cache(maxsize=1024)
+def _normalize_mysql_datetime(datetime_str: str) -> Optional[str]:
+    """
+    日時文字列をMySQLのDATETIME形式 (UTC, "%Y-%m-%d %H:%M:%S") に正規化する。
+    既にその形式であればそのまま返し、変換できない場合はNoneを返す。
+    """
+    if not datetime_str or datetime_str == "0000-00-00 00:00:00":
+        return None
+    try:
+        if "T" not in datetime_str:
+            datetime.strptime(datetime_str, _MYSQL_DATETIME_FORMAT)
+            return datetime_str
+        dt_obj = datetime.fromisoformat(datetime_str.replace("Z", "+00:00"))
+        if dt_obj.tzinfo is not None:
+            dt_obj = dt_obj.astimezone(timezone.utc)
+        return dt_obj.strftime(_MYSQL_DATETIME_FORMAT)
+    except ValueError:
+        return None
+
+
+def _parse_rank(rank_value: Any) -> Optional[int]:
+    """着順を整数に変換する（数字以外の着順はNone）"""
+    if isinstance(rank_value, int):
+        return rank_value
+    if isinstance(rank_value, str) and rank_value.isdigit():
+        return int(rank_value)
+    return None
+
+
+def _encode_lap_section(section_rows: List[Tuple]) -> Optional[str]:
+    """セクション内の行タプルを選手順に並べてJSON文字列化する（空ならNone）"""
+    if not section_rows:
+        return None
+    return _LAP_JSON_ENCODE(
+        [
+            [r[3], r[4], r[5], r[6], r[7]]
+            for r in sorted(section_rows, key=_LAP_ORDER_KEY)
+        ]
+    )
+
+
+def _make_empty_sections() -> Dict[str, List[Any]]:
+    return {k: [] for k in _EMPTY_SECTIONS}
+
+
+def _build_lap_row(
+    lap_number: Any,
+    section_key: str,
+    player_order: Any,
+    bracket_number: Any,
+    player_name: Any,
+    x_coord: Any,
+    y_coord: Any,
+    has_arrow: bool,
+) -> Tuple:
+    """周回位置データ1件を保存用の行タプルに整形する"""
+    return (
+        int(lap_number),
+        section_key,
+        int(player_order),
+        int(bracket_number) if bracket_number is not None else None,
+        str(player_name),
+        int(x_coord) if x_coord is not None else None,
+        int(y_coord) if y_coord is not None else None,
+        bool(has_arrow),
+    )
+
+
+class _Step5WriteCursor:
+    """
+    Step5 の書き込み用カーソル。
+
+    use_prepared が有効な場合、execute() はSQL文ごとにサーバサイドのプリペアド
+    カーソルを1つずつ作って使い回す (同一トランザクション内で同じ文を何度も送る
+    コメントや lap_data_status の単一行保存で、文のパースを1回で済ませるため)。
+    executemany() は複数行INSERTへの書き換えを活かすため通常カーソルで実行する
+    (プリペアドカーソルの executemany は1行ずつ実行になる)。
+    ドライバがプリペアドカーソルを作れない場合は通常カーソルにフォールバックする。
+    行数によって文が変わる複数行INSERTは execute(..., prepare=False) で通常カーソルに
+    送る (文の形ごとにプリペアドステートメントが増え、max_prepared_stmt_count を使い切るため)。
+
+    use_multi_statements が有効な場合は execute()/executemany() を送らずにため込み、
+    flush() でセミコロン区切りの1回の execute(multi=True) として送る (プリペアドは
+    複数文を扱えないため併用しない)。executemany() はここで複数行VALUESに展開する。
+    ドライバが execute(multi=True) に対応していない場合 (mysql-connector-python 9.2 以降)
+    は、ため込んだ文を1文ずつ送り、以降は複数文送信を使わない。
+    ため込んだ文のエラーは flush() まで分からないため、失敗を無視して続ける文は
+    その前後で flush() を呼び、エラーを送った箇所の try で受け取ること。
+    """
+
+    # ドライバが execute(multi=True) に対応していないと分かったら True (プロセス内で共有)
+    _multi_unsupported = False
+
+    def __init__(
+        self,
+        conn,
+        use_prepared: bool,
+        logger: logging.Logger,
+        use_multi_statements: bool = False,
+    ):
+        self._conn = conn
+        self._cursor = conn.cursor()
+        use_multi_statements = (
+            use_multi_statements and not _Step5WriteCursor._multi_unsupported
+        )
+        self._use_prepared = use_prepared and not use_multi_statements
+        self._stmt_cache: Dict[str, Any] = {}
+        self._use_multi_statements = use_multi_statements
+        # ため込んだ (SQL, パラメータ) の組。1文ずつ送るフォールバックのため文ごとに持つ
+        self._pending: List[Tuple[str, tuple]] = []
+        self.logger = logger
+
+    def execute(self, sql: str, params: Any = None, prepare: bool = True) -> None:
+        if sql.startswith("LOAD DATA"):
+            # LOAD DATA はプリペアド・複数文送信に対応しないため、
+            # ため込んだ文を先に送ってから通常カーソルで即時実行する
+            self.flush()
+            self._cursor.execute(sql, params)
+            return
+        if self._use_multi_statements:
+            self._pending.append((sql, tuple(params or ())))
+            return
+        cursor = self._cursor_for(sql) if prepare else self._cursor
+        cursor.execute(sql, params)
+
+    def executemany(self, sql: str, seq_params: Any) -> None:
+        if self._use_multi_statements:
+            rows = list(seq_params)
+            if not rows:
+                return
+            prefix, values, suffix = _INSERT_VALUES_RE.match(sql).groups()
+            self._pending.append(
+                (
+                    prefix + ",".join([values] * len(rows)) + suffix,
+                    tuple(chain.from_iterable(rows)),
+                )
+            )
+            return
+        self._cursor.executemany(sql, seq_params)
+
+    def flush(self) -> None:
+        """ため込んだ文を1回の往復で送り、全ての結果セットを読み捨てる"""
+        if not self._pending:
+            return
+        pending = self._pending
+        self._pending = []
+        if len(pending) > 1 and self._use_multi_statements:
+            combined_sql = ";\n".join(sql for sql, _ in pending)
+            params = tuple(chain.from_iterable(p for _, p in pending))
+            try:
+                results = self._cursor.execute(combined_sql, params, multi=True)
+            except TypeError as e:
+                # multi 引数が廃止されたドライバ。文は送られていないので1文ずつ送り直す
+                self.logger.warning(
+                    f"ドライバが execute(multi=True) に対応していないため、1文ずつ送信します: {e}"
+                )
+                _Step5WriteCursor._multi_unsupported = True
+                self._use_multi_statements = False
+            else:
+                for _ in results:
+                    pass
+                return
+        for sql, params in pending:
+            self._cursor.execute(sql, params)
+
+    def _cursor_for(self, sql: str):
+        if not self._use_prepared:
+            return self._cursor
+        prepared = self._stmt_cache.get(sql)
+        if prepared is None:
+            try:
+                prepared = self._conn.cursor(prepared=True)
+            except Exception as e:
+                self.logger.warning(
+                    f"プリペアドカーソルを作成できないため通常カーソルで実行します: {e}"
+                )
+                self._use_prepared = False
+                return self._cursor
+            self._stmt_cache[sql] = prepared
+        return prepared
+
+    def close(self) -> None:
+        for prepared in self._stmt_cache.values():
+            prepared.close()
+        self._stmt_cache.clear()
+        self._cursor.close()
+
 
 class Step5Saver:
-    def __init__(self, accessor: KeirinDataAccessor, logger: logging.Logger = None):
+    def __init__(
+        self,
+        accessor: KeirinDataAccessor,
+        logger: logging.Logger = None,
+        lap_positions_chunk_size: int = 10000,
+        lap_positions_max_statement_bytes: int = 3 * 1024 * 1024,
+        use_prepared_statements: bool = False,
+        use_multi_statements: bool = False,
+        parallel_sibling_saves: bool = False,
+        lap_positions_load_infile_threshold: int = 0,
+        lap_positions_relax_checks_threshold: int = 0,
+    ):
         self.accessor = accessor
         self.logger = logger or logging.getLogger(__name__)
+        # lap_positions の複数行INSERT 1文あたりのレース数の上限と、文の大きさの目安
+        # (max_allowed_packet から余裕を引いた値。既定は 4MB - 1MB)
+        self.lap_positions_chunk_size = max(1, lap_positions_chunk_size)
+        self.lap_positions_max_statement_bytes = lap_positions_max_statement_bytes
+        # 単一行 execute をサーバサイドのプリペアドステートメントで送るか
+        self.use_prepared_statements = use_prepared_statements
+        # トランザクション内の全INSERTをセミコロン区切りの1回の送信にまとめるか
+        # (接続側で CLIENT_MULTI_STATEMENTS が有効であること)
+        self.use_multi_statements = use_multi_statements
+        # save_parsed_html_data で結果/検車場レポート/コメントを別接続で並列保存するか
+        # (テーブル間の原子性は失われる)。save_parsed_html_data (YenjoyDataSaver 経由)
+        # だけが参照し、複数レースを1トランザクションにまとめる batch_writing() /
+        # save_all_for_race (UpdateService の Step5) には影響しない
+        self.parallel_sibling_saves = parallel_sibling_saves
+        # この件数以上の lap_positions は LOAD DATA LOCAL INFILE で保存する (0 で無効)。
+        # 接続の allow_local_infile とサーバの local_infile=1 が必要
+        self.lap_positions_load_infile_threshold = lap_positions_load_infile_threshold
+        # この件数以上の lap_positions 保存中は unique_checks/foreign_key_checks を
+        # 無効にする (0 で無効)
+        self.lap_positions_relax_checks_threshold = lap_positions_relax_checks_threshold
+        # batch_writing() の実行中だけ存在するライターと、その利用中の数
+        self._batch_writer: Optional["Step5BatchWriter"] = None
+        self._batch_writer_users = 0
+        self._batch_writer_lock = threading.Lock()
+
+    def _is_valid_race_result(self, race_id: str, res_data: Dict[str, Any]) -> bool:
+        """レース結果1件の必須フィールド (bracket_number, player_id) を検証する"""
+        if res_data.get("bracket_number") is None:
+            self.logger.warning(
+                f"(Cursor) レースID {race_id}: bracket_numberなし。スキップ: {res_data}"
+            )
+            return False
 
-    def _to_timestamp(self, datetime_str: Optional[str]) -> Optional[int]:
-        if not datetime_str or datetime_str == "0000-00-00 00:00:00":
-            return None
-        try:
-            if "T" in datetime_str:
-                dt_obj = datetime.fromisoformat(datetime_str.replace("Z", "+00:00"))
-            else:
-                dt_obj = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S")
-            if dt_obj.tzinfo is None:
-                dt_obj = dt_obj.replace(tzinfo=timezone.utc)
-            return int(dt_obj.timestamp())
-        except ValueError:
-            self.logger.warning(f"日時変換失敗: {datetime_str}")
-            return None
+        # player_idはDBから取得したものを優先、なければスクレイプした値を使用
+        if not (res_data.get("player_id") or res_data.get("player_id_scraped")):
+            self.logger.warning(
+                f"(Cursor) レースID {race_id}: player_idなし。スキップ: {res_data}"
+            )
+            return False
+        return True
 
     def _save_race_results_batch_with_cursor(
         self, race_id: str, race_results_data: List[Dict[str, Any]], cursor
@@ -37,95 +466,40 @@ class Step5Saver:
             self.logger.info(f"(Cursor) レースID {race_id}: 保存するレース結果なし。")
             return
 
-        to_save = []
-        for res_data in race_results_data:
-            # 必須フィールドのバリデーション
-            bracket_number = res_data.get("bracket_number")
-            if bracket_number is None:
-                self.logger.warning(
-                    f"(Cursor) レースID {race_id}: bracket_numberなし。スキップ: {res_data}"
-                )
-                continue
-
-            # player_idの取得と検証（DBから取得したものを優先、なければスクレイプした値を使用）
-            player_id = res_data.get("player_id") or res_data.get("player_id_scraped")
-            if not player_id:
-                self.logger.warning(
-                    f"(Cursor) レースID {race_id}: player_idなし。スキップ: {res_data}"
-                )
-                continue
-
-            # rankの処理（整数変換）
-            rank_value = res_data.get("rank")
-            rank_int = None
-            if rank_value is not None:
-                if isinstance(rank_value, int):
-                    rank_int = rank_value
-                elif isinstance(rank_value, str) and rank_value.isdigit():
-                    rank_int = int(rank_value)
-
-            # 実際のテーブルスキーマに合わせたデータ構造（Step5Updaterの出力と一致）
-            data = {
-                "race_id": race_id,
-                "bracket_number": int(bracket_number),
-                "rank": rank_int,
-                "rank_text": res_data.get("rank_text", ""),
-                "mark": res_data.get("mark", ""),
-                "player_name": res_data.get("player_name", ""),
-                "player_id": player_id,
-                "age": res_data.get("age"),
-                "prefecture": res_data.get("prefecture", ""),
-                "period": res_data.get("period"),
-                "class": res_data.get("class", ""),
-                "diff": res_data.get("diff", ""),
-                "time": res_data.get("time"),
-                "last_lap_time": res_data.get("last_lap_time", ""),
-                "winning_technique": res_data.get("winning_technique", ""),
-                "symbols": res_data.get("symbols", ""),
-                "win_factor": res_data.get("win_factor", ""),
-                "personal_status": res_data.get("personal_status", ""),
-            }
-            to_save.append(data)
+        # 実際のテーブルスキーマに合わせた行タプル（Step5Updaterの出力と一致）
+        params_list = [
+            (
+                race_id,
+                int(r["bracket_number"]),
+                _parse_rank(r.get("rank")),
+                r.get("rank_text", ""),
+                r.get("mark", ""),
+                r.get("player_name", ""),
+                r.get("player_id") or r.get("player_id_scraped"),
+                r.get("age"),
+                r.get("prefecture", ""),
+                r.get("period"),
+                r.get("class", ""),
+                r.get("diff", ""),
+                r.get("time"),
+                r.get("last_lap_time", ""),
+                r.get("winning_technique", ""),
+                r.get("symbols", ""),
+                r.get("win_factor", ""),
+                r.get("personal_status", ""),
+            )
+            for r in race_results_data
+            if self._is_valid_race_result(race_id, r)
+        ]
 
-        if not to_save:
+        if not params_list:
             self.logger.info(
                 f"(Cursor) レースID {race_id}: 有効なレース結果データなし。"
             )
             return
 
-        # 実際のテーブルカラムに合わせたクエリ
-        cols = [
-            "race_id",
-            "bracket_number",
-            "rank",
-            "rank_text",
-            "mark",
-            "player_name",
-            "player_id",
-            "age",
-            "prefecture",
-            "period",
-            "class",
-            "diff",
-            "time",
-            "last_lap_time",
-            "winning_technique",
-            "symbols",
-            "win_factor",
-            "personal_status",
-        ]
-        cols_sql = ", ".join([f"`{col}`" for col in cols])
-        values_sql = ", ".join(["%s"] * len(cols))
-        update_sql_parts = [
-            f"`{col}` = VALUES(`{col}`)"
-            for col in cols
-            if col not in ["race_id", "bracket_number"]
-        ]
-        update_sql = ", ".join(update_sql_parts)
-        query = f"INSERT INTO race_results ({cols_sql}) VALUES ({values_sql}) ON DUPLICATE KEY UPDATE {update_sql}"
-        params_list = [tuple(d.get(col) for col in cols) for d in to_save]
         try:
-            cursor.executemany(query, params_list)
+            cursor.executemany(_RACE_RESULTS_INSERT_SQL, params_list)
             self.logger.info(
                 f"(Cursor) レースID {race_id}: {len(params_list)}件のレース結果を保存/更新。"
             )
@@ -142,7 +516,9 @@ class Step5Saver:
             self.logger.info("(Cursor) 保存する周回位置データなし。")
             return
 
-        all_params_to_save = []
+        # lap_positionsテーブルは既存スキーマに合わせてセクション別カラム構造を使用
+        # 整形と同時にrace_id単位・セクション別にグループ化する
+        race_grouped_data = defaultdict(_make_empty_sections)
         processed_race_ids = set()
 
         for race_record in all_lap_records_for_saver:
@@ -160,7 +536,7 @@ class Step5Saver:
             if race_record.get("lap_positions"):
                 lap_positions_data = race_record.get("lap_positions")
                 self.logger.debug(
-                    f"(Cursor) レースID {race_id}: lap_positionsキーからデータ取得"
+                    "(Cursor) レースID %s: lap_positionsキーからデータ取得", race_id
                 )
 
             # 2. dataキーをチェック（現在の構造に対応）
@@ -175,10 +551,12 @@ class Step5Saver:
                                 race_id, lap_data_by_section
                             )
                         )
-                        if converted_lap_data:
-                            lap_positions_data = converted_lap_data
+                        first_row = next(converted_lap_data, None)
+                        if first_row is not None:
+                            lap_positions_data = chain((first_row,), converted_lap_data)
                             self.logger.debug(
-                                f"(Cursor) レースID {race_id}: lap_data_by_sectionから変換したデータ取得"
+                                "(Cursor) レースID %s: lap_data_by_sectionから変換したデータ取得",
+                                race_id,
                             )
                         else:
                             self.logger.warning(
@@ -186,21 +564,12 @@ class Step5Saver:
                             )
 
                     # 新しい形式: dataキー内に直接セクション名（周回、赤板、等）がある場合
-                    elif any(
-                        key in data_content
-                        for key in ["周回", "赤板", "打鐘", "HS", "BS"]
-                    ):
-                        # 直接セクション名がキーとして存在する場合
+                    elif not _LAP_SECTION_KEYS.isdisjoint(data_content):
+                        # 直接セクション名がキーとして存在する場合（Noneは除去）
                         section_data = {
-                            "lap_shuukai": data_content.get("周回"),
-                            "lap_akaban": data_content.get("赤板"),
-                            "lap_dasho": data_content.get("打鐘"),
-                            "lap_hs": data_content.get("HS"),
-                            "lap_bs": data_content.get("BS"),
-                        }
-                        # Noneを除去
-                        section_data = {
-                            k: v for k, v in section_data.items() if v is not None
+                            column: data_content[name]
+                            for name, column in _SECTION_KEY_MAPPING.items()
+                            if data_content.get(name) is not None
                         }
 
                         converted_lap_data = (
@@ -208,10 +577,11 @@ class Step5Saver:
                                 race_id, section_data
                             )
                         )
-                        if converted_lap_data:
-                            lap_positions_data = converted_lap_data
+                        first_row = next(converted_lap_data, None)
+                        if first_row is not None:
+                            lap_positions_data = chain((first_row,), converted_lap_data)
                             self.logger.debug(
-                                f"(Cursor) レースID {race_id}: 直接セクションキーから変換したデータ取得"
+                                "(Cursor) レースID %s: 直接セクションキーから変換したデータ取得", race_id
                             )
                         else:
                             self.logger.warning(
@@ -222,7 +592,7 @@ class Step5Saver:
                     elif data_content.get("lap_positions"):
                         lap_positions_data = data_content.get("lap_positions")
                         self.logger.debug(
-                            f"(Cursor) レースID {race_id}: data.lap_positionsキーからデータ取得"
+                            "(Cursor) レースID %s: data.lap_positionsキーからデータ取得", race_id
                         )
 
                     else:
@@ -235,7 +605,7 @@ class Step5Saver:
                     # データが直接リスト形式の場合
                     lap_positions_data = data_content
                     self.logger.debug(
-                        f"(Cursor) レースID {race_id}: dataキーから直接リストデータ取得"
+                        "(Cursor) レースID %s: dataキーから直接リストデータ取得", race_id
                     )
                 else:
                     self.logger.warning(
@@ -255,173 +625,91 @@ class Step5Saver:
                 self.logger.warning(f"(Cursor) レースID {race_id}: 周回データが空です")
                 continue
 
-            to_save_for_this_race = []
+            race_has_rows = False
             for lap_data in lap_positions_data:
-                lap_number = lap_data.get("lap_number")
-                section_name = lap_data.get("section_name")
-                player_order = lap_data.get("player_order_in_section")
-                player_id = lap_data.get("player_id")
+                if isinstance(lap_data, tuple):
+                    # _convert_lap_data_by_section_to_lap_positions で整形済みの行
+                    row = lap_data
+                else:
+                    lap_number = lap_data.get("lap_number")
+                    section_name = lap_data.get("section_name")
+                    player_order = lap_data.get("player_order_in_section")
+
+                    if (
+                        lap_number is None
+                        or section_name is None
+                        or player_order is None
+                    ):
+                        self.logger.warning(
+                            f"(Cursor) レースID {race_id}: 周回位置PK情報不足: {lap_data}"
+                        )
+                        continue
 
-                if lap_number is None or section_name is None or player_order is None:
-                    self.logger.warning(
-                        f"(Cursor) レースID {race_id}: 周回位置PK情報不足: {lap_data}"
+                    section_key = _SECTION_KEY_MAPPING.get(section_name)
+                    if section_key is None:
+                        self.logger.warning(
+                            f"(Cursor) レースID {race_id}: 不明なセクション名 '{section_name}' をスキップ"
+                        )
+                        continue
+
+                    player_name = _first(lap_data, _PLAYER_NAME_KEYS)
+                    row = _build_lap_row(
+                        lap_number,
+                        section_key,
+                        player_order,
+                        _first(lap_data, _BRACKET_KEYS),
+                        player_name if player_name is not None else "",
+                        _first(lap_data, _X_COORD_KEYS),
+                        _first(lap_data, _Y_COORD_KEYS),
+                        str(_first(lap_data, _INDICATOR_KEYS)) == "arrow",
                     )
-                    continue
 
-                data = {
-                    "race_id": race_id,
-                    "lap_number": int(lap_number),
-                    "section_name": str(section_name),
-                    "player_order_in_section": int(player_order),
-                    "player_id": str(player_id) if player_id else None,
-                    "bracket_number_snapshot": (
-                        int(
-                            lap_data.get(
-                                "bracket_number_snapshot",
-                                lap_data.get(
-                                    "bike_no", lap_data.get("bracket_number", 0)
-                                ),
-                            )
-                        )
-                        if lap_data.get(
-                            "bracket_number_snapshot",
-                            lap_data.get("bike_no", lap_data.get("bracket_number")),
-                        )
-                        is not None
-                        else None
-                    ),
-                    "player_name_snapshot": str(
-                        lap_data.get(
-                            "player_name_snapshot",
-                            lap_data.get("racer_name", lap_data.get("player_name", "")),
-                        )
-                    ),
-                    "x_coord": (
-                        int(lap_data.get("x_coord", lap_data.get("x_position", 0)))
-                        if lap_data.get("x_coord", lap_data.get("x_position"))
-                        is not None
-                        else None
-                    ),
-                    "y_coord": (
-                        int(lap_data.get("y_coord", lap_data.get("y_position", 0)))
-                        if lap_data.get("y_coord", lap_data.get("y_position"))
-                        is not None
-                        else None
-                    ),
-                    "indicator_type": str(
-                        lap_data.get(
-                            "indicator_type",
-                            lap_data.get("arrow", lap_data.get("has_arrow", "")),
-                        )
-                    ),
-                }
-                to_save_for_this_race.append(data)
+                race_has_rows = True
+                race_grouped_data[race_id][row[1]].append(row)
 
-            if to_save_for_this_race:
-                all_params_to_save.extend(to_save_for_this_race)
+            if race_has_rows:
                 processed_race_ids.add(race_id)
 
-        if not all_params_to_save:
+        if not processed_race_ids:
             self.logger.info(
                 "(Cursor) 全レース通じ、整形後保存対象の周回位置データなし。"
             )
             return
 
-        # lap_positionsテーブルは既存スキーマに合わせてセクション別カラム構造を使用
-        # データをrace_id単位でグループ化してセクション別JSONとして保存
-        race_grouped_data = {}
-        for data_item in all_params_to_save:
-            race_id = data_item.get("race_id")
-            if race_id not in race_grouped_data:
-                race_grouped_data[race_id] = {
-                    "lap_shuukai": [],
-                    "lap_akaban": [],
-                    "lap_dasho": [],
-                    "lap_hs": [],
-                    "lap_bs": [],
-                }
-
-            section_name = data_item.get("section_name", "")
-            section_mapping = {
-                "周回": "lap_shuukai",
-                "赤板": "lap_akaban",
-                "打鐘": "lap_dasho",
-                "HS": "lap_hs",
-                "BS": "lap_bs",
-            }
-            section_key = section_mapping.get(section_name)
-            if section_key:
-                race_grouped_data[race_id][section_key].append(data_item)
-
-        # 各レースのデータを保存
-        import json
-
-        for race_id, sections in race_grouped_data.items():
-            lap_data = {}
-            for section_key, section_data in sections.items():
-                if section_data:
-                    # JSONシリアライズ可能な形式に変換
-                    json_data = []
-                    for item in sorted(
-                        section_data, key=lambda x: x.get("player_order_in_section", 0)
-                    ):
-                        json_data.append(
-                            [
-                                item.get("bracket_number_snapshot"),
-                                item.get("player_name_snapshot", ""),
-                                item.get("x_coord", 0),
-                                item.get("y_coord", 0),
-                                item.get("indicator_type") == "arrow",
-                            ]
-                        )
-                    lap_data[section_key] = json.dumps(json_data, ensure_ascii=False)
-
-            if lap_data:
-                cols = [
-                    "race_id",
-                    "lap_shuukai",
-                    "lap_akaban",
-                    "lap_dasho",
-                    "lap_hs",
-                    "lap_bs",
-                ]
-                values = [
-                    race_id,
-                    lap_data.get("lap_shuukai"),
-                    lap_data.get("lap_akaban"),
-                    lap_data.get("lap_dasho"),
-                    lap_data.get("lap_hs"),
-                    lap_data.get("lap_bs"),
-                ]
-
-                cols_sql = ", ".join([f"`{col}`" for col in cols])
-                values_sql = ", ".join(["%s"] * len(cols))
-                update_sql_parts = [
-                    f"`{col}` = VALUES(`{col}`)" for col in cols[1:]
-                ]  # race_id以外
-                update_sql = ", ".join(update_sql_parts)
-                query = f"INSERT INTO lap_positions ({cols_sql}) VALUES ({values_sql}) ON DUPLICATE KEY UPDATE {update_sql}"
-
-                try:
-                    cursor.execute(query, values)
-                    self.logger.info(
-                        f"(Cursor) レースID {race_id}: 周回位置データを保存/更新"
-                    )
-                except Exception as e:
-                    self.logger.error(
-                        f"(Cursor) レースID {race_id} 周回位置データ保存エラー: {e}",
-                        exc_info=True,
-                    )
-                    raise
+        # 各レースのデータをセクション別JSONに整形
+        # (race_grouped_data には1行以上の周回データを持つレースのみが含まれる)
+        lap_params_list = [
+            (race_id, *[_encode_lap_section(sections[k]) for k in _EMPTY_SECTIONS])
+            for race_id, sections in race_grouped_data.items()
+        ]
 
-        # lap_positions が保存されたレースの is_processed を 1 に更新
+        relax_checks = bool(
+            self.lap_positions_relax_checks_threshold
+            and len(lap_params_list) >= self.lap_positions_relax_checks_threshold
+        )
+        if relax_checks:
+            # 大量保存の間だけ一意性/外部キー検査を止める。race_id が races に存在するか
+            # (参照整合性) はこの間、呼び出し側の責任になる
+            cursor.execute(_SESSION_RELAX_CHECKS_SQL)
         try:
-            for processed_race_id in processed_race_ids:
-                self._save_lap_data_status_with_cursor(
-                    processed_race_id,
-                    {"is_processed": 1},
-                    cursor,
-                )
+            threshold = self.lap_positions_load_infile_threshold
+            if threshold and len(lap_params_list) >= threshold:
+                self._load_lap_positions_with_cursor(lap_params_list, cursor)
+            else:
+                self._insert_lap_positions_with_cursor(lap_params_list, cursor)
+        finally:
+            if relax_checks:
+                cursor.execute(_SESSION_RESTORE_CHECKS_SQL)
+
+        # lap_positions が保存されたレースの is_processed を 1 に一括更新。
+        # 失敗しても保存は続けるため、複数文送信でため込んだ文はここで送り切ってから
+        # この更新だけを送り、エラーをこの try で受け取る
+        cursor.flush()
+        try:
+            self._save_lap_data_status_bulk_with_cursor(
+                [(race_id, 1, None) for race_id in processed_race_ids], cursor
+            )
+            cursor.flush()
             self.logger.info(
                 f"(Cursor) 周回データ保存済みの {len(processed_race_ids)} レースについて lap_data_status.is_processed=1 を設定"
             )
@@ -432,53 +720,127 @@ class Step5Saver:
             )
 
         # 処理完了ログ
-        total_processed = sum(
-            1 for sections in race_grouped_data.values() if any(sections.values())
+        self.logger.info(
+            f"(Cursor) {len(lap_params_list)}件の周回位置データを保存/更新。対象レース数: {len(processed_race_ids)}"
         )
+
+    def _insert_lap_positions_with_cursor(self, lap_params_list: List[Tuple], cursor):
+        """整形済みの lap_positions 行を、チャンクごとに複数行VALUESの1文で保存する"""
+        # max_allowed_packet を超えないようにチャンク単位で保存
+        chunk_count = 0
+        for batch in self._chunk_lap_params(lap_params_list):
+            chunk_count += 1
+            try:
+                # チャンクの行数は文の大きさで変わるため、プリペアドにはしない
+                cursor.execute(
+                    _LAP_POSITIONS_MULTI_INSERT_PREFIX
+                    + ",".join([_LAP_POSITIONS_ROW_PLACEHOLDER] * len(batch))
+                    + _LAP_POSITIONS_MULTI_INSERT_SUFFIX,
+                    tuple(chain.from_iterable(batch)),
+                    prepare=False,
+                )
+            except Exception as e:
+                self.logger.error(
+                    f"(Cursor) 周回位置データ バッチ {chunk_count} の保存エラー: {e}",
+                    exc_info=True,
+                )
+                raise
         self.logger.info(
-            f"(Cursor) {total_processed}件の周回位置データを保存/更新。対象レース数: {len(processed_race_ids)}"
+            f"(Cursor) {len(lap_params_list)}レース分の周回位置データを保存/更新 "
+            f"({chunk_count}文)"
         )
 
+    def _chunk_lap_params(self, lap_params_list: List[Tuple]) -> Iterator[List[Tuple]]:
+        """
+        lap_positions の行を、レース数が lap_positions_chunk_size 以下かつ
+        文字数の合計が lap_positions_max_statement_bytes 以下のチャンクに分ける。
+        (JSONはほぼASCIIのため文字数をバイト数の目安として使う)
+        """
+        max_rows = self.lap_positions_chunk_size
+        max_bytes = self.lap_positions_max_statement_bytes
+        batch: List[Tuple] = []
+        batch_bytes = 0
+        for row in lap_params_list:
+            row_bytes = sum(len(v) for v in row if v is not None) + 64
+            if batch and (
+                len(batch) >= max_rows or batch_bytes + row_bytes > max_bytes
+            ):
+                yield batch
+                batch = []
+                batch_bytes = 0
+            batch.append(row)
+            batch_bytes += row_bytes
+        if batch:
+            yield batch
+
+    def _load_lap_positions_with_cursor(self, lap_params_list: List[Tuple], cursor):
+        """
+        整形済みの lap_positions 行をタブ区切りの一時ファイルに書き出し、
+        LOAD DATA LOCAL INFILE ... REPLACE で一括保存する。
+        """
+        with tempfile.NamedTemporaryFile(
+            mode="w",
+            encoding="utf-8",
+            newline="\n",
+            suffix=".tsv",
+            prefix="lap_positions_",
+            delete=False,
+        ) as f:
+            tmp_path = f.name
+            for row in lap_params_list:
+                f.write(
+                    "\t".join(
+                        (
+                            "\\N"
+                            if v is None
+                            else str(v).translate(_LOAD_DATA_ESCAPE_TABLE)
+                        )
+                        for v in row
+                    )
+                )
+                f.write("\n")
+        try:
+            cursor.execute(_LAP_POSITIONS_LOAD_DATA_SQL, (tmp_path,))
+            self.logger.info(
+                f"(Cursor) {len(lap_params_list)}レース分の周回位置データを LOAD DATA LOCAL INFILE で保存/更新"
+            )
+        except Exception as e:
+            self.logger.error(
+                f"(Cursor) 周回位置データの LOAD DATA LOCAL INFILE 保存エラー: {e}",
+                exc_info=True,
+            )
+            raise
+        finally:
+            os.remove(tmp_path)
+
     def _convert_lap_data_by_section_to_lap_positions(
         self, race_id: str, lap_data_by_section: Dict[str, Any]
-    ) -> List[Dict[str, Any]]:
+    ) -> Iterator[Tuple]:
         """
-        セクション別の周回データをlap_positions形式に変換
+        セクション別の周回データをlap_positions形式の行タプルに変換して順に返す
 
         Args:
             race_id: レースID
             lap_data_by_section: セクション別の周回データ（JSON文字列の辞書、または直接データの辞書）
 
-        Returns:
-            変換されたlap_positionsデータのリスト
+        Yields:
+            変換された行タプル（形式は _build_lap_row を参照）
         """
-        import json
-
-        converted_data = []
-
-        # セクション名のマッピング（step5_updater_old.pyと同じ）
-        section_lap_mapping = {
-            "lap_shuukai": ("周回", 1),
-            "lap_akaban": ("赤板", 2),
-            "lap_dasho": ("打鐘", 3),
-            "lap_hs": ("HS", 4),
-            "lap_bs": ("BS", 5),
-        }
+        converted_count = 0
 
         for section_key, section_value in lap_data_by_section.items():
-            if section_key not in section_lap_mapping:
+            lap_number = _SECTION_LAP_NUMBERS.get(section_key)
+            if lap_number is None:
                 self.logger.warning(
                     f"(Cursor) レースID {race_id}: 不明なセクションキー '{section_key}' をスキップ"
                 )
                 continue
 
-            section_name, lap_number = section_lap_mapping[section_key]
-
             try:
                 # データがJSON文字列の場合はパース、そうでなければ直接使用
                 if isinstance(section_value, str):
                     # JSON文字列をパース（step5_updater_old.pyの形式）
-                    section_data = json.loads(section_value)
+                    section_data = _LAP_JSON_DECODE(section_value)
                 elif isinstance(section_value, (list, dict)):
                     # 既にパースされた形式
                     section_data = section_value
@@ -498,24 +860,23 @@ class Step5Saver:
                 for player_order, player_data in enumerate(section_data, 1):
                     # step5_updater_old.pyの形式: [bracket_number, racer_name, x_position, y_position, has_arrow]
                     if isinstance(player_data, list) and len(player_data) >= 4:
-                        bracket_number = player_data[0]
-                        racer_name = player_data[1] if len(player_data) > 1 else ""
-                        x_position = player_data[2] if len(player_data) > 2 else 0
-                        y_position = player_data[3] if len(player_data) > 3 else 0
-                        has_arrow = player_data[4] if len(player_data) > 4 else False
-
-                        converted_entry = {
-                            "lap_number": lap_number,
-                            "section_name": section_name,
-                            "player_order_in_section": player_order,
-                            "player_id": None,  # step5_updater_old.pyの形式にはplayer_idが含まれていない
-                            "bracket_number_snapshot": bracket_number,
-                            "player_name_snapshot": racer_name,
-                            "x_coord": x_position,
-                            "y_coord": y_position,
-                            "indicator_type": "arrow" if has_arrow else "",
-                        }
-                        converted_data.append(converted_entry)
+                        # 要素数4以上は保証済みなので、省略可能なのは has_arrow のみ
+                        bracket_number, racer_name, x_position, y_position = (
+                            player_data[:4]
+                        )
+                        has_arrow = len(player_data) > 4 and player_data[4]
+
+                        yield _build_lap_row(
+                            lap_number,
+                            section_key,
+                            player_order,
+                            bracket_number,
+                            racer_name,
+                            x_position,
+                            y_position,
+                            has_arrow,
+                        )
+                        converted_count += 1
 
                     # 新しい形式: 辞書形式のデータ
                     elif isinstance(player_data, dict):
@@ -537,18 +898,17 @@ class Step5Saver:
                             "arrow", False
                         )
 
-                        converted_entry = {
-                            "lap_number": lap_number,
-                            "section_name": section_name,
-                            "player_order_in_section": player_order,
-                            "player_id": player_data.get("player_id"),
-                            "bracket_number_snapshot": bracket_number,
-                            "player_name_snapshot": racer_name,
-                            "x_coord": x_position,
-                            "y_coord": y_position,
-                            "indicator_type": "arrow" if has_arrow else "",
-                        }
-                        converted_data.append(converted_entry)
+                        yield _build_lap_row(
+                            lap_number,
+                            section_key,
+                            player_order,
+                            bracket_number,
+                            racer_name,
+                            x_position,
+                            y_position,
+                            has_arrow,
+                        )
+                        converted_count += 1
 
                     else:
                         self.logger.warning(
@@ -568,9 +928,10 @@ class Step5Saver:
                 continue
 
         self.logger.debug(
-            f"(Cursor) レースID {race_id}: {len(converted_data)}件の周回データを変換しました"
+            "(Cursor) レースID %s: %d件の周回データを変換しました",
+            race_id,
+            converted_count,
         )
-        return converted_data
 
     def _save_race_comments_batch_with_cursor(
         self, race_id: str, race_comments_data: List[Dict[str, Any]], cursor
@@ -605,17 +966,10 @@ class Step5Saver:
             )
             return
 
-        cols = ["race_id", "comment"]
-        cols_sql = ", ".join([f"`{col}`" for col in cols])
-        values_sql = ", ".join(["%s"] * len(cols))
-        update_sql_parts = [
-            f"`{col}` = VALUES(`{col}`)" for col in cols if col != "race_id"
-        ]
-        update_sql = ", ".join(update_sql_parts)
-        query = f"INSERT INTO race_comments ({cols_sql}) VALUES ({values_sql}) ON DUPLICATE KEY UPDATE {update_sql}"
-        params_list = [tuple(to_save.get(col) for col in cols)]
         try:
-            cursor.executemany(query, params_list)
+            cursor.execute(
+                _RACE_COMMENTS_INSERT_SQL, (to_save["race_id"], to_save["comment"])
+            )
             self.logger.info(
                 f"(Cursor) レースID {race_id}: レースコメントを保存/更新。"
             )
@@ -635,61 +989,49 @@ class Step5Saver:
             return
         to_save = []
         for idx, report_data in enumerate(inspection_reports_data):
-            comment_val = str(
-                report_data.get(
-                    "comment",
-                    report_data.get("report_text", report_data.get("content", "")),
-                )
+            raw_comment = (
+                report_data.get("comment")
+                or report_data.get("report_text")
+                or report_data.get("content")
             )
-            if not comment_val:
+            if not raw_comment:
                 self.logger.info(
                     f"(Cursor) レースID {race_id}, データインデックス {idx}: 検車場レポート本文(comment)空。保存せず。"
                 )
                 continue
+            comment_val = (
+                raw_comment if isinstance(raw_comment, str) else str(raw_comment)
+            )
 
             # player_name_reported または player_id から選手名を取得
             # 選手名の取得と設定（6文字制限対応）
             player_name = ""
-            if report_data.get("player_name_reported"):
-                # 順位情報 "(1着)" などを除去
-                raw_name = str(report_data["player_name_reported"])
-                clean_name = re.sub(r"\([^)]*\)", "", raw_name).strip()
+            raw_name = report_data.get("player_name_reported")
+            if raw_name:
+                if not isinstance(raw_name, str):
+                    raw_name = str(raw_name)
+                # 順位情報 "(1着)" などを除去（括弧がなければ正規表現を通さない）
+                if "(" in raw_name:
+                    raw_name = _RANK_SUFFIX_RE.sub("", raw_name)
                 # 6文字制限に合わせてトリケート
-                player_name = clean_name[:6] if clean_name else ""
-            elif report_data.get("player_id"):
-                # フォールバックとしてplayer_idを使用（6文字制限）
-                player_name = str(report_data["player_id"])[:6]
-
-            data = {
-                "race_id": race_id,
-                "player": player_name,  # 6文字制限内の選手名を設定
-                "comment": comment_val,
-            }
-            to_save.append(data)
+                player_name = raw_name.strip()[:6]
+            else:
+                player_id = report_data.get("player_id")
+                if player_id:
+                    # フォールバックとしてplayer_idを使用（6文字制限）
+                    player_name = str(player_id)[:6]
+
+            to_save.append((race_id, player_name, comment_val))
         if not to_save:
             self.logger.info(
                 f"(Cursor) レースID {race_id}: 整形後、保存対象の検車場レポートなし。"
             )
             return
 
-        cols = ["race_id", "player", "comment"]
-        cols_sql = ", ".join([f"`{col}`" for col in cols])
-        values_sql = ", ".join(["%s"] * len(cols))
-        update_sql_parts = [
-            f"`{col}` = VALUES(`{col}`)" for col in cols if col not in ["race_id"]
-        ]
-        update_sql = ", ".join(update_sql_parts)
-
-        if not update_sql_parts:
-            query = f"INSERT IGNORE INTO inspection_reports ({cols_sql}) VALUES ({values_sql})"
-        else:
-            query = f"INSERT INTO inspection_reports ({cols_sql}) VALUES ({values_sql}) ON DUPLICATE KEY UPDATE {update_sql}"
-
-        params_list = [tuple(d.get(col) for col in cols) for d in to_save]
         try:
-            cursor.executemany(query, params_list)
+            cursor.executemany(_INSPECTION_REPORTS_INSERT_SQL, to_save)
             self.logger.info(
-                f"(Cursor) レースID {race_id}: {len(params_list)}件の検車場レポートを保存/更新試行。"
+                f"(Cursor) レースID {race_id}: {len(to_save)}件の検車場レポートを保存/更新試行。"
             )
         except Exception as e:
             self.logger.error(
@@ -725,13 +1067,16 @@ class Step5Saver:
 
         last_checked_at_val = lap_data_status_entry.get("last_checked_at")
         last_checked_at_db_val = None
-        if last_checked_at_val:
-            timestamp = self._to_timestamp(str(last_checked_at_val))
-            if timestamp:
-                last_checked_at_db_val = datetime.fromtimestamp(
-                    timestamp, tz=timezone.utc
-                ).strftime("%Y-%m-%d %H:%M:%S")
-            else:
+        if isinstance(last_checked_at_val, datetime):
+            # datetime はそのまま整形し、文字列化→再パースの往復をしない
+            if last_checked_at_val.tzinfo is not None:
+                last_checked_at_val = last_checked_at_val.astimezone(timezone.utc)
+            last_checked_at_db_val = last_checked_at_val.strftime(
+                _MYSQL_DATETIME_FORMAT
+            )
+        elif last_checked_at_val:
+            last_checked_at_db_val = _normalize_mysql_datetime(str(last_checked_at_val))
+            if last_checked_at_db_val is None:
                 self.logger.warning(
                     f"(Cursor) レースID {race_id}: last_checked_at の日時変換に失敗 ({last_checked_at_val})。NULLとして扱います。"
                 )
@@ -748,31 +1093,20 @@ class Step5Saver:
             "last_checked_at": last_checked_at_db_val,
         }
 
-        cols = ["race_id", "is_processed", "last_checked_at"]
-        cols_sql = ", ".join([f"`{col}`" for col in cols])
-        values_sql = ", ".join(["%s"] * len(cols))
-
-        update_col_statements = []
-        if to_save["is_processed"] is not None:
-            update_col_statements.append("`is_processed` = VALUES(`is_processed`)")
-        if to_save["last_checked_at"] is not None:
-            update_col_statements.append(
-                "`last_checked_at` = VALUES(`last_checked_at`)"
-            )
-
-        update_sql = ", ".join(update_col_statements)
-
-        if update_sql:
-            query = f"INSERT INTO lap_data_status ({cols_sql}) VALUES ({values_sql}) ON DUPLICATE KEY UPDATE {update_sql}"
+        update_cols = (
+            to_save["is_processed"] is not None,
+            to_save["last_checked_at"] is not None,
+        )
+        if USE_REPLACE_INTO and all(update_cols):
+            query = _LAP_STATUS_REPLACE_SQL
         else:
-            query = (
-                f"INSERT IGNORE INTO lap_data_status ({cols_sql}) VALUES ({values_sql})"
-            )
+            query = _LAP_STATUS_ODKU_SQL[update_cols]
 
-        params_list = [tuple(to_save.get(col) for col in cols)]
+        # 1行だけなので executemany (VALUES句の書き換え判定) を通さず execute で送る
+        params = tuple(to_save.get(col) for col in _LAP_STATUS_COLS)
 
         try:
-            cursor.executemany(query, params_list)
+            cursor.execute(query, params)
             self.logger.info(
                 f"(Cursor) レースID {race_id}: 周回データステータス情報を保存/更新しました。"
             )
@@ -783,6 +1117,69 @@ class Step5Saver:
             )
             raise
 
+    def _save_lap_data_status_bulk_with_cursor(
+        self,
+        entries: List[Tuple[str, Optional[int], Optional[str]]],
+        cursor,
+    ):
+        """
+        複数レースの周回データステータスを1回のexecutemanyで保存/更新する (トランザクション内でcursorを使用)
+        entries は (race_id, is_processed, last_checked_at) のタプルのリスト。
+        None の項目は既存値を上書きしない。
+        """
+        if not entries:
+            self.logger.info("(Cursor) 保存する周回データステータス情報なし。")
+            return
+
+        try:
+            cursor.executemany(_LAP_DATA_STATUS_BULK_UPSERT_SQL, entries)
+            self.logger.info(
+                f"(Cursor) {len(entries)}件の周回データステータス情報を一括保存/更新しました。"
+            )
+        except Exception as e:
+            self.logger.error(
+                f"(Cursor) 周回データステータス情報の一括保存中にエラー: {e}",
+                exc_info=True,
+            )
+            raise
+
+    def _save_all_for_race_with_cursor(
+        self,
+        race_id: str,
+        race_results: Optional[List[Dict[str, Any]]],
+        race_comments: Optional[List[Any]],
+        inspection_reports: Optional[List[Dict[str, Any]]],
+        lap_positions: Any,
+        cursor,
+        current_step: Optional[Dict[str, str]] = None,
+    ):
+        """
+        1レース分の各データを、渡された cursor で順に保存する (空のものは飛ばす)。
+        current_step を渡すと、実行中のデータ種別を "name" に記録する (エラー時のログ用)。
+        保存し終えたデータはローカル参照を外し、他に参照がなければ次の保存中に解放されるようにする。
+        """
+        if current_step is None:
+            current_step = {}
+        if race_results:
+            current_step["name"] = "race_results"
+            self._save_race_results_batch_with_cursor(race_id, race_results, cursor)
+        race_results = None
+        if inspection_reports:
+            current_step["name"] = "inspection_reports"
+            self._save_inspection_reports_batch_with_cursor(
+                race_id, inspection_reports, cursor
+            )
+        inspection_reports = None
+        if race_comments:
+            current_step["name"] = "race_comments"
+            self._save_race_comments_batch_with_cursor(race_id, race_comments, cursor)
+        race_comments = None
+        if lap_positions:
+            current_step["name"] = "lap_positions"
+            self._save_lap_positions_batch_with_cursor(
+                [{"race_id": race_id, "data": lap_positions}], cursor
+            )
+
     def save_parsed_html_data(
         self,
         race_id: str,
@@ -791,52 +1188,128 @@ class Step5Saver:
     ) -> bool:
         """
         パースされたHTMLデータ (レース結果、周回情報、コメント、検査レポート) をアトミックに保存する。
+        保存中のメモリを抑えるため、parsed_data の各データは取り出して消費する
+        (呼び出し後の parsed_data にはこれらのキーが残らない)。
         """
+        if not parsed_data or not any(
+            parsed_data.get(key) for key in _PARSED_HTML_DATA_KEYS
+        ):
+            # 保存するものがなければトランザクション (BEGIN/COMMIT) 自体を開かない
+            self.logger.info(
+                "レースID %s: 保存するパースHTMLデータがないためスキップ。", race_id
+            )
+            return True
+
         self.logger.info(
-            f"レースID {race_id}: パースHTMLデータのアトミック保存処理を開始。"
+            "レースID %s: パースHTMLデータのアトミック保存処理を開始。", race_id
         )
 
-        def _save_in_transaction(conn, cursor):
-            try:
-                # 受け取った cursor を使用し、parsed_data の実データだけを保存
-                if parsed_data and parsed_data.get("race_results"):
-                    self._save_race_results_batch_with_cursor(
-                        race_id,
-                        parsed_data["race_results"],
-                        cursor,
-                    )
-                if parsed_data and parsed_data.get("inspection_reports"):
-                    self._save_inspection_reports_batch_with_cursor(
-                        race_id,
-                        parsed_data["inspection_reports"],
-                        cursor,
-                    )
-                if parsed_data and parsed_data.get("race_comments"):
-                    self._save_race_comments_batch_with_cursor(
-                        race_id,
-                        parsed_data["race_comments"],
-                        cursor,
-                    )
-                if parsed_data and parsed_data.get("lap_positions"):
-                    self._save_lap_positions_batch_with_cursor(
-                        [{"race_id": race_id, "data": parsed_data["lap_positions"]}],
-                        cursor,
-                    )
-                return True
-            except Exception:
-                raise
+        # 例外はここでは捕まえず、外側で失敗したデータ種別とともに1回だけ記録する
+        current_step = {"name": "transaction"}
+
+        def _save_in_transaction(cursor):
+            # 受け取った cursor を使用し、parsed_data の実データだけを保存。
+            # dict からは取り出しておき、保存済みのデータを抱え続けないようにする
+            # (ローカル変数に受けるとこのフレームが保存中ずっと参照を持つため、引数へ直接渡す)
+            self._save_all_for_race_with_cursor(
+                race_id,
+                parsed_data.pop("race_results", None),
+                parsed_data.pop("race_comments", None),
+                parsed_data.pop("inspection_reports", None),
+                parsed_data.pop("lap_positions", None),
+                cursor,
+                current_step,
+            )
+            current_step["name"] = "commit"
+            return True
 
         try:
-            return self.accessor.execute_in_transaction(
-                _save_in_transaction
-            )  # cursor引数を渡さない
+            if self.parallel_sibling_saves:
+                return self._save_parsed_html_data_in_siblings(
+                    race_id, parsed_data, current_step
+                )
+            return self._run_with_cursor(_save_in_transaction)
         except Exception as e:
             self.logger.error(
-                f"レースID {race_id} のパースHTMLデータのアトミック保存中に予期せぬエラー: {e}",
+                "レースID %s のパースHTMLデータのアトミック保存中に予期せぬエラー (%s): %s",
+                race_id,
+                current_step["name"],
+                e,
                 exc_info=True,
             )
             return False
 
+    def _save_parsed_html_data_in_siblings(
+        self,
+        race_id: str,
+        parsed_data: Dict[str, Any],
+        current_step: Dict[str, str],
+    ) -> bool:
+        """
+        レース結果・検車場レポート・コメントをそれぞれ別接続のトランザクションで並列に保存し、
+        すべて成功した場合のみ周回データ (と lap_data_status) を保存する。
+        いずれかが失敗した時点で例外を送出するため周回データは保存されないが、
+        既にコミットされた他テーブルの保存は取り消されない。
+        逐次保存と同じく parsed_data の各データは取り出して消費し、失敗したデータ種別を
+        current_step["name"] に記録する。
+        """
+        # 各データは最初に1回だけ取り出し、以降はローカル変数だけを参照する
+        race_results, race_comments, inspection_reports, lap_positions = (
+            parsed_data.pop(key, None) for key in _PARSED_HTML_DATA_KEYS
+        )
+        sibling_saves = [
+            (name, save_func, data)
+            for name, save_func, data in (
+                (
+                    "race_results",
+                    self._save_race_results_batch_with_cursor,
+                    race_results,
+                ),
+                (
+                    "inspection_reports",
+                    self._save_inspection_reports_batch_with_cursor,
+                    inspection_reports,
+                ),
+                (
+                    "race_comments",
+                    self._save_race_comments_batch_with_cursor,
+                    race_comments,
+                ),
+            )
+            if data
+        ]
+
+        if sibling_saves:
+            with ThreadPoolExecutor(
+                max_workers=len(sibling_saves),
+                thread_name_prefix=f"Step5Sibling-{race_id}",
+            ) as executor:
+                futures = [
+                    (
+                        name,
+                        executor.submit(
+                            self._run_with_cursor,
+                            lambda cursor, f=save_func, d=data: f(race_id, d, cursor),
+                        ),
+                    )
+                    for name, save_func, data in sibling_saves
+                ]
+                # 全件の完了を待ってから、最初の失敗を送出する
+                errors = [(name, f.exception()) for name, f in futures]
+            for name, error in errors:
+                if error is not None:
+                    current_step["name"] = name
+                    raise error
+
+        if lap_positions:
+            current_step["name"] = "lap_positions"
+            self._run_with_cursor(
+                lambda cursor: self._save_lap_positions_batch_with_cursor(
+                    [{"race_id": race_id, "data": lap_positions}], cursor
+                )
+            )
+        return True
+
     def update_race_step5_status_batch(self, race_ids: List[str], status: str) -> None:
         """
         指定されたレースIDのリストに対して、lap_data_status テーブルの最終確認日時を更新する。
@@ -853,126 +1326,180 @@ class Step5Saver:
             )
             return
 
-        def _update_status_in_transaction(conn, cursor):
-            try:
-                if race_ids:
-                    # lap_data_status に対して last_checked_at を更新（無ければ作成）
-                    upsert_sql = (
-                        "INSERT INTO lap_data_status (race_id, last_checked_at) "
-                        "VALUES (%s, NOW()) "
-                        "ON DUPLICATE KEY UPDATE last_checked_at = VALUES(last_checked_at)"
-                    )
-                    params_list = [(race_id,) for race_id in race_ids]
-                    cursor.executemany(upsert_sql, params_list)
-                    self.logger.info(
-                        f"{len(params_list)}件のレースIDについて lap_data_status.last_checked_at を更新/作成しました。ログ用status={status}"
-                    )
-                return True
-            except Exception:
-                raise
+        def _update_status_in_transaction(cursor):
+            # lap_data_status に対して last_checked_at を更新（無ければ作成）
+            # executemany の行ごとの往復を避け、チャンクごとに複数VALUESの1文で送る
+            for i in range(0, len(race_ids), _LAP_STATUS_TOUCH_CHUNK_SIZE):
+                chunk = race_ids[i : i + _LAP_STATUS_TOUCH_CHUNK_SIZE]
+                placeholders = ", ".join(["(%s, NOW())"] * len(chunk))
+                cursor.execute(
+                    "INSERT INTO lap_data_status (race_id, last_checked_at) "
+                    f"VALUES {placeholders} "
+                    "ON DUPLICATE KEY UPDATE last_checked_at = VALUES(last_checked_at)",
+                    tuple(chunk),
+                )
+            self.logger.info(
+                "%d件のレースIDについて lap_data_status.last_checked_at を更新/作成しました。ログ用status=%s",
+                len(race_ids),
+                status,
+            )
+            return True
 
         try:
-            self.accessor.execute_in_transaction(_update_status_in_transaction)
+            self._run_with_cursor(_update_status_in_transaction)
         except Exception as e:
             self.logger.error(
-                f"lap_data_status の last_checked_at バッチ更新トランザクション全体でエラー: {e}",
+                "lap_data_status の last_checked_at バッチ更新トランザクション全体でエラー: %s",
+                e,
                 exc_info=True,
             )
 
+    def _run_with_cursor(self, save_func: Callable[[Any], Any]) -> Any:
+        """
+        accessor.execute_in_transaction 内で書き込み用カーソルを生成し、save_func(cursor) を実行する。
+        コミット/ロールバックは execute_in_transaction が行うため、save_func 側では行わないこと。
+        """
+
+        use_multi_statements = False
+
+        def _in_transaction(conn):
+            # 書き込み専用 (INSERT/UPDATEのみで行を読まない) のため、
+            # 辞書カーソルやバッファ付きカーソルは使わない
+            cursor = _Step5WriteCursor(
+                conn,
+                self.use_prepared_statements,
+                self.logger,
+                use_multi_statements=use_multi_statements,
+            )
+            try:
+                result = save_func(cursor)
+                cursor.flush()
+                return result
+            finally:
+                cursor.close()
+
+        multi_statements = getattr(self.accessor, "multi_statements", None)
+        if not self.use_multi_statements or multi_statements is None:
+            return self.accessor.execute_in_transaction(_in_transaction)
+        # 複数文の送信はこのトランザクション用に開く接続でだけ許可する。
+        # 許可できない接続 (接続プール等) では従来どおり1文ずつ送る
+        with multi_statements() as use_multi_statements:
+            return self.accessor.execute_in_transaction(_in_transaction)
+
+    @contextmanager
+    def batch_writing(self) -> Iterator["Step5BatchWriter"]:
+        """
+        ブロックの間だけ Step5BatchWriter を起動し、複数レースの書き込みをまとめる。
+        ブロックを抜けると残りの保存要求を書き込んでからライタースレッドを終了する。
+        複数スレッドから同時に使った場合は1つのライターを共有し、最後に抜けた側が終了する。
+        """
+        with self._batch_writer_lock:
+            if self._batch_writer is None:
+                self._batch_writer = Step5BatchWriter(self)
+            self._batch_writer_users += 1
+            batch_writer = self._batch_writer
+        try:
+            yield batch_writer
+        finally:
+            with self._batch_writer_lock:
+                self._batch_writer_users -= 1
+                closing = self._batch_writer_users == 0
+                if closing:
+                    self._batch_writer = None
+            if closing:
+                batch_writer.close()
+
+    def _save_with_writer_or_directly(
+        self, label: str, save_func: Callable, args: tuple
+    ) -> bool:
+        """
+        batch_writing() の実行中ならそのライターに保存要求を渡し、
+        そうでなければ1トランザクションでそのまま保存する。戻り値は保存成否
+        """
+        with self._batch_writer_lock:
+            future = (
+                self._batch_writer._submit(label, save_func, args)
+                if self._batch_writer is not None
+                else None
+            )
+        if future is not None:
+            return future.result()
+        try:
+            self._run_with_cursor(lambda cursor: save_func(*args, cursor))
+            return True
+        except Exception as e:
+            self.logger.error(f"{label}: 保存トランザクションでエラー: {e}", exc_info=True)
+            return False
+
+    def save_all_for_race(
+        self,
+        race_id: str,
+        race_results: Optional[List[Dict[str, Any]]] = None,
+        race_comments: Optional[List[Any]] = None,
+        inspection_reports: Optional[List[Dict[str, Any]]] = None,
+        lap_positions: Any = None,
+    ) -> bool:
+        """
+        1レース分のレース結果・コメント・検車場レポート・周回データを1トランザクションで保存する。
+        batch_writing() の実行中は、そのライターが他レース分とまとめて1トランザクションで書き込む。
+        """
+        if not (race_results or race_comments or inspection_reports or lap_positions):
+            self.logger.info("レースID %s: 保存するデータがありません。", race_id)
+            return True  # データがない場合は成功扱い
+
+        return self._save_with_writer_or_directly(
+            f"レースID {race_id} HTML由来データ",
+            self._save_all_for_race_with_cursor,
+            (race_id, race_results, race_comments, inspection_reports, lap_positions),
+        )
+
     def save_race_results_batch(
         self, race_id: str, race_results_data: List[Dict[str, Any]]
     ) -> bool:
         """
         指定されたレースIDのレース結果を一括で保存/更新する。
+        (save_all_for_race の互換ラッパー。同じレースの他データと続けて保存する場合は
+        save_all_for_race を使う)
         """
         if not race_results_data:
             self.logger.info(
-                f"レースID {race_id}: 保存するレース結果データがありません。"
+                "レースID %s: 保存するレース結果データがありません。", race_id
             )
             return True  # データがない場合は成功扱い
 
-        def _save_results_in_transaction(conn, cursor):
-            self._save_race_results_batch_with_cursor(
-                race_id, race_results_data, cursor
-            )
-            return True
-
-        try:
-            # KeirinDataAccessor の execute_in_transaction を使用
-            self.accessor.execute_in_transaction(_save_results_in_transaction)
-            self.logger.info(
-                f"レースID {race_id}: レース結果の保存トランザクションが正常に完了しました。"
-            )
-            return True
-        except Exception as e:
-            self.logger.error(
-                f"レースID {race_id}: レース結果の保存トランザクションでエラー: {e}",
-                exc_info=True,
-            )
-            return False
+        return self.save_all_for_race(race_id, race_results=race_results_data)
 
     def save_inspection_reports_batch(
         self, race_id: str, inspection_reports_data: List[Dict[str, Any]]
     ) -> bool:
         """
         指定されたレースIDの検車場レポートを一括で保存/更新する。
+        (save_all_for_race の互換ラッパー)
         """
         if not inspection_reports_data:
             self.logger.info(
-                f"レースID {race_id}: 保存する検車場レポートデータがありません。"
+                "レースID %s: 保存する検車場レポートデータがありません。", race_id
             )
             return True
 
-        def _save_reports_in_transaction(conn, cursor):
-            self._save_inspection_reports_batch_with_cursor(
-                race_id, inspection_reports_data, cursor
-            )
-            return True
-
-        try:
-            self.accessor.execute_in_transaction(_save_reports_in_transaction)
-            self.logger.info(
-                f"レースID {race_id}: 検車場レポートの保存トランザクションが正常に完了しました。"
-            )
-            return True
-        except Exception as e:
-            self.logger.error(
-                f"レースID {race_id}: 検車場レポートの保存トランザクションでエラー: {e}",
-                exc_info=True,
-            )
-            return False
+        return self.save_all_for_race(
+            race_id, inspection_reports=inspection_reports_data
+        )
 
     def save_race_comments_batch(
         self, race_id: str, race_comments_data: List[Dict[str, Any]]
     ) -> bool:
         """
         指定されたレースIDのレースコメントを一括で保存/更新する。
-        （Updaterから直接呼び出されることを想定したラッパーメソッド）
+        (save_all_for_race の互換ラッパー)
         """
         if not race_comments_data:
             self.logger.info(
-                f"レースID {race_id}: 保存するレースコメントデータがありません。"
+                "レースID %s: 保存するレースコメントデータがありません。", race_id
             )
             return True  # データがない場合は成功扱い
 
-        def _save_comments_in_transaction(conn, cursor):
-            self._save_race_comments_batch_with_cursor(
-                race_id, race_comments_data, cursor
-            )
-            return True
-
-        try:
-            self.accessor.execute_in_transaction(_save_comments_in_transaction)
-            self.logger.info(
-                f"レースID {race_id}: レースコメントの保存トランザクションが正常に完了しました。"
-            )
-            return True
-        except Exception as e:
-            self.logger.error(
-                f"レースID {race_id}: レースコメントの保存トランザクションでエラー: {e}",
-                exc_info=True,
-            )
-            return False
+        return self.save_all_for_race(race_id, race_comments=race_comments_data)
 
     def save_lap_positions_batch(
         self, all_lap_data_for_saver: List[Dict[str, Any]]
@@ -985,25 +1512,116 @@ class Step5Saver:
             self.logger.info("保存する周回位置データがありません。")
             return True  # データがない場合は成功扱い
 
-        def _save_laps_in_transaction(conn, cursor):
-            # _save_lap_positions_batch_with_cursor はこの形式のデータを期待している
-            self._save_lap_positions_batch_with_cursor(all_lap_data_for_saver, cursor)
+        return self._save_with_writer_or_directly(
+            f"{len(all_lap_data_for_saver)} レース分の周回位置データ",
+            self._save_lap_positions_batch_with_cursor,
+            (all_lap_data_for_saver,),
+        )
+
+
+class Step5BatchWriter:
+    """
+    Step5Saver の書き込みを複数レース分まとめて1トランザクションで実行するライター。
+
+    submit_* は保存要求をキューに積んで Future を返す。専用スレッドがその時点でキューに
+    ある要求を max_batch 件まで取り出し (待ち合わせはせず、前の書き込み中にたまった分を
+    まとめる)、1回の execute_in_transaction で Step5Saver の _save_*_with_cursor を
+    順に実行する。Future の結果は保存成否 (bool)。
+    まとめた保存が失敗した場合は、原因のレースだけが失敗になるよう1件ずつ再実行する。
+    """
+
+    def __init__(self, saver: Step5Saver, max_batch: int = 100):
+        self.saver = saver
+        self.logger = saver.logger
+        self.max_batch = max(1, max_batch)
+        self._queue: "queue.Queue[Optional[Tuple[str, Callable, tuple, Future]]]" = (
+            queue.Queue()
+        )
+        self._thread = threading.Thread(
+            target=self._run, name="Step5BatchWriter", daemon=True
+        )
+        self._thread.start()
+
+    def submit_all_for_race(
+        self,
+        race_id: str,
+        race_results: Optional[List[Dict[str, Any]]] = None,
+        race_comments: Optional[List[Any]] = None,
+        inspection_reports: Optional[List[Dict[str, Any]]] = None,
+        lap_positions: Any = None,
+    ) -> Future:
+        return self._submit(
+            f"レースID {race_id} HTML由来データ",
+            self.saver._save_all_for_race_with_cursor,
+            (race_id, race_results, race_comments, inspection_reports, lap_positions),
+        )
+
+    def submit_lap_positions(self, all_lap_data_for_saver: List[Dict[str, Any]]) -> Future:
+        return self._submit(
+            f"{len(all_lap_data_for_saver)} レース分の周回位置データ",
+            self.saver._save_lap_positions_batch_with_cursor,
+            (all_lap_data_for_saver,),
+        )
+
+    def close(self) -> None:
+        """キューに残った保存要求を書き込んでからライタースレッドを終了する"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _submit(self, label: str, save_func: Callable, args: tuple) -> Future:
+        future: Future = Future()
+        self._queue.put((label, save_func, args, future))
+        return future
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+            # 既にたまっている要求だけをまとめ、キューが空になったらすぐ書き込む
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+            if stop:
+                return
+
+    def _flush(self, batch: list) -> None:
+        def _save_batch(cursor):
+            for _, save_func, args, _ in batch:
+                save_func(*args, cursor)
             return True
 
         try:
-            self.accessor.execute_in_transaction(_save_laps_in_transaction)
-            processed_race_ids_count = len(all_lap_data_for_saver)
-            self.logger.info(
-                f"{processed_race_ids_count} レース分の周回位置データの保存トランザクションが正常に完了しました。"
-            )
-            return True
+            self.saver._run_with_cursor(_save_batch)
         except Exception as e:
-            self.logger.error(
-                f"周回位置データの保存トランザクションでエラー: {e}",
-                exc_info=True,
+            if len(batch) == 1:
+                label, _, _, future = batch[0]
+                self.logger.error(
+                    f"{label}: 保存トランザクションでエラー: {e}", exc_info=True
+                )
+                future.set_result(False)
+                return
+            self.logger.warning(
+                f"{len(batch)}件の一括保存トランザクションでエラー。1件ずつ再実行します: {e}"
             )
-            return False
+            for entry in batch:
+                self._flush([entry])
+            return
 
+        self.logger.info(
+            f"{len(batch)}件の保存要求を1トランザクションで保存しました。"
+        )
+        for _, _, _, future in batch:
+            future.set_result(True)
 
 # 既存の _save_race_comment_batch, _save_html_results_batch, _save_inspection_report_batch, _save_lap_positions_batch
 # および save_race_result_details, update_race_final_status は上記の新メソッド群に役割を吸収・改名されるため削除。
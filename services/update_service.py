@@ -3,13 +3,20 @@
 """
 
 import logging
+import sys
 from typing import List, Optional, Tuple, Dict, Any
 
 # from database.keirin_database import KeirinDatabase # KeirinDatabase は直接使わないのでコメントアウトまたは削除
 # from utils.logger_manager import LoggerManager # 削除: LoggerManager は使用しない
 # from utils.time_utils import get_current_datetime_string # 削除: 未使用のため
 import threading
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import date
+from functools import cached_property
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from api.winticket_api import WinticketAPI  # 修正: services.api -> api
 from api.yenjoy_api import YenjoyAPI  # 修正: services.api -> api
@@ -19,6 +26,7 @@ from database.db_accessor import KeirinDataAccessor  # ★ KeirinDataAccessor 
 from database.extractors.extract_data_for_step2 import Step2DataExtractor
 from database.extractors.extract_data_for_step3 import Step3DataExtractor
 from database.extractors.extract_data_for_step4 import Step4DataExtractor
+from database.extractors.extract_data_for_step5 import Step5DataExtractor
 
 # 各ステップごとのSaverをインポート
 from services.savers.step1_saver import Step1Saver
@@ -36,6 +44,7 @@ from services.updaters import (
     Step5Updater,
 )
 from utils.config_manager import ConfigManager, get_config_manager
+from utils.date_util import to_ymd
 
 # サービスの初期化時にデータセーバーを初期化
 # from services.data_saver import DataSaver # コメントアウト
@@ -43,6 +52,33 @@ from utils.config_manager import ConfigManager, get_config_manager
 # from services.yenjoy_data_saver import YenjoyDataSaver # コメントアウト
 
 
+# update_period_step_by_step でステップを実行する段。同じ段のステップは並列に実行する
+# (1,2 の後に 3,4 を並列、5 は最後)
+_STEP_TIERS = ((1,), (2,), (3, 4), (5,))
+
+
+@dataclass
+class StepResult:
+    """update_period_step_by_step の各ステップの実行結果"""
+
+    __slots__ = ("success", "message", "count")
+
+    success: bool
+    message: str
+    count: int
+
+
+# ステップ番号 -> 結果辞書のキー ("step1" など)。ループ内で毎回文字列を作らないよう事前に用意する
+_STEP_NAMES = tuple(sys.intern(f"step{i}") for i in range(1, 6))
+
+# ステップ指定 (1, "1", "step1" など) -> ステップ番号
+_STEP_TABLE = {
+    **{i: i for i in range(1, 6)},
+    **{str(i): i for i in range(1, 6)},
+    **{name: i for i, name in enumerate(_STEP_NAMES, 1)},
+}
+
+
 class UpdateService:
     """
     データの更新を担当するクラス
@@ -85,7 +121,8 @@ class UpdateService:
         if hasattr(self.yenjoy_api, "request_interval"):
             self.yenjoy_api.request_interval = yenjoy_rate_limit_wait_html
             self.logger.info(
-                f"YenjoyAPI request_interval を {yenjoy_rate_limit_wait_html}秒 に設定しました"
+                "YenjoyAPI request_interval を %s秒 に設定しました",
+                yenjoy_rate_limit_wait_html,
             )
         self.config_manager = config_manager
 
@@ -97,89 +134,218 @@ class UpdateService:
         self.saver_batch_size = self.config.get_int(
             "PERFORMANCE", "saver_batch_size", fallback=50
         )
+        self.step3_max_workers = self.config.get_int(
+            "PERFORMANCE", "step3_max_workers", fallback=1
+        )
+        # Step3/Step4 の両方で使うため1回だけ読む
+        self.rate_limit_winticket = self.config.get_float(
+            "PERFORMANCE", "rate_limit_winticket", fallback=1.0
+        )
+        # 終了済みの月の月間開催情報はディスクにキャッシュし、再取得しない (空文字で無効)
+        if hasattr(self.winticket_api, "monthly_cache_dir"):
+            self.winticket_api.monthly_cache_dir = (
+                self.config.get_value(
+                    "CACHE", "monthly_cups_dir", fallback="~/.cache/keirin/monthly"
+                )
+                or None
+            )
+        # 開催詳細 (Step2) は ETag / Last-Modified とともに保存し、条件付きリクエストで
+        # 未更新 (304) ならキャッシュを使う (空文字で無効)
+        if hasattr(self.winticket_api, "cup_detail_cache_dir"):
+            self.winticket_api.cup_detail_cache_dir = (
+                self.config.get_value(
+                    "CACHE", "cup_detail_dir", fallback="~/.cache/keirin/cup_detail"
+                )
+                or None
+            )
+        # Step3/4/5 の並列リクエストで接続を使い回せるよう、APIセッションの接続プールを広げる
+        self._configure_http_pools()
+        # 各ステップの Updater が共有するワーカースレッド (Updater ごとの同時実行数は BoundedExecutor で制限)
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=self.default_max_workers, thread_name_prefix="keirin-io"
+        )
         # default_rate_limit_winticket と default_rate_limit_yenjoy も必要であればインスタンス変数としてここで設定
         # self.default_rate_limit_winticket = self.config.get_float('PERFORMANCE', 'rate_limit_winticket', fallback=0.1)
         # self.default_rate_limit_yenjoy = self.config.get_float('PERFORMANCE', 'rate_limit_yenjoy', fallback=1.0)
         # ★★★ 初期化ここまで ★★★
 
-        # 各ステップごとのSaverインスタンスをここで明示的に作成
-        # KeirinDataAccessor を渡すように修正
-        # db_accessor = self.db.accessor # KeirinDatabaseがaccessorプロパティを持つと仮定 ← この行は不要になる
-
-        self.step1_saver = Step1Saver(
-            self.db_accessor, self.logger
-        )  # ★ self.db_accessor を使用
-        self.step2_saver = Step2Saver(
-            self.db_accessor, self.logger
-        )  # ★ self.db_accessor を使用
-        self.step3_saver = Step3Saver(
-            self.db_accessor, self.logger
-        )  # ★ self.db_accessor を使用
-        self.step4_saver = Step4Saver(
-            self.db_accessor, self.logger
-        )  # ★ self.db_accessor を使用
-        self.step5_saver = Step5Saver(
-            self.db_accessor, self.logger
-        )  # ★ self.db_accessor を使用
-
-        # Updaterインスタンスの作成
-        # 各Updaterが必要とする引数に合わせて修正
-        self.step1_updater = Step1Updater(
+        # Saver / Updater / Extractor は実行するステップでだけ必要になるため、
+        # cached_property で初回アクセス時に生成する (下記参照)
+        self.yenjoy_rate_limit_wait_html = yenjoy_rate_limit_wait_html
+
+        self.cancel_event = threading.Event()
+        self.logger.info("UpdateService initialized.")
+
+        # ステップ番号 -> (実行メソッド, 受け付けるキーワード引数)
+        common_step_kwargs = frozenset({"venue_codes", "force_update_all"})
+        self._step_dispatch = {
+            1: (self._update_step1, common_step_kwargs),
+            2: (self._update_step2, common_step_kwargs),
+            3: (self._update_step3, common_step_kwargs),
+            4: (self._update_step4, common_step_kwargs),
+            5: (self._update_step5, common_step_kwargs | {"specific_race_ids"}),
+        }
+
+        # 設定値を取得して使用 # ★★★ このブロックは上記で統合したので削除またはコメントアウト ★★★
+        # self.config = config_manager or get_config_manager()
+        # self.default_max_workers = self.config.get_int('PERFORMANCE', 'max_workers', fallback=5) # インスタンス変数として保存
+        # default_rate_limit_winticket = self.config.get_float('PERFORMANCE', 'rate_limit_winticket', fallback=0.1)
+        # default_rate_limit_yenjoy = self.config.get_float('PERFORMANCE', 'rate_limit_yenjoy', fallback=1.0)
+
+    # --- Saver (KeirinDataAccessor を渡す) ---
+    @cached_property
+    def step1_saver(self) -> Step1Saver:
+        return Step1Saver(
+            self.db_accessor,
+            self.logger,
+            cups_load_infile_threshold=self.config.get_int(
+                "PERFORMANCE", "step1_load_infile_threshold", fallback=0
+            ),
+        )
+
+    @cached_property
+    def step2_saver(self) -> Step2Saver:
+        return Step2Saver(
+            self.db_accessor,
+            self.logger,
+            bulk_chunk_size=self.config.get_int(
+                "PERFORMANCE", "step2_bulk_chunk_size", fallback=5000
+            ),
+        )
+
+    @cached_property
+    def step3_saver(self) -> Step3Saver:
+        return Step3Saver(self.db_accessor, self.logger)
+
+    @cached_property
+    def step4_saver(self) -> Step4Saver:
+        return Step4Saver(self.db_accessor, self.logger)
+
+    @cached_property
+    def step5_saver(self) -> Step5Saver:
+        return Step5Saver(
+            self.db_accessor,
+            self.logger,
+            use_prepared_statements=self.config.get_boolean(
+                "PERFORMANCE", "step5_prepared_statements", fallback=False
+            ),
+            use_multi_statements=self.config.get_boolean(
+                "PERFORMANCE", "step5_multi_statements", fallback=False
+            ),
+            lap_positions_load_infile_threshold=self.config.get_int(
+                "PERFORMANCE", "step5_load_infile_threshold", fallback=0
+            ),
+            lap_positions_relax_checks_threshold=self.config.get_int(
+                "PERFORMANCE", "step5_relax_checks_threshold", fallback=0
+            ),
+        )
+
+    # --- Updater ---
+    @cached_property
+    def step1_updater(self) -> Step1Updater:
+        return Step1Updater(
             api_client=self.winticket_api,
-            saver=self.step1_saver,  # saver を渡す
-            # db_accessor=self.db_accessor, # Step1Updaterのコンストラクタにないため削除
+            saver=self.step1_saver,
             logger=self.logger,
-            # rate_limit_wait=winticket_rate_limit_wait # Step1Updaterのコンストラクタにないため削除
+            max_workers=self.default_max_workers,
+            executor=self._io_executor,
+            rate_limit_wait=self.rate_limit_winticket,
+            # step1_load_infile_threshold を使う場合はこれ以上の値にする
+            flush_batch_size=self.config.get_int(
+                "PERFORMANCE", "step1_flush_batch_size", fallback=5000
+            ),
         )
-        self.step2_updater = Step2Updater(
+
+    @cached_property
+    def step2_updater(self) -> Step2Updater:
+        return Step2Updater(
             api_client=self.winticket_api,
-            saver=self.step2_saver,  # saver を渡す
-            # db_accessor=self.db_accessor, # Step2Updaterのコンストラクタにないため削除
+            saver=self.step2_saver,
             logger=self.logger,
-            # rate_limit_wait=winticket_rate_limit_wait # Step2Updaterのコンストラクタにないため削除
+            adaptive_concurrency=self.config.get_boolean(
+                "PERFORMANCE", "step2_adaptive_concurrency", fallback=False
+            ),
+            executor=self._io_executor,
+            flush_batch_size=self.config.get_int(
+                "PERFORMANCE", "step2_flush_batch_size", fallback=5000
+            ),
         )
-        self.step3_updater = Step3Updater(
-            api_client=self.winticket_api,  # APIクライアントを渡す
+
+    @cached_property
+    def step3_updater(self) -> Step3Updater:
+        return Step3Updater(
+            api_client=self.winticket_api,
             saver=self.step3_saver,
             logger=self.logger,
-            max_workers=self.config.get_int(
-                "PERFORMANCE", "step3_max_workers", fallback=1
-            ),
-            rate_limit_wait=self.config.get_float(
-                "PERFORMANCE", "rate_limit_winticket", fallback=1.0
-            ),
+            max_workers=self.step3_max_workers,
+            rate_limit_wait=self.rate_limit_winticket,
+            executor=self._io_executor,
+            cancel_event=self.cancel_event,
         )
-        self.step4_updater = Step4Updater(
-            api_client=self.winticket_api,  # yenjoy_api から winticket_api に変更
+
+    @cached_property
+    def step4_updater(self) -> Step4Updater:
+        return Step4Updater(
+            api_client=self.winticket_api,
             step4_saver=self.step4_saver,
             logger=self.logger,
-            max_workers=self.default_max_workers,  # max_workers を渡す
-            rate_limit_wait=self.config.get_float(
-                "PERFORMANCE", "rate_limit_winticket", fallback=1.0
-            ),  # Yenjoy用からWinticket用に適切なレートリミットに変更 (設定ファイルから取得する例)
+            max_workers=self.default_max_workers,
+            rate_limit_wait=self.rate_limit_winticket,
+            executor=self._io_executor,
+            cancel_event=self.cancel_event,
         )
-        self.step5_updater = Step5Updater(
+
+    @cached_property
+    def step5_updater(self) -> Step5Updater:
+        return Step5Updater(
             api_client=self.yenjoy_api,
             step5_saver=self.step5_saver,
-            db_accessor=self.db_accessor,  # db_accessor を渡す (Step5Updaterは期待している)
+            db_accessor=self.db_accessor,  # Step5Updater は db_accessor も使う
             logger=self.logger,
-            max_workers=self.default_max_workers,  # max_workers を渡す
-            rate_limit_wait_html=yenjoy_rate_limit_wait_html,  # rate_limit_wait_html を渡す
+            max_workers=self.default_max_workers,
+            rate_limit_wait_html=self.yenjoy_rate_limit_wait_html,
+            executor=self._io_executor,
+            cancel_event=self.cancel_event,
         )
 
-        self.cancel_event = threading.Event()
-        self.logger.info("UpdateService initialized.")
+    # --- Extractor ---
+    @cached_property
+    def step2_extractor(self) -> Step2DataExtractor:
+        return Step2DataExtractor(self.db_accessor, self.logger)
 
-        # Extractor の初期化を追加
-        self.step2_extractor = Step2DataExtractor(self.db_accessor, self.logger)
-        self.step3_extractor = Step3DataExtractor(self.db_accessor, self.logger)
-        self.step4_extractor = Step4DataExtractor(self.db_accessor, self.logger)
+    @cached_property
+    def step3_extractor(self) -> Step3DataExtractor:
+        return Step3DataExtractor(self.db_accessor, self.logger)
 
-        # 設定値を取得して使用 # ★★★ このブロックは上記で統合したので削除またはコメントアウト ★★★
-        # self.config = config_manager or get_config_manager()
-        # self.default_max_workers = self.config.get_int('PERFORMANCE', 'max_workers', fallback=5) # インスタンス変数として保存
-        # default_rate_limit_winticket = self.config.get_float('PERFORMANCE', 'rate_limit_winticket', fallback=0.1)
-        # default_rate_limit_yenjoy = self.config.get_float('PERFORMANCE', 'rate_limit_yenjoy', fallback=1.0)
+    @cached_property
+    def step4_extractor(self) -> Step4DataExtractor:
+        return Step4DataExtractor(self.db_accessor, self.logger)
+
+    @cached_property
+    def step5_extractor(self) -> Step5DataExtractor:
+        return Step5DataExtractor(self.db_accessor, self.logger)
+
+    def _configure_http_pools(self):
+        """
+        各APIクライアントの requests.Session に接続プールと接続エラー時のリトライを設定する。
+        HTTPステータスによるリトライは各APIクライアント側で行っているため、ここでは設定しない。
+        """
+        for api in (self.winticket_api, self.yenjoy_api):
+            session = getattr(api, "session", None)
+            if session is None:
+                continue
+            adapter = HTTPAdapter(
+                pool_connections=self.default_max_workers,
+                pool_maxsize=self.default_max_workers * 2,
+                max_retries=Retry(total=3, status=0, backoff_factor=0.5),
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self.logger.info(
+                "%s の接続プールを設定しました (pool_maxsize: %d)",
+                type(api).__name__,
+                self.default_max_workers * 2,
+            )
 
     def update_period_step_by_step(
         self,
@@ -189,7 +355,7 @@ class UpdateService:
         venue_codes: Optional[List[str]] = None,
         specific_race_ids: Optional[List[str]] = None,
         force_update_all: bool = False,
-    ) -> Tuple[bool, Dict[str, Dict[str, Any]]]:
+    ) -> Tuple[bool, Dict[str, Any]]:
         """
         指定期間のデータを段階的に更新する
 
@@ -208,8 +374,8 @@ class UpdateService:
             tuple: (成功したかどうか, 結果辞書)
                 結果辞書の形式: {
                     'steps': {
-                        'step1': {'success': bool, 'message': str, 'data': any},
-                        'step2': {'success': bool, 'message': str, 'data': any},
+                        'step1': StepResult(success, message, count),
+                        'step2': StepResult(success, message, count),
                         ...
                     },
                     'total_success': bool,
@@ -218,25 +384,45 @@ class UpdateService:
                 }
         """
         self.logger.info(
-            f"期間 {start_date_str} から {end_date_str} までのデータを段階的に更新します。ステップ: {steps}, 開催ID: {venue_codes}, 強制更新: {force_update_all}"
+            "期間 %s から %s までのデータを段階的に更新します。"
+            "ステップ: %s, 開催ID: %s, 強制更新: %s",
+            start_date_str,
+            end_date_str,
+            steps,
+            venue_codes,
+            force_update_all,
         )
+        # 開始日が終了日より後の期間は、抽出クエリを発行する前にはじく
+        try:
+            range_start = date.fromisoformat(start_date_str)
+            range_end = date.fromisoformat(end_date_str)
+        except (TypeError, ValueError):
+            range_start = range_end = None  # 形式の検証は各ステップに任せる
+        if range_start and range_end and range_start > range_end:
+            error_msg = (
+                f"期間指定が不正です (開始日 {start_date_str} > 終了日 {end_date_str})"
+            )
+            self.logger.error(error_msg)
+            return False, {
+                "error": error_msg,
+                "steps": {},
+                "total_success": False,
+                "messages": [],
+            }
+        # 重複した開催IDは順序を保ったまま取り除く
+        venue_codes = list(dict.fromkeys(venue_codes)) if venue_codes else None
 
         if steps is None:
             steps = [1, 2, 3, 4, 5]
 
-        normalized_steps = []
-        for step in steps:
-            if isinstance(step, int) and 1 <= step <= 5:
-                normalized_steps.append(step)
-            elif isinstance(step, str) and step.startswith("step") and len(step) > 4:
-                try:
-                    step_num = int(step[4:])
-                    if 1 <= step_num <= 5:
-                        normalized_steps.append(step_num)
-                except ValueError:
-                    self.logger.warning(f"無効なステップ指定: {step}")
-            else:
-                self.logger.warning(f"無効なステップ指定: {step}")
+        normalized_steps = [
+            step_num
+            for step_num in (_STEP_TABLE.get(step) for step in steps)
+            if step_num is not None
+        ]
+        if len(normalized_steps) < len(steps):
+            invalid_steps = [step for step in steps if step not in _STEP_TABLE]
+            self.logger.warning("無効なステップ指定: %s", invalid_steps)
 
         if not normalized_steps:
             self.logger.error("有効なステップが指定されていません")
@@ -249,86 +435,106 @@ class UpdateService:
 
         results = {"steps": {}, "total_success": True, "messages": [], "error": None}
         critical_steps = {1, 2, 5}
-
-        # 各ステップの処理
-        for step_num in normalized_steps:
+        step_kwargs = {
+            "venue_codes": venue_codes,
+            "specific_race_ids": specific_race_ids,
+            "force_update_all": force_update_all,
+        }
+
+        # 依存関係ごとの段 (1 → 2 → 3,4 → 5) で処理する。
+        # 3 と 4 は別エンドポイント・別テーブルなので同じ段で並列に実行する
+        requested_steps = set(normalized_steps)
+        for tier in _STEP_TIERS:
+            tier_steps = [step_num for step_num in tier if step_num in requested_steps]
+            if not tier_steps:
+                continue
             if self.cancel_event.is_set():
                 self.logger.info("処理がキャンセルされました。")
                 results["messages"].append("処理がキャンセルされました。")
                 results["total_success"] = False
                 break
 
-            step_name = f"step{step_num}"
-            step_success = False
-            step_message = ""
-            step_data_count = 0
-
-            try:
-                self.logger.info(f"--- {step_name} を開始します ---")
-                if step_num == 1:
-                    step_success, step_message, step_data_count = self._update_step1(
-                        start_date_str,
-                        end_date_str,
-                        venue_codes=venue_codes,
-                        force_update_all=force_update_all,
-                    )
-                elif step_num == 2:
-                    step_success, step_message, step_data_count = self._update_step2(
-                        start_date_str,
-                        end_date_str,
-                        venue_codes=venue_codes,
-                        force_update_all=force_update_all,
-                    )
-                elif step_num == 3:
-                    step_success, step_message, step_data_count = self._update_step3(
-                        start_date_str,
-                        end_date_str,
-                        venue_codes=venue_codes,
-                        force_update_all=force_update_all,
-                    )
-                elif step_num == 4:
-                    step_success, step_message, step_data_count = self._update_step4(
-                        start_date_str,
-                        end_date_str,
-                        venue_codes=venue_codes,
-                        force_update_all=force_update_all,
-                    )
-                elif step_num == 5:
-                    step_success, step_message, step_data_count = self._update_step5(
-                        start_date_str,
-                        end_date_str,
-                        venue_codes=venue_codes,
-                        specific_race_ids=specific_race_ids,
-                        force_update_all=force_update_all,
+            if len(tier_steps) == 1:
+                tier_results = {
+                    tier_steps[0]: self._run_step(
+                        tier_steps[0], start_date_str, end_date_str, step_kwargs
                     )
-
-                self.logger.info(
-                    f"--- {step_name} が完了しました ({'成功' if step_success else '失敗'}) ---"
+                }
+            else:
+                with ThreadPoolExecutor(
+                    max_workers=len(tier_steps), thread_name_prefix="UpdateStep"
+                ) as executor:
+                    futures = {
+                        executor.submit(
+                            self._run_step,
+                            step_num,
+                            start_date_str,
+                            end_date_str,
+                            step_kwargs,
+                        ): step_num
+                        for step_num in tier_steps
+                    }
+                    tier_results = {
+                        futures[future]: future.result()
+                        for future in as_completed(futures)
+                    }
+
+            critical_failure = None
+            for step_num in tier_steps:
+                step_name = _STEP_NAMES[step_num - 1]
+                step_success, step_message, step_data_count = tier_results[step_num]
+                results["steps"][step_name] = StepResult(
+                    step_success, step_message, step_data_count
                 )
-
-            except Exception as e:
-                step_message = f"{step_name} 処理中に予期せぬエラー: {e}"
-                self.logger.error(step_message, exc_info=True)
-                step_success = False
-
-            results["steps"][step_name] = {
-                "success": step_success,
-                "message": step_message,
-                "count": step_data_count,
-            }
-            results["messages"].append(f"{step_name}: {step_message}")
-            if not step_success and step_num in critical_steps:
+                results["messages"].append(f"{step_name}: {step_message}")
+                if not step_success:
+                    results["total_success"] = False
+                    if step_num in critical_steps and critical_failure is None:
+                        critical_failure = step_name
+            if critical_failure:
                 self.logger.warning(
-                    f"重要なステップ {step_name} が失敗したため、以降のステップを中止します。"
+                    "重要なステップ %s が失敗したため、以降のステップを中止します。",
+                    critical_failure,
                 )
-                results["total_success"] = False
-                results["error"] = f"重要なステップ {step_name} が失敗しました。"
+                results["error"] = f"重要なステップ {critical_failure} が失敗しました。"
                 break
-            if not step_success:
-                results["total_success"] = False
 
         return results["total_success"], results
 
+    def _run_step(
+        self,
+        step_num: int,
+        start_date_str: str,
+        end_date_str: str,
+        step_kwargs: Dict[str, Any],
+    ) -> Tuple[bool, str, int]:
+        """指定ステップを実行し (成功したかどうか, メッセージ, 件数) を返す"""
+        step_name = _STEP_NAMES[step_num - 1]
+        step_success = False
+        step_message = ""
+        step_data_count = 0
+        step_func, allowed_kwargs = self._step_dispatch[step_num]
+        kwargs = {k: v for k, v in step_kwargs.items() if k in allowed_kwargs}
+
+        try:
+            self.logger.info("--- %s を開始します ---", step_name)
+            step_success, step_message, step_data_count = step_func(
+                start_date_str, end_date_str, **kwargs
+            )
+
+            self.logger.info(
+                "--- %s が完了しました (%s) ---",
+                step_name,
+                "成功" if step_success else "失敗",
+            )
+
+        except Exception as e:
+            step_message = f"{step_name} 処理中に予期せぬエラー: {e}"
+            self.logger.error(step_message, exc_info=True)
+            step_success = False
+
+        return step_success, step_message, step_data_count
+
     def _update_step1(
         self,
         start_date: str,
@@ -338,7 +544,11 @@ class UpdateService:
     ):
         """ステップ1: 開催日程情報をWinticket APIから取得・保存"""
         self.logger.info(
-            f"Step1: 開催日程情報の更新を開始 (期間: {start_date} - {end_date}, 会場: {venue_codes}, 強制: {force_update_all})"
+            "Step1: 開催日程情報の更新を開始 (期間: %s - %s, 会場: %s, 強制: %s)",
+            start_date,
+            end_date,
+            venue_codes,
+            force_update_all,
         )
         try:
             # Step1 updater doesn't currently support force_update_all parameter
@@ -347,17 +557,19 @@ class UpdateService:
                 self.logger.warning(
                     "Step1: venue_codes filtering not implemented in update_period. Processing full period."
                 )
-            success, result_data = self.step1_updater.update_period(
-                start_date, end_date
-            )
+            # 保存は1ステップ1トランザクションにまとめ、コミットを1回にする
+            with self.db_accessor.transaction():
+                success, result_data = self.step1_updater.update_period(
+                    start_date, end_date
+                )
             updated_count = (
                 len(result_data.get("cups", [])) if isinstance(result_data, dict) else 0
             )
             msg = f"開催日程情報 {updated_count} 件を更新しました。"
-            self.logger.info(f"Step1完了: {msg}")
+            self.logger.info("Step1完了: %s", msg)
             return True, msg, updated_count
         except Exception as e:
-            self.logger.error(f"Step1処理中にエラー: {e}", exc_info=True)
+            self.logger.error("Step1処理中にエラー: %s", e, exc_info=True)
             return False, f"Step1エラー: {e}", 0
 
     def _update_step2(
@@ -369,7 +581,11 @@ class UpdateService:
     ):
         """ステップ2: レース基本情報・番組情報をWinticket APIから取得・保存"""
         self.logger.info(
-            f"Step2: レース基本情報の更新を開始 (期間: {start_date} - {end_date}, 会場: {venue_codes}, 強制: {force_update_all})"
+            "Step2: レース基本情報の更新を開始 (期間: %s - %s, 会場: %s, 強制: %s)",
+            start_date,
+            end_date,
+            venue_codes,
+            force_update_all,
         )
         try:
             extracted_data = self.step2_extractor.extract(
@@ -384,16 +600,18 @@ class UpdateService:
                 self.logger.info(msg)
                 return True, msg, 0
             self.logger.info(
-                f"Step2: {len(cup_ids_to_update)} 件の開催情報を取得します。"
+                "Step2: %d 件の開催情報を取得します。", len(cup_ids_to_update)
             )
-            success, result_info = self.step2_updater.update_cups(cup_ids_to_update)
+            # 保存は1ステップ1トランザクションにまとめ、コミットを1回にする
+            with self.db_accessor.transaction():
+                success, result_info = self.step2_updater.update_cups(cup_ids_to_update)
             saved_races = result_info.get("saved_races", 0)
             saved_schedules = result_info.get("saved_schedules", 0)
             msg = f"開催情報: スケジュール {saved_schedules} 件、レース {saved_races} 件を保存。"
-            self.logger.info(f"Step2完了: {msg}")
+            self.logger.info("Step2完了: %s", msg)
             return success, msg, saved_races + saved_schedules
         except Exception as e:
-            self.logger.error(f"Step2処理中にエラー: {e}", exc_info=True)
+            self.logger.error("Step2処理中にエラー: %s", e, exc_info=True)
             return False, f"Step2エラー: {e}", 0
 
     def _update_step3(
@@ -405,7 +623,11 @@ class UpdateService:
     ):
         """ステップ3: レース詳細情報（出走表、選手コメント）をWinticket APIから取得・保存"""
         self.logger.info(
-            f"Step3: レース詳細情報の更新を開始 (期間: {start_date} - {end_date}, 会場: {venue_codes}, 強制: {force_update_all})"
+            "Step3: レース詳細情報の更新を開始 (期間: %s - %s, 会場: %s, 強制: %s)",
+            start_date,
+            end_date,
+            venue_codes,
+            force_update_all,
         )
         total_updated_count = 0
         all_success = True
@@ -424,17 +646,20 @@ class UpdateService:
                     "Step3: 開催IDまたは期間が指定されていません。スキップします。"
                 )
                 return True, "開催IDまたは期間が指定されていないためスキップ", 0
+            # 開催ID指定時は全開催分を1回のクエリでまとめて抽出する
+            races_by_cup = {}
+            all_races = []
+            items_with_races = items_without_races = 0
+            if id_type == "cup_id":
+                races_by_cup = self.step3_extractor.extract_bulk(
+                    target_items_for_extraction, force_update_all=force_update_all
+                )
             for item in target_items_for_extraction:
                 if self.cancel_event.is_set():
                     break
                 races_for_update_step3 = []
                 if id_type == "cup_id":
-                    extracted_data_step3 = self.step3_extractor.extract(
-                        cup_id=item, force_update_all=force_update_all
-                    )
-                    races_for_update_step3 = extracted_data_step3.get(
-                        "races_for_update", []
-                    )
+                    races_for_update_step3 = races_by_cup.get(str(item), [])
                 elif id_type == "period":
                     extracted_data_step3 = self.step3_extractor.extract(
                         start_date=item[0],
@@ -444,36 +669,56 @@ class UpdateService:
                     races_for_update_step3 = extracted_data_step3.get(
                         "races_for_update", []
                     )
+                # 開催ごとの件数は DEBUG に留め、INFO にはループ後の集計行だけ出す
                 if not races_for_update_step3:
-                    self.logger.info(
-                        f"Step3: 開催ID/期間 {item} に更新対象のレース詳細情報が見つかりませんでした。"
+                    self.logger.debug(
+                        "Step3: 開催ID/期間 %s に更新対象のレース詳細情報が見つかりませんでした。",
+                        item,
                     )
+                    items_without_races += 1
                     continue
-                self.logger.info(
-                    f"Step3: 開催ID/期間 {item} で {len(races_for_update_step3)} 件のレース詳細情報を更新します。"
+                self.logger.debug(
+                    "Step3: 開催ID/期間 %s で %d 件のレース詳細情報を更新します。",
+                    item,
+                    len(races_for_update_step3),
                 )
+                items_with_races += 1
+                all_races.extend(races_for_update_step3)
+            self.logger.info(
+                "Step3: %d 件の開催ID/期間のうち %d 件で計 %d 件のレース詳細情報を更新します"
+                " (対象なし: %d 件)",
+                items_with_races + items_without_races,
+                items_with_races,
+                len(all_races),
+                items_without_races,
+            )
+            # 全開催分をまとめて1回の Updater 呼び出しで処理する
+            if all_races and not self.cancel_event.is_set():
                 success, result_info = self.step3_updater.update_races_step3(
-                    races_for_update_step3,
-                    batch_size=50,
+                    all_races,
+                    batch_size=self.saver_batch_size,
                     with_parallel=True,
                     force_update=force_update_all,
                 )
                 # 結果を従来の形式に変換
-                success_count_updater = result_info.get("succeeded_saves", 0)
+                total_updated_count = result_info.get("succeeded_saves", 0)
                 error_count_updater = result_info.get("failed_saves", 0)
-                total_updated_count += success_count_updater
-                if error_count_updater > 0:
+                failures_by_cup = result_info.get("failures_by_cup", {})
+                if failures_by_cup or error_count_updater > 0:
                     all_success = False
-                    error_messages.append(
-                        f"開催ID/期間 {item} で {error_count_updater}件のエラー発生。"
+                    error_messages.extend(
+                        f"開催ID {cup_id} で {count}件のエラー発生。"
+                        for cup_id, count in failures_by_cup.items()
                     )
+                    if not failures_by_cup:
+                        error_messages.append(f"{error_count_updater}件のエラー発生。")
             msg = f"レース詳細情報 {total_updated_count} 件を更新しました。"
             if not all_success:
                 msg += " いくつかのエラーが発生しました: " + "; ".join(error_messages)
-            self.logger.info(f"Step3完了: {msg}")
+            self.logger.info("Step3完了: %s", msg)
             return all_success, msg, total_updated_count
         except Exception as e:
-            self.logger.error(f"Step3処理中にエラー: {e}", exc_info=True)
+            self.logger.error("Step3処理中にエラー: %s", e, exc_info=True)
             return False, f"Step3エラー: {e}", 0
 
     def _update_step4(
@@ -485,7 +730,11 @@ class UpdateService:
     ):
         """ステップ4: オッズ情報をWinticket APIから取得・保存"""
         self.logger.info(
-            f"Step4: オッズ情報の更新を開始 (期間: {start_date} - {end_date}, 会場: {venue_codes}, 強制: {force_update_all})"
+            "Step4: オッズ情報の更新を開始 (期間: %s - %s, 会場: %s, 強制: %s)",
+            start_date,
+            end_date,
+            venue_codes,
+            force_update_all,
         )
         total_updated_count = 0
         all_success = True
@@ -504,50 +753,76 @@ class UpdateService:
                     "Step4: 開催IDまたは期間が指定されていません。スキップします。"
                 )
                 return True, "開催IDまたは期間が指定されていないためスキップ", 0
+            # 開催ID指定時は全開催分を1回のクエリでまとめて抽出する
+            races_by_cup = {}
+            all_races = []
+            items_with_races = items_without_races = 0
+            if id_type == "cup_id":
+                races_by_cup = self.step4_extractor.extract_bulk(
+                    target_items_for_extraction, force_update_all=force_update_all
+                )
             for item in target_items_for_extraction:
                 if self.cancel_event.is_set():
                     break
                 races_for_odds_update = []
                 if id_type == "cup_id":
-                    races_for_odds_update = self.step4_extractor.extract(
-                        cup_id=item, force_update_all=force_update_all
-                    )
+                    races_for_odds_update = races_by_cup.get(str(item), [])
                 elif id_type == "period":
                     races_for_odds_update = self.step4_extractor.extract(
                         start_date=item[0],
                         end_date=item[1],
                         force_update_all=force_update_all,
                     )
+                # 開催ごとの件数は DEBUG に留め、INFO にはループ後の集計行だけ出す
                 if not races_for_odds_update:
-                    self.logger.info(
-                        f"Step4: 開催ID/期間 {item} に更新対象のオッズ情報が見つかりませんでした。"
+                    self.logger.debug(
+                        "Step4: 開催ID/期間 %s に更新対象のオッズ情報が見つかりませんでした。",
+                        item,
                     )
+                    items_without_races += 1
                     continue
-                self.logger.info(
-                    f"Step4: 開催ID/期間 {item} で {len(races_for_odds_update)} 件のオッズ情報を更新します。"
+                self.logger.debug(
+                    "Step4: 開催ID/期間 %s で %d 件のオッズ情報を更新します。",
+                    item,
+                    len(races_for_odds_update),
                 )
+                items_with_races += 1
+                all_races.extend(races_for_odds_update)
+            self.logger.info(
+                "Step4: %d 件の開催ID/期間のうち %d 件で計 %d 件のオッズ情報を更新します"
+                " (対象なし: %d 件)",
+                items_with_races + items_without_races,
+                items_with_races,
+                len(all_races),
+                items_without_races,
+            )
+            # 全開催分をまとめて1回の Updater 呼び出しで処理する
+            if all_races and not self.cancel_event.is_set():
                 success, result_info = self.step4_updater.update_odds_bulk(
-                    races_for_odds_update,
-                    batch_size=50,
+                    all_races,
+                    batch_size=self.saver_batch_size,
                     with_parallel=True,
                     force_update_all=force_update_all,
                 )
                 # 結果を従来の形式に変換
-                success_count_updater = result_info.get("successful_saves", 0)
+                total_updated_count = result_info.get("successful_saves", 0)
                 error_count_updater = result_info.get("failed_saves", 0)
-                total_updated_count += success_count_updater
-                if error_count_updater > 0:
+                failures_by_cup = result_info.get("failures_by_cup", {})
+                if failures_by_cup or error_count_updater > 0:
                     all_success = False
-                    error_messages.append(
-                        f"開催ID/期間 {item} で {error_count_updater}件のエラー発生。"
+                    error_messages.extend(
+                        f"開催ID {cup_id} で {count}件のエラー発生。"
+                        for cup_id, count in failures_by_cup.items()
                     )
+                    if not failures_by_cup:
+                        error_messages.append(f"{error_count_updater}件のエラー発生。")
             msg = f"オッズ情報 {total_updated_count} 件を更新しました。"
             if not all_success:
                 msg += " いくつかのエラーが発生しました: " + "; ".join(error_messages)
-            self.logger.info(f"Step4完了: {msg}")
+            self.logger.info("Step4完了: %s", msg)
             return all_success, msg, total_updated_count
         except Exception as e:
-            self.logger.error(f"Step4処理中にエラー: {e}", exc_info=True)
+            self.logger.error("Step4処理中にエラー: %s", e, exc_info=True)
             return False, f"Step4エラー: {e}", 0
 
     def _update_step5(
@@ -560,30 +835,37 @@ class UpdateService:
     ):
         """ステップ5: HTMLパース結果（レース結果、周回、コメント等）をYenJoy APIから取得・保存"""
         self.logger.info(
-            f"Step5: HTMLパース結果の更新を開始 (期間: {start_date} - {end_date}, 会場: {venue_codes}, 特定レース: {specific_race_ids}, 強制: {force_update_all})"
+            "Step5: HTMLパース結果の更新を開始 "
+            "(期間: %s - %s, 会場: %s, 特定レース: %s, 強制: %s)",
+            start_date,
+            end_date,
+            venue_codes,
+            specific_race_ids,
+            force_update_all,
         )
         try:
-            # Step5Updaterのupdate_results_bulkメソッドが内部でレース情報取得も行うため、
-            # 直接そのメソッドを呼び出す（パラメータから対象レースを決定）
-            if specific_race_ids:
-                self.logger.warning(
-                    "Step5: specific_race_ids指定は現在サポートされていません。期間ベースでの処理を行います。"
-                )
-                if not start_date or not end_date:
-                    from datetime import datetime, timedelta
-
-                    today = datetime.now()
-                    start_date = (today - timedelta(days=30)).strftime("%Y-%m-%d")
-                    end_date = today.strftime("%Y-%m-%d")
-
-            if not start_date or not end_date:
+            # 対象レースを Extractor で1回だけ抽出し、そのまま Updater に渡す
+            if not specific_race_ids and (not start_date or not end_date):
                 self.logger.warning("Step5: 期間が指定されていません。スキップします。")
                 return True, "更新対象の期間が指定されていないためスキップ", 0
+            try:
+                if specific_race_ids:
+                    races_to_process = self.step5_extractor.extract_by_race_ids(
+                        specific_race_ids, force=force_update_all
+                    )
+                else:
+                    races_to_process = self.step5_extractor.extract(
+                        start_date,
+                        end_date,
+                        force=force_update_all,
+                        venue_codes=venue_codes,
+                    )
+            except Exception as e:
+                # 抽出失敗を「対象 0 件」として成功扱いにしない
+                self.logger.error("Step5: 更新対象レースの取得に失敗しました: %s", e)
+                return False, "Step5エラー: DB Error: Failed to get races for Step5.", 0
 
-            # Step5Updaterのupdate_results_bulkメソッドを直接使用
-            result = self.step5_updater.update_results_bulk(
-                start_date, end_date, venue_codes, force_update_all
-            )
+            result = self.step5_updater.update_results_bulk_for_races(races_to_process)
 
             if result.get("success"):
                 # resultにprocessed_countなどが含まれている場合はそれを使用、なければ0
@@ -594,14 +876,14 @@ class UpdateService:
                     details = result["details"]
                     if details.get("failed_count", 0) > 0:
                         msg += f" ({details.get('failed_count', 0)}件のエラーあり)"
-                self.logger.info(f"Step5完了: {msg}")
+                self.logger.info("Step5完了: %s", msg)
                 return True, msg, processed_count
             else:
                 msg = f"Step5エラー: {result.get('message', '不明なエラー')}"
                 self.logger.error(msg)
                 return False, msg, 0
         except Exception as e:
-            self.logger.error(f"Step5処理中にエラー: {e}", exc_info=True)
+            self.logger.error("Step5処理中にエラー: %s", e, exc_info=True)
             return False, f"Step5エラー: {e}", 0
 
     def update_cup(self, cup_id: str, steps: List[str], force_update_all: bool = False):
@@ -617,7 +899,10 @@ class UpdateService:
             tuple: (成功したかどうか, メッセージ)
         """
         self.logger.info(
-            f"開催ID {cup_id} のデータを更新します。ステップ: {steps}, 強制更新: {force_update_all}"
+            "開催ID %s のデータを更新します。ステップ: %s, 強制更新: %s",
+            cup_id,
+            steps,
+            force_update_all,
         )
         cup_info = self.db_accessor.get_cup_info(cup_id)
         if (
@@ -626,7 +911,8 @@ class UpdateService:
             or not cup_info.get("end_date")
         ):
             self.logger.error(
-                f"開催ID {cup_id} の情報が見つからないか、日付情報が不完全です。処理を中止します。"
+                "開催ID %s の情報が見つからないか、日付情報が不完全です。処理を中止します。",
+                cup_id,
             )
             return False, {
                 "error": f"開催ID {cup_id} の情報取得失敗",
@@ -634,21 +920,9 @@ class UpdateService:
                 "total_success": False,
                 "messages": [],
             }
-        start_date_dt = cup_info["start_date"]
-        end_date_dt = cup_info["end_date"]
-        start_date_str_cup = (
-            start_date_dt.strftime("%Y-%m-%d")
-            if isinstance(start_date_dt, datetime)
-            else str(start_date_dt)
-        )
-        end_date_str_cup = (
-            end_date_dt.strftime("%Y-%m-%d")
-            if isinstance(end_date_dt, datetime)
-            else str(end_date_dt)
-        )
         return self.update_period_step_by_step(
-            start_date_str=start_date_str_cup,
-            end_date_str=end_date_str_cup,
+            start_date_str=to_ymd(cup_info["start_date"]),
+            end_date_str=to_ymd(cup_info["end_date"]),
             steps=steps,
             venue_codes=[cup_id],
             force_update_all=force_update_all,
@@ -664,32 +938,25 @@ class UpdateService:
             bool: クリーンアップが成功したかどうか
         """
         try:
-            # データベースインスタンスが存在し、safe_cleanupメソッドを持っている場合は呼び出す
-            if (
-                hasattr(self, "db_accessor")
-                and self.db_accessor
-                and hasattr(self.db_accessor, "safe_cleanup")
-            ):
-                self.logger.info("データベース接続の安全なクリーンアップを実行します")
-                self.db_accessor.safe_cleanup()
-                return True
-            # close_connectionメソッドを持っている場合は呼び出す
-            elif (
-                hasattr(self, "db_accessor")
-                and self.db_accessor
-                and hasattr(self.db_accessor, "close_connection")
-            ):
-                self.logger.info("データベース接続を閉じます")
-                self.db_accessor.close_connection()
-                return True
-            else:
+            # Updater 共有のワーカースレッドを終了する
+            self._io_executor.shutdown(wait=True)
+
+            # safe_cleanup を優先し、無ければ close_connection を呼び出す
+            db = getattr(self, "db_accessor", None)
+            cleanup = getattr(db, "safe_cleanup", None) or getattr(
+                db, "close_connection", None
+            )
+            if cleanup is None:
                 self.logger.warning(
                     "データベースインスタンスが見つからないか、クリーンアップメソッドがありません"
                 )
                 return False
+            self.logger.info("データベース接続をクリーンアップします (%s)", cleanup.__name__)
+            cleanup()
+            return True
         except Exception as e:
             self.logger.error(
-                f"データベース接続のクリーンアップ中にエラーが発生しました: {str(e)}"
+                "データベース接続のクリーンアップ中にエラーが発生しました: %s", e
             )
             return False
 
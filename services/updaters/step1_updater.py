@@ -4,12 +4,17 @@
 
 import calendar
 import logging
-import time
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import date, datetime
-from typing import Any, Optional
+from operator import itemgetter
+from typing import Any, Dict, Iterator, Optional
+
+from api.api_rate_limiter import SlidingWindowRateLimiter
 
 # Step1Saver と APIクライアント(仮に BaseKeirinAPI) をインポート
 from services.savers.step1_saver import Step1Saver  # パスは環境に合わせてください
+from utils.bounded_executor import BoundedExecutor, iter_in_order
+from utils.date_util import iter_months, parse_ymd
 
 # import json # json モジュールは save_monthly_cups の中では直接使われていなかったので一旦コメントアウト
 
@@ -17,6 +22,93 @@ from services.savers.step1_saver import Step1Saver  # パスは環境に合わ
 # from services.clients.base_keirin_api import BaseKeirinApi # APIクライアントの具体的なクラス名に置き換えてください
 
 
+def _safe_int(value: Any, default: Optional[int] = 0) -> Optional[int]:
+    """int に変換する。変換できない場合は default を返す"""
+    if value is None:
+        return default
+    if type(value) is int:  # APIの数値はそのまま返し、例外処理を通さない
+        return value
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def _safe_float(value: Any, default: Optional[float] = 0.0) -> Optional[float]:
+    """float に変換する。変換できない場合は default を返す"""
+    if value is None:
+        return default
+    if type(value) is float:
+        return value
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def _ymd_int(date_str: str) -> int:
+    """「YYYYMMDD」または「YYYY-MM-DD」を 20240101 のような整数にする (大小関係は日付順と一致)"""
+    digits = date_str.replace("-", "")
+    if len(digits) != 8:
+        raise ValueError(f"日付形式が不正です: {date_str}")
+    return int(digits)
+
+
+# 会場レコードの (保存用キー, APIのキー, 変換関数) 。venue_id は別途設定する
+_VENUE_FIELDS = (
+    ("venue_name", "name", None),
+    ("name1", "name1", None),
+    ("address", "address", None),
+    ("phoneNumber", "phoneNumber", None),
+    ("websiteUrl", "websiteUrl", None),
+    ("bankFeature", "bankFeature", None),
+    ("trackStraightDistance", "trackStraightDistance", _safe_float),
+    ("trackAngleCenter", "trackAngleCenter", None),
+    ("trackAngleStraight", "trackAngleStraight", None),
+    ("homeWidth", "homeWidth", _safe_int),
+    ("backWidth", "backWidth", _safe_int),
+    ("centerWidth", "centerWidth", _safe_float),
+)
+
+
+def _int_or_none(value: Any) -> Optional[int]:
+    """int に変換する。変換できない場合は None"""
+    return _safe_int(value, None)
+
+
+def _cup_record(
+    cup_api: Dict[str, Any], cup_id: Any, start_date: str, end_date: str
+) -> Dict[str, Any]:
+    """
+    APIのカップ情報を保存用レコードにする。日付・会場IDのキー名と形式はAPIのものを保持する。
+    月ごとに数百件呼ばれるため、項目表のループではなく項目ごとに直接書き下している。
+    labels / playersUnfixed が無い場合、Step1Saver 側で空文字 / 0 として扱われる
+    """
+    record = {
+        "cup_id": str(cup_id),
+        "startDate": start_date,
+        "endDate": end_date,
+        "venueId": str(cup_api["venueId"]),
+    }
+    get = cup_api.get
+    value = get("name")
+    if value is not None:
+        record["cup_name"] = value
+    value = _int_or_none(get("duration"))
+    if value is not None:
+        record["duration"] = value
+    value = _int_or_none(get("grade"))
+    if value is not None:
+        record["grade"] = value
+    value = get("labels")
+    if value is not None:
+        record["labels"] = value
+    value = get("playersUnfixed")
+    if value is not None:
+        record["playersUnfixed"] = value
+    return record
+
+
 class Step1Updater:
     """
     ステップ1: 月間開催情報を取得・更新するクラス (MySQL対応)
@@ -24,7 +116,14 @@ class Step1Updater:
 
     # def __init__(self, winticket_api, db_instance, saver, logger=None): # 旧コンストラクタ
     def __init__(
-        self, api_client: Any, saver: Step1Saver, logger: logging.Logger = None
+        self,
+        api_client: Any,
+        saver: Step1Saver,
+        logger: logging.Logger = None,
+        max_workers: int = 3,
+        executor: Optional[Executor] = None,
+        rate_limit_wait: float = 0.2,
+        flush_batch_size: int = 5000,
     ):
         """
         初期化
@@ -33,11 +132,99 @@ class Step1Updater:
             api_client: APIクライアントインスタンス (型は実際のクライアントクラスに置き換えてください)
             saver (Step1Saver): Step1Saver のインスタンス
             logger (logging.Logger, optional): ロガーオブジェクト。 Defaults to None.
+            max_workers (int): 月間開催情報を並列に取得する最大ワーカー数
+            executor (Executor, optional): 他の Updater と共有する executor。None の場合は取得ごとに作成する。
+            rate_limit_wait (float): 月間データ取得の平均間隔（秒）。0 以下なら制限しない。
+            flush_batch_size (int): update_period でカップ情報がこの件数に達したら途中保存する
         """
         self.api = api_client  # winticket_api を api_client に変更
         # self.db = db_instance # db_instance は不要なので削除
         self.saver = saver
         self.logger = logger or logging.getLogger(__name__)
+        self.max_workers = max_workers
+        self.executor = executor
+        self.flush_batch_size = flush_batch_size
+        # rate_limit_wait * max_workers 秒あたり max_workers 回までに抑え、平均間隔を
+        # rate_limit_wait 秒に保つ (ワーカー数までの同時送信は待機しない)
+        self.rate_limiter = (
+            SlidingWindowRateLimiter(
+                max_calls=max(1, max_workers),
+                period=rate_limit_wait * max(1, max_workers),
+                logger=self.logger,
+            )
+            if rate_limit_wait > 0
+            else None
+        )
+
+    def _worker_pool(self):
+        """月間データ取得用の executor を返す (共有 executor があれば同時実行数を制限して使う)"""
+        if self.executor is not None:
+            return BoundedExecutor(self.executor, self.max_workers)
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="Step1Worker"
+        )
+
+    def _flush_to_db(
+        self,
+        regions: list,
+        venues: list,
+        cups: list,
+        saved_ids_map: dict,
+    ) -> bool:
+        """
+        溜まっている地域・会場・カップ情報を1トランザクションで保存し、各リストを空にする。
+        保存できた場合は ID を saved_ids_map に追記して True を返す。
+        """
+        if not (regions or venues or cups):
+            return True
+        self.logger.info(
+            f"地域情報 {len(regions)} 件、会場情報 {len(venues)} 件、"
+            f"カップ情報 {len(cups)} 件を保存します"
+        )
+        success = True
+        try:
+            self.saver.save_monthly_bulk(regions, venues, cups)
+            # 各レコードのIDは整形時に必ず設定しているので、そのまま取り出す
+            for records, id_key, map_key in (
+                (regions, "region_id", "regions"),
+                (venues, "venue_id", "venues"),
+                (cups, "cup_id", "cups"),
+            ):
+                saved_ids_map[map_key].extend(map(itemgetter(id_key), records))
+            self.logger.info("地域・会場・カップ情報の保存処理が正常に完了しました。")
+        except Exception as e:
+            self.logger.error(
+                f"地域・会場・カップ情報の保存中にエラーが発生: {e}", exc_info=True
+            )
+            success = False
+        regions.clear()
+        venues.clear()
+        cups.clear()
+        return success
+
+    def _fetch_monthly(self, api_date_str: str):
+        """レート制限の枠を確保してから月間開催情報を1か月分取得する"""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        return self.api.get_monthly_cups(api_date_str)
+
+    def _iter_monthly_responses(self, months: list) -> Iterator[tuple]:
+        """
+        (年, 月) のリストについて月間開催情報を並列に取得し、
+        (年, 月, レスポンス) を入力と同じ順序で1か月ずつ返す。
+        全月の取得完了を待たないので、後続の月の取得中に先頭の月から整形を進められる。
+        各リクエストの前に rate_limiter で送信レートを抑える。
+        """
+        with self._worker_pool() as pool:
+            # 先行して取得する月はワーカー数の2倍までに抑え、1か月返すごとに次を投入する
+            responses = iter_in_order(
+                pool,
+                self._fetch_monthly,
+                (f"{year}{month:02d}01" for year, month in months),
+                self.max_workers * 2,
+            )
+            for (year, month), response in zip(months, responses):
+                yield year, month, response
 
     def update_monthly_cups(self, year: int, month: int) -> tuple[bool, list]:
         """
@@ -109,12 +296,8 @@ class Step1Updater:
                 last_day_of_month = calendar.monthrange(now.year, now.month)[1]
                 target_last_date = date(now.year, now.month, last_day_of_month)
             else:
-                target_first_date = datetime.strptime(
-                    start_date_str.replace("-", ""), "%Y%m%d"
-                ).date()
-                target_last_date = datetime.strptime(
-                    end_date_str.replace("-", ""), "%Y%m%d"
-                ).date()
+                target_first_date = parse_ymd(start_date_str)
+                target_last_date = parse_ymd(end_date_str)
 
             self.logger.info(
                 f"処理対象期間: {target_first_date} から {target_last_date}"
@@ -123,38 +306,43 @@ class Step1Updater:
             all_regions_to_save = []
             all_venues_to_save = []
             all_cups_to_save = []
+            saved_ids_map = {"regions": [], "venues": [], "cups": [], "schedules": []}
+            overall_success = True
+            # 地域・会場は毎月同じものが返るため、最初に出てきた月の分だけ保存する
+            seen_region_ids = set()
+            seen_venue_ids = set()
             # all_schedules_to_save = [] # schedule は Step1Saver.save_monthly_cups で処理される想定
 
             # 既存ID管理はSaver側で行うためUpdater側では不要
 
-            current_month_start = date(
-                target_first_date.year, target_first_date.month, 1
+            # 対象月を先に列挙し、APIからの取得はまとめて並列に行う
+            months_to_fetch = iter_months(target_first_date, target_last_date)
+
+            self.logger.info(
+                f"{len(months_to_fetch)} か月分の開催情報をAPIから並列に取得します"
             )
 
-            while current_month_start <= target_last_date:
-                year_to_fetch = current_month_start.year
-                month_to_fetch = current_month_start.month
+            target_first_int = _ymd_int(target_first_date.isoformat())
+            target_last_int = _ymd_int(target_last_date.isoformat())
+            # 月ごとのループで何度も使うメソッドはローカルに束縛しておく
+            # (_flush_to_db はリストをその場で空にするので束縛先は変わらない)
+            append_region = all_regions_to_save.append
+            append_venue = all_venues_to_save.append
+            append_cup = all_cups_to_save.append
+
+            for (
+                year_to_fetch,
+                month_to_fetch,
+                monthly_api_response,
+            ) in self._iter_monthly_responses(months_to_fetch):
                 self.logger.info(
-                    f"{year_to_fetch}年{month_to_fetch}月のデータをAPIから取得・処理します"
+                    "%d年%d月のデータを処理します", year_to_fetch, month_to_fetch
                 )
 
-                api_date_str = f"{year_to_fetch}{month_to_fetch:02d}01"
-                monthly_api_response = self.api.get_monthly_cups(
-                    api_date_str
-                )  # APIから月間データを取得
-
                 if not monthly_api_response or "month" not in monthly_api_response:
                     self.logger.warning(
                         f"{year_to_fetch}年{month_to_fetch}月のAPIデータ取得に失敗、またはmonthキーが存在しません。スキップします。"
                     )
-                    # 次の月へ
-                    if current_month_start.month == 12:
-                        current_month_start = date(current_month_start.year + 1, 1, 1)
-                    else:
-                        current_month_start = date(
-                            current_month_start.year, current_month_start.month + 1, 1
-                        )
-                    time.sleep(0.1)  # 念のため
                     continue
 
                 month_content = monthly_api_response["month"]
@@ -163,9 +351,13 @@ class Step1Updater:
                 if "regions" in month_content and month_content["regions"]:
                     for region_api in month_content["regions"]:
                         if region_api.get("id"):  # IDがないものはスキップ
-                            all_regions_to_save.append(
+                            region_id = str(region_api["id"])
+                            if region_id in seen_region_ids:
+                                continue
+                            seen_region_ids.add(region_id)
+                            append_region(
                                 {
-                                    "region_id": str(region_api["id"]),
+                                    "region_id": region_id,
                                     "region_name": region_api.get("name"),
                                 }
                             )
@@ -174,37 +366,22 @@ class Step1Updater:
                 if "venues" in month_content and month_content["venues"]:
                     for venue_api in month_content["venues"]:
                         if venue_api.get("id"):  # IDがないものはスキップ
-                            venue_data = {
-                                "venue_id": str(venue_api["id"]),
-                                "venue_name": venue_api.get("name"),
-                                "name1": venue_api.get("name1"),
-                                "address": venue_api.get("address"),
-                                "phoneNumber": venue_api.get("phoneNumber"),
-                                "websiteUrl": venue_api.get("websiteUrl"),
-                                "bankFeature": venue_api.get("bankFeature"),
-                                "trackStraightDistance": self._safe_float_convert(
-                                    venue_api.get("trackStraightDistance")
-                                ),
-                                "trackAngleCenter": venue_api.get("trackAngleCenter"),
-                                "trackAngleStraight": venue_api.get(
-                                    "trackAngleStraight"
-                                ),
-                                "homeWidth": self._safe_int_convert(
-                                    venue_api.get("homeWidth")
-                                ),
-                                "backWidth": self._safe_int_convert(
-                                    venue_api.get("backWidth")
-                                ),
-                                "centerWidth": self._safe_float_convert(
-                                    venue_api.get("centerWidth")
-                                ),
-                                # 'region_id' は venues APIレスポンスに通常含まれないため、
-                                # venues テーブル定義で region_id が NOT NULL の場合、別途取得・設定ロジックが必要
-                                # 今回は venues テーブルに region_id がないか、NULL許容と仮定
-                            }
-                            all_venues_to_save.append(
-                                {k: v for k, v in venue_data.items() if v is not None}
-                            )
+                            venue_id = str(venue_api["id"])
+                            if venue_id in seen_venue_ids:
+                                continue
+                            seen_venue_ids.add(venue_id)
+                            # 'region_id' は venues APIレスポンスに通常含まれないため、
+                            # venues テーブル定義で region_id が NOT NULL の場合、別途取得・設定ロジックが必要
+                            # 今回は venues テーブルに region_id がないか、NULL許容と仮定
+                            venue_record = {"venue_id": venue_id}
+                            get = venue_api.get
+                            for out_key, api_key, convert in _VENUE_FIELDS:
+                                value = get(api_key)
+                                if convert is not None:
+                                    value = convert(value)
+                                if value is not None:
+                                    venue_record[out_key] = value
+                            append_venue(venue_record)
 
                 # Cups データ整形 (Schedules はCupの中にネストされている想定でSaver側で処理)
                 if "cups" in month_content and month_content["cups"]:
@@ -226,125 +403,56 @@ class Step1Updater:
                             )
                             continue
 
-                        # APIの日付文字列をYYYY-MM-DD形式に正規化 (Saverは datetime.date を期待するかもしれない)
+                        # 期間フィルター: YYYYMMDD の整数で比較し、期間外は date を作らずに除外する
                         try:
-                            cup_start_dt = datetime.strptime(
-                                start_date_api.replace("-", ""), "%Y%m%d"
-                            ).date()
-                            cup_end_dt = datetime.strptime(
-                                end_date_api.replace("-", ""), "%Y%m%d"
-                            ).date()
+                            cup_start_int = _ymd_int(start_date_api)
+                            cup_end_int = _ymd_int(end_date_api)
+                            in_period = (
+                                cup_end_int >= target_first_int
+                                and cup_start_int <= target_last_int
+                            )
+                            if in_period:
+                                # 期間内のものだけ実在する日付かを検証する
+                                parse_ymd(start_date_api)
+                                parse_ymd(end_date_api)
                         except ValueError:
                             self.logger.warning(
                                 f"日付形式が不正なカップデータのためスキップ: {cup_api}"
                             )
                             continue
 
-                        # 期間フィルター: APIから取得したカップが指定期間内か確認
-                        if (
-                            cup_end_dt >= target_first_date
-                            and cup_start_dt <= target_last_date
-                        ):
-                            cup_data_to_save = {
-                                "cup_id": str(cup_id),
-                                "cup_name": cup_api.get("name"),
-                                "startDate": start_date_api,  # APIの元の形式
-                                "endDate": end_date_api,  # APIの元の形式
-                                "duration": self._safe_int_convert(
-                                    cup_api.get("duration"), None
-                                ),
-                                "grade": self._safe_int_convert(
-                                    cup_api.get("grade"), None
-                                ),
-                                "venueId": str(cup_api["venueId"]),  # APIのキー名を保持
-                                "labels": cup_api.get("labels", []),  # APIの配列形式
-                                "playersUnfixed": cup_api.get("playersUnfixed", False),
-                            }
-                            all_cups_to_save.append(
-                                {
-                                    k: v
-                                    for k, v in cup_data_to_save.items()
-                                    if v is not None
-                                }
+                        if in_period:
+                            append_cup(
+                                _cup_record(
+                                    cup_api, cup_id, start_date_api, end_date_api
+                                )
                             )
 
-                # 次の月へ
-                if current_month_start.month == 12:
-                    current_month_start = date(current_month_start.year + 1, 1, 1)
-                else:
-                    current_month_start = date(
-                        current_month_start.year, current_month_start.month + 1, 1
-                    )
-                time.sleep(0.2)  # API負荷軽減
-
-            # --- データベースへの保存処理 ---
-            saved_ids_map = {"regions": [], "venues": [], "cups": [], "schedules": []}
-            overall_success = True
-
-            if all_regions_to_save:
-                self.logger.info(f"{len(all_regions_to_save)} 件の地域情報を保存します")
-                try:
-                    self.saver.save_regions_batch(
-                        all_regions_to_save
-                    )  # 戻り値をアンパックしない
-                    # 成功した場合、処理対象となったIDを保存（例）
-                    saved_ids_map["regions"] = [
-                        r.get("region_id")
-                        for r in all_regions_to_save
-                        if r.get("region_id")
-                    ]
-                    self.logger.info("地域情報の保存処理が正常に完了しました。")
-                except Exception as e:
-                    self.logger.error(
-                        f"地域情報の保存中にエラーが発生: {e}", exc_info=True
-                    )
-                    overall_success = False
-
-            if all_venues_to_save:
-                self.logger.info(f"{len(all_venues_to_save)} 件の会場情報を保存します")
-                try:
-                    self.saver.save_venues_batch(
-                        all_venues_to_save
-                    )  # 戻り値をアンパックしない
-                    # 成功した場合、処理対象となったIDを保存（例）
-                    saved_ids_map["venues"] = [
-                        v.get("venue_id")
-                        for v in all_venues_to_save
-                        if v.get("venue_id")
-                    ]
-                    self.logger.info("会場情報の保存処理が正常に完了しました。")
-                except Exception as e:
-                    self.logger.error(
-                        f"会場情報の保存中にエラーが発生: {e}", exc_info=True
-                    )
-                    overall_success = False
-
-            if all_cups_to_save:
-                self.logger.info(f"{len(all_cups_to_save)} 件のカップ情報を保存します")
-                try:
-                    self.saver.save_cups_batch(
-                        all_cups_to_save
-                    )  # 戻り値をアンパックしない
-                    # 成功した場合、処理対象となったIDを保存（例）
-                    saved_ids_map["cups"] = [
-                        c.get("cup_id") for c in all_cups_to_save if c.get("cup_id")
-                    ]
-                    self.logger.info("カップ情報の保存処理が正常に完了しました。")
-                except Exception as e:
-                    self.logger.error(
-                        f"カップ情報の保存中にエラーが発生: {e}", exc_info=True
-                    )
-                    overall_success = False
-
-                # schedules_data の準備と保存 (APIレスポンスとDBスキーマに依存)
-                # monthly_api_response から schedules に必要な情報を抽出し、all_schedules_to_save に追加するロジックが必要
-                # 例: APIレスポンスの cup['days'] や cup['schedule_info'] などをパース
-                # all_schedules_to_save = self._extract_schedules_from_monthly_response(monthly_api_response, saved_cup_ids)
-                # if all_schedules_to_save:
-                #    self.logger.info(f'{len(all_schedules_to_save)} 件のスケジュール情報を保存します')
-                #    success, saved_schedule_ids = self.saver.save_schedules_batch(all_schedules_to_save)
-                #    if success: saved_ids_map['schedules'] = saved_schedule_ids
-                #    else: overall_success = False
+                # 長期間の取得でリストが膨らみ続けないよう、一定件数ごとに保存する
+                if len(all_cups_to_save) >= self.flush_batch_size:
+                    if not self._flush_to_db(
+                        all_regions_to_save,
+                        all_venues_to_save,
+                        all_cups_to_save,
+                        saved_ids_map,
+                    ):
+                        overall_success = False
+
+            # --- 残りをデータベースへ保存 ---
+            if not self._flush_to_db(
+                all_regions_to_save, all_venues_to_save, all_cups_to_save, saved_ids_map
+            ):
+                overall_success = False
+
+            # schedules_data の準備と保存 (APIレスポンスとDBスキーマに依存)
+            # monthly_api_response から schedules に必要な情報を抽出し、all_schedules_to_save に追加するロジックが必要
+            # 例: APIレスポンスの cup['days'] や cup['schedule_info'] などをパース
+            # all_schedules_to_save = self._extract_schedules_from_monthly_response(monthly_api_response, saved_cup_ids)
+            # if all_schedules_to_save:
+            #    self.logger.info(f'{len(all_schedules_to_save)} 件のスケジュール情報を保存します')
+            #    success, saved_schedule_ids = self.saver.save_schedules_batch(all_schedules_to_save)
+            #    if success: saved_ids_map['schedules'] = saved_schedule_ids
+            #    else: overall_success = False
 
             if overall_success:
                 self.logger.info(
@@ -364,26 +472,6 @@ class Step1Updater:
             )
             return False, {}
 
-    def _safe_int_convert(
-        self, value: Any, default: Optional[int] = 0
-    ) -> Optional[int]:
-        if value is None:
-            return default
-        try:
-            return int(value)
-        except (ValueError, TypeError):
-            return default
-
-    def _safe_float_convert(
-        self, value: Any, default: Optional[float] = 0.0
-    ) -> Optional[float]:
-        if value is None:
-            return default
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            return default
-
 
 # # 使用例 (コメントアウト)
 # if __name__ == '__main__':
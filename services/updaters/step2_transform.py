@@ -0,0 +1,269 @@
+"""
+ステップ2: 開催詳細APIレスポンスを保存用の schedules / races レコードに整形する
+
+標準ライブラリだけで書いた型注釈付きの純粋な関数群で、Step2Updater から呼び出す。
+I/O を含まないため、mypyc 等で拡張モジュールにコンパイルしてもそのまま使える。
+"""
+
+import logging
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+# races レコードの (保存用キー, APIのキー, 代替キー, 変換の種類)。
+# APIのキーの値が偽なら代替キーの値を使う (従来の `a or b` と同じ)。
+# 変換の種類は transform_api_responses 内で変換関数に置き換える
+_RACE_FIELDS = (
+    ("number", "number", "raceNumber", "int"),
+    ("class", "class_name", "class", None),
+    ("race_type", "race_type_name", "raceType", None),
+    ("start_at", "startAt", "start_time_str", "timestamp"),
+    ("close_at", "closeAt", None, "timestamp"),
+    ("status", "race_status_code", "status", "int"),
+    ("cancel", "cancel", "is_canceled", "bool"),
+    ("cancel_reason", "cancelReason", None, None),
+    ("weather", "weather", None, None),
+    ("wind_speed", "windSpeed", None, "str"),
+    ("race_type3", "raceType3", None, None),
+    ("distance", "distance", None, "int"),
+    ("lap", "lapCount", "lap", "int"),
+    ("entries_number", "entriesCount", "entriesNumber", "int"),
+    ("is_grade_race", "isGradeRace", None, "bool"),
+    ("has_digest_video", "hasDigestVideo", None, "bool"),
+    ("digest_video", "digestVideoUrl", "digestVideo", None),
+    ("digest_video_provider", "digestVideoProviderName", "digestVideoProvider", "str"),
+    ("decided_at", "decidedAt", None, "timestamp"),
+)
+
+_logger = logging.getLogger(__name__)
+
+
+def _str_or_none(value: Any) -> Optional[str]:
+    """None 以外を str にする"""
+    return str(value) if value is not None else None
+
+
+def safe_int(value: Any, default: Optional[int] = 0) -> Optional[int]:
+    """int に変換する。None や変換できない値は default"""
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def _int_fast(value: Any) -> Optional[int]:
+    """APIが数値で返すことが多い項目用。int ならそのまま返し、それ以外は safe_int に任せる"""
+    return value if type(value) is int else safe_int(value)
+
+
+@lru_cache(maxsize=8192)
+def _str_to_timestamp(date_str: str) -> Optional[int]:
+    """
+    日時文字列をUnixタイムスタンプ (秒) に変換する。変換できない場合は None。
+    ISO形式 ('T' 区切り) も 'YYYY-MM-DD HH:MM:SS' も 'YYYY-MM-DD' も、まず strptime より
+    速い fromisoformat で解釈し、受け付けられない表記だけ strptime で読み直す。
+    近いレースで同じ開始・締切時刻が繰り返し現れるため結果をキャッシュする。
+    """
+    try:
+        return int(datetime.fromisoformat(date_str.replace("Z", "+00:00")).timestamp())
+    except ValueError:
+        pass
+    except (OverflowError, OSError):
+        return None
+    for date_format in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
+        try:
+            return int(datetime.strptime(date_str, date_format).timestamp())
+        except ValueError:
+            continue
+        except (OverflowError, OSError):
+            return None
+    return None
+
+
+def to_timestamp(
+    date_input: Optional[Any], logger: Optional[logging.Logger] = None
+) -> Optional[int]:
+    """
+    日付/日時文字列 (YYYY-MM-DD HH:MM:SS や ISOフォーマット) またはUnixタイムスタンプ数値をUnixタイムスタンプ (秒) に変換する。
+    変換できない場合はNoneを返す。
+    '0000-00-00 00:00:00' のような無効な日付もNoneとして扱う。
+    """
+    if date_input is None:
+        return None
+
+    # もし入力が既に数値 (int or float) なら、それをタイムスタンプとして扱う
+    if isinstance(date_input, (int, float)):
+        try:
+            return int(date_input)
+        except (ValueError, TypeError):
+            (logger or _logger).debug(
+                f"タイムスタンプ変換失敗 (数値だがintに変換できない): {date_input}"
+            )
+            return None
+
+    # 文字列の場合の処理
+    if not isinstance(date_input, str) or date_input == "0000-00-00 00:00:00":
+        return None
+
+    timestamp = _str_to_timestamp(date_input)
+    if timestamp is None:
+        (logger or _logger).debug(
+            f"タイムスタンプ変換失敗 (サポート外フォーマットか無効な値): {date_input}"
+        )
+    return timestamp
+
+
+def cup_detail_error(payload: Any) -> Optional[str]:
+    """
+    get_cup_detail のレスポンスが transform_api_responses で整形できる形かを確認する。
+    'cup' が辞書で、'schedules' / 'races' が (あれば) 辞書のリストであること。
+    問題があればその内容を、無ければ None を返す
+    """
+    if not isinstance(payload, dict):
+        return f"レスポンスが辞書ではありません (型: {type(payload).__name__})"
+    if not isinstance(payload.get("cup"), dict):
+        return "'cup' キーが存在しないか辞書ではありません"
+    for key in ("schedules", "races"):
+        items = payload.get(key) or []
+        if not isinstance(items, list):
+            return f"'{key}' がリストではありません (型: {type(items).__name__})"
+        for item in items:
+            if not isinstance(item, dict):
+                return f"'{key}' に辞書でない要素があります (型: {type(item).__name__})"
+    return None
+
+
+def transform_api_responses(
+    api_responses: List[Dict[str, Any]],
+    logger: Optional[logging.Logger] = None,
+    ts_cache: Optional[Dict[Any, Optional[int]]] = None,
+) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, List[Dict[str, Any]]]]:
+    """
+    開催詳細APIレスポンスのリストを cup_id ごとの schedules / races レコードに整形する。
+
+    Args:
+        api_responses (List[Dict[str, Any]]): get_cup_detail のレスポンスのリスト
+        logger (logging.Logger, optional): 不正データの警告を出すロガー
+        ts_cache (Dict, optional): 日時の変換結果のキャッシュ。レスポンスを1件ずつ
+            整形する場合に同じ辞書を渡すと、呼び出しをまたいで変換結果を使い回す
+
+    Returns:
+        Tuple[Dict, Dict]: (cup_id -> スケジュールのリスト, cup_id -> レースのリスト)
+    """
+    log = logger or _logger
+    schedules_by_cup: Dict[str, List[Dict[str, Any]]] = {}
+    races_by_cup: Dict[str, List[Dict[str, Any]]] = {}
+    valid_schedule_ids_map: Dict[str, Set[str]] = {}
+
+    # 同じ日の startAt / closeAt などは多くのレースで同じ値になるため、
+    # このバッチ内では元の値ごとに1回だけ変換する
+    cache: Dict[Any, Optional[int]] = ts_cache if ts_cache is not None else {}
+
+    def timestamp(value: Any) -> Optional[int]:
+        if type(value) is int:
+            return value
+        try:
+            return cache[value]
+        except KeyError:
+            result = cache[value] = to_timestamp(value, log)
+            return result
+        except TypeError:  # ハッシュできない値はキャッシュしない
+            return to_timestamp(value, log)
+
+    converters: Dict[Optional[str], Optional[Callable[[Any], Any]]] = {
+        None: None,
+        "int": _int_fast,
+        "timestamp": timestamp,
+        "bool": bool,
+        "str": _str_or_none,
+    }
+    race_fields = [
+        (out_key, api_key, fallback_key, converters[kind])
+        for out_key, api_key, fallback_key, kind in _RACE_FIELDS
+    ]
+
+    for api_response in api_responses:
+        cup_info = api_response.get("cup", {})
+        current_cup_id = str(cup_info.get("id"))
+        if not current_cup_id:
+            log.warning(
+                f"APIレスポンスからcup_idが取得できませんでした。スキップ: {api_response.get('cup', {}).get('name', 'Unknown Cup')}"
+            )
+            continue
+
+        if current_cup_id not in schedules_by_cup:
+            schedules_by_cup[current_cup_id] = []
+            valid_schedule_ids_map[current_cup_id] = set()
+        if current_cup_id not in races_by_cup:
+            races_by_cup[current_cup_id] = []
+
+        append_schedule = schedules_by_cup[current_cup_id].append
+        append_race = races_by_cup[current_cup_id].append
+        valid_schedule_ids = valid_schedule_ids_map[current_cup_id]
+
+        for schedule_api_data in api_response.get("schedules") or []:
+            schedule_id = schedule_api_data.get("id")
+            if not schedule_id:
+                log.warning(
+                    f"Cup ID {current_cup_id} のスケジュールにIDがありません。スキップ: {schedule_api_data}"
+                )
+                continue
+
+            schedule_id_str = str(schedule_id)
+            get = schedule_api_data.get
+            append_schedule(
+                {
+                    "id": schedule_id_str,
+                    "cup_id": current_cup_id,
+                    "date": get("date"),
+                    "day": _int_fast(get("day")),
+                    "entriesUnfixed": 1 if get("entriesUnfixed") else 0,
+                    "index": safe_int(get("schedule_index") or get("index")),
+                }
+            )
+            valid_schedule_ids.add(schedule_id_str)
+
+        for race_api_data in api_response.get("races") or []:
+            race_id = race_api_data.get("id")
+            schedule_id_from_api = race_api_data.get(
+                "scheduleId"
+            ) or race_api_data.get("schedule_id")
+
+            if not race_id:
+                log.warning(
+                    f"Cup ID {current_cup_id} のレースにIDがありません。スキップ: {race_api_data}"
+                )
+                continue
+
+            final_schedule_id_for_race = None
+            if schedule_id_from_api:
+                schedule_id_str = str(schedule_id_from_api)
+                if schedule_id_str in valid_schedule_ids:
+                    final_schedule_id_for_race = schedule_id_str
+                else:
+                    log.warning(
+                        f"Cup ID {current_cup_id}, Race ID {race_id}: schedule_id '{schedule_id_str}' はこのCupの有効なスケジュールリストに存在しません。NULLとして扱います。"
+                    )
+            else:
+                log.warning(
+                    f"Cup ID {current_cup_id}, Race ID {race_id}: APIレスポンスに scheduleId がありません。NULLとして扱います。"
+                )
+
+            get = race_api_data.get
+            transformed_race_data = {
+                "race_id": str(race_id),
+                "schedule_id": final_schedule_id_for_race,
+                "cup_id": current_cup_id,
+            }
+            for out_key, api_key, fallback_key, convert in race_fields:
+                value = get(api_key)
+                if fallback_key is not None and not value:
+                    value = get(fallback_key)
+                transformed_race_data[out_key] = (
+                    convert(value) if convert is not None else value
+                )
+            append_race(transformed_race_data)
+
+    return schedules_by_cup, races_by_cup
@@ -5,12 +5,21 @@
 import logging
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import Executor, ThreadPoolExecutor
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from api.api_rate_limiter import AIMDConcurrencyLimiter, SlidingWindowRateLimiter
 
 # Step2Saver と APIクライアント(仮に BaseKeirinAPI) をインポート
 from services.savers.step2_saver import Step2Saver  # パスは環境に合わせてください
+from services.updaters.step2_transform import (
+    cup_detail_error,
+    safe_int,
+    to_timestamp,
+    transform_api_responses,
+)
+from utils.bounded_executor import BoundedExecutor, iter_completed
 
 # from services.clients.base_keirin_api import BaseKeirinApi # APIクライアントの具体的なクラス名に置き換えてください
 
@@ -27,6 +36,10 @@ class Step2Updater:
         logger: logging.Logger = None,
         max_workers: int = 3,
         rate_limit_wait: float = 1.0,
+        adaptive_concurrency: bool = False,
+        target_latency: float = 1.0,
+        executor: Optional[Executor] = None,
+        flush_batch_size: int = 5000,
     ):
         """
         初期化
@@ -36,7 +49,14 @@ class Step2Updater:
             saver (Step2Saver): Step2Saver のインスタンス
             logger (logging.Logger, optional): ロガーオブジェクト。 Defaults to None.
             max_workers (int): 並列処理の最大ワーカー数
-            rate_limit_wait (float): API呼び出し間の待機時間（秒）
+            rate_limit_wait (float): API呼び出し間の待機時間（秒）。並列時は
+                rate_limit_wait 秒あたり max_workers 回までに抑える。0 以下なら制限しない。
+            adaptive_concurrency (bool): True の場合、同時リクエスト数を max_workers を上限に
+                応答時間と失敗から自動調整する (AIMD)
+            target_latency (float): adaptive_concurrency で目標とする平均応答時間（秒）
+            executor (Executor, optional): 他の Updater と共有する executor。None の場合は update_cups ごとに作成する。
+            flush_batch_size (int): 整形済みのスケジュール・レースがこの行数に達したら、
+                残りの取得を待たずに保存する
         """
         self.api = api_client
         # self.db = db_instance # db_instance は不要なので削除
@@ -44,19 +64,70 @@ class Step2Updater:
         self.logger = logger or logging.getLogger(__name__)
         self.max_workers = max_workers
         self.rate_limit_wait = rate_limit_wait
+        self.executor = executor
+        self.flush_batch_size = flush_batch_size
+        # 取得完了後にスリープするのではなく、各ワーカーが送信前に枠を確保する
+        self.rate_limiter = (
+            SlidingWindowRateLimiter(
+                max_calls=max(1, max_workers),
+                period=rate_limit_wait,
+                logger=self.logger,
+            )
+            if rate_limit_wait > 0
+            else None
+        )
+        self.concurrency_limiter = (
+            AIMDConcurrencyLimiter(
+                max_limit=max(1, max_workers),
+                target_latency=target_latency,
+                logger=self.logger,
+            )
+            if adaptive_concurrency
+            else None
+        )
+
+    def _worker_pool(self):
+        """
+        開催詳細取得用の executor を返す。
+        共有 executor があれば同時実行数を max_workers に制限して使い、スレッドを毎回作らない。
+        """
+        if self.executor is not None:
+            return BoundedExecutor(self.executor, self.max_workers)
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="Step2Worker"
+        )
 
     def _fetch_cup_detail_worker(
         self, cup_id: str
     ) -> Tuple[str, Optional[Dict[str, Any]]]:
         """
-        単一の開催IDの詳細情報をAPIから取得するワーカー関数 (エラーハンドリング含む)
+        単一の開催IDの詳細情報をAPIから取得するワーカー関数 (エラーハンドリング含む)。
+        送信レートと同時リクエスト数の制限はここで行う。
         """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        if self.concurrency_limiter is None:
+            return self._request_cup_detail(cup_id)
+
+        self.concurrency_limiter.acquire()
+        started = time.monotonic()
+        result = (cup_id, None)
+        try:
+            result = self._request_cup_detail(cup_id)
+        finally:
+            # 取得できなかった場合は失敗として同時リクエスト数を下げる
+            self.concurrency_limiter.release(
+                time.monotonic() - started, failed=result[1] is None
+            )
+        return result
+
+    def _request_cup_detail(self, cup_id: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """開催詳細をAPIから1件取得し、形式を検証する。失敗時は (cup_id, None)"""
         thread_id = threading.current_thread().ident
         try:
             self.logger.debug(
                 f"スレッド {thread_id}: 開催ID {cup_id} の詳細情報を取得開始"
             )
-            # time.sleep(self.rate_limit_wait) # 呼び出し側でまとめて制御するため、ここでは不要かも
             cup_detail_data = self.api.get_cup_detail(cup_id)
 
             # ▼▼▼ APIレスポンスのより詳細なログ ▼▼▼
@@ -66,12 +137,14 @@ class Step2Updater:
                 )
                 return cup_id, None
 
-            # APIレスポンスが期待する構造かチェック (例: 'cup' キーの存在)
+            # APIレスポンスが期待する構造かチェック
             # WinticketAPIのget_cup_detailは、成功時 {'cup': {...}, 'schedules': [...], 'races': [...]} のような辞書を返す想定
-            if not isinstance(cup_detail_data, dict) or "cup" not in cup_detail_data:
-                # レスポンスが期待通りでない場合、型と内容をログに出力
+            # 整形は受け取った側のスレッドで行うため、整形できない形のものはワーカー内で弾いておく
+            payload_error = cup_detail_error(cup_detail_data)
+            if payload_error is not None:
+                # レスポンスが期待通りでない場合、理由と内容をログに出力
                 self.logger.warning(
-                    f"スレッド {thread_id}: 開催ID {cup_id} の詳細情報取得失敗。APIレスポンスの形式が不正か、'cup' キーが存在しません。レスポンス型: {type(cup_detail_data)}, レスポンス内容（一部）: {str(cup_detail_data)[:200]}"
+                    f"スレッド {thread_id}: 開催ID {cup_id} の詳細情報取得失敗。APIレスポンスの形式が不正です ({payload_error})。レスポンス内容（一部）: {str(cup_detail_data)[:200]}"
                 )  # レスポンスが巨大な場合を考慮して一部のみ出力
                 return cup_id, None
             # ▲▲▲ APIレスポンスのより詳細なログ ▲▲▲
@@ -87,11 +160,39 @@ class Step2Updater:
             )
             return cup_id, None
 
+    def _iter_cup_details(
+        self, cup_ids: List[str], with_parallel: bool
+    ) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        開催詳細を取得し、取得を終えた順に (cup_id, 詳細 or None) を1件ずつ返す。
+        並列時は呼び出し側が受け取ったレスポンスを処理している間も残りの取得を続ける。
+        """
+        thread_id = threading.current_thread().ident
+        if with_parallel and len(cup_ids) > 1 and self.max_workers > 0:
+            self.logger.info(
+                f"スレッド {thread_id}: 開催詳細情報の一括取得を並列処理で開始 (最大ワーカー数: {self.max_workers})"
+            )
+            with self._worker_pool() as executor:
+                # 未完了の取得はワーカー数の2倍までに抑え、1件返すごとに次を投入する
+                yield from iter_completed(
+                    executor,
+                    self._fetch_cup_detail_worker,
+                    cup_ids,
+                    self.max_workers * 2,
+                )
+        else:
+            self.logger.info(
+                f"スレッド {thread_id}: 開催詳細情報の一括取得を順次処理で開始"
+            )
+            for cup_id in cup_ids:
+                yield self._fetch_cup_detail_worker(cup_id)
+
     def update_cups(
         self, cup_ids: List[str], with_parallel: bool = True
     ) -> Tuple[bool, Dict[str, Any]]:
         """
-        指定された開催IDリストの詳細情報をAPIから一括取得し、Saverにバッチ保存を依頼する
+        指定された開催IDリストの詳細情報をAPIから取得し、取得できたものから順に整形して
+        flush_batch_size 行ごとに Saver へ一括保存を依頼する
 
         Args:
             cup_ids (List[str]): 開催IDのリスト
@@ -116,51 +217,82 @@ class Step2Updater:
             f"スレッド {thread_id}: Step2 Updater 起動 (対象 Cup ID 数: {len(cup_ids)}, 並列: {with_parallel})"
         )
 
-        all_api_responses: List[Dict[str, Any]] = []
         succeeded_cup_ids = []
         failed_cup_ids = []
+        # APIクライアントが条件付きリクエストに対応していれば、304 でキャッシュを使った件数を数える
+        cache_hits_before = getattr(self.api, "cup_detail_cache_hits", 0)
 
-        # --- 1. データ一括取得フェーズ ---
-        if with_parallel and len(cup_ids) > 1 and self.max_workers > 0:
-            self.logger.info(
-                f"スレッド {thread_id}: 開催詳細情報の一括取得を並列処理で開始 (最大ワーカー数: {self.max_workers})"
+        # 整形済みで未保存のスケジュール・レース (cup_id ごと)
+        pending_schedules: Dict[str, List[Dict[str, Any]]] = {}
+        pending_races: Dict[str, List[Dict[str, Any]]] = {}
+        pending_rows = 0
+        ts_cache: Dict[Any, Optional[int]] = {}
+
+        overall_save_success = True
+        total_schedules_to_save_count = 0
+        total_races_to_save_count = 0
+        total_saved_schedules_count = 0  # 保存成功した総数をカウント
+        total_saved_races_count = 0  # 保存成功した総数をカウント
+
+        def flush() -> None:
+            """未保存分を Saver の1回の一括保存 (1トランザクション) で保存する"""
+            nonlocal pending_rows, overall_save_success
+            nonlocal total_saved_schedules_count, total_saved_races_count
+            if not pending_rows:
+                return
+            pending_cup_ids = list(
+                dict.fromkeys(chain(pending_schedules, pending_races))
             )
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                future_to_cup = {
-                    executor.submit(self._fetch_cup_detail_worker, cup_id): cup_id
-                    for cup_id in cup_ids
-                }
-                processed_count = 0
-                for future in as_completed(future_to_cup):
-                    cup_id_result, detail_data = future.result()
-                    processed_count += 1
-                    if detail_data:
-                        all_api_responses.append(detail_data)
-                        succeeded_cup_ids.append(cup_id_result)
-                    else:
-                        failed_cup_ids.append(cup_id_result)
-                    self.logger.debug(
-                        f"スレッド {thread_id}: API取得進捗: {processed_count}/{len(cup_ids)} (Cup ID: {cup_id_result}, 結果: {'成功' if detail_data else '失敗'})"
-                    )
-                    if self.max_workers > 0:
-                        time.sleep(self.rate_limit_wait / self.max_workers)
-        else:
             self.logger.info(
-                f"スレッド {thread_id}: 開催詳細情報の一括取得を順次処理で開始"
+                f"スレッド {thread_id}: Saver ({type(self.saver).__name__}) を使用して {len(pending_cup_ids)} 開催分を一括保存します..."
             )
-            for i, cup_id in enumerate(cup_ids):
-                cup_id_result, detail_data = self._fetch_cup_detail_worker(cup_id)
-                if detail_data:
-                    all_api_responses.append(detail_data)
-                    succeeded_cup_ids.append(cup_id_result)
-                else:
-                    failed_cup_ids.append(cup_id_result)
-                self.logger.debug(
-                    f"スレッド {thread_id}: API取得進捗: {i+1}/{len(cup_ids)} (Cup ID: {cup_id_result}, 結果: {'成功' if detail_data else '失敗'})"
-                )
-                time.sleep(self.rate_limit_wait)
+            # 開催ごとのエラーの切り分けは Saver 側で行う
+            save_result = self._save_cups_bulk(
+                pending_cup_ids, pending_schedules, pending_races
+            )
+            if save_result is None:
+                overall_save_success = False
+            else:
+                saved_schedules, saved_races, save_failed_cup_ids = save_result
+                total_saved_schedules_count += saved_schedules
+                total_saved_races_count += saved_races
+                if save_failed_cup_ids:
+                    overall_save_success = False
+            pending_schedules.clear()
+            pending_races.clear()
+            pending_rows = 0
+
+        # --- 1. 取得・整形・保存 ---
+        # レスポンスは届いた順にすぐ整形して手放し、整形済みの行が flush_batch_size に
+        # 達したら保存する (その間もワーカーは残りの取得を続ける)
+        for processed_count, (cup_id_result, detail_data) in enumerate(
+            self._iter_cup_details(cup_ids, with_parallel), 1
+        ):
+            self.logger.debug(
+                f"スレッド {thread_id}: API取得進捗: {processed_count}/{len(cup_ids)} (Cup ID: {cup_id_result}, 結果: {'成功' if detail_data else '失敗'})"
+            )
+            if not detail_data:
+                failed_cup_ids.append(cup_id_result)
+                continue
+            succeeded_cup_ids.append(cup_id_result)
 
-        if not all_api_responses:
+            schedules_by_cup, races_by_cup = transform_api_responses(
+                [detail_data], self.logger, ts_cache
+            )
+            for cup_id, rows in schedules_by_cup.items():
+                pending_schedules.setdefault(cup_id, []).extend(rows)
+                pending_rows += len(rows)
+                total_schedules_to_save_count += len(rows)
+            for cup_id, rows in races_by_cup.items():
+                pending_races.setdefault(cup_id, []).extend(rows)
+                pending_rows += len(rows)
+                total_races_to_save_count += len(rows)
+
+            if pending_rows >= self.flush_batch_size:
+                flush()
+        flush()
+
+        if not succeeded_cup_ids:
             self.logger.warning(
                 f"スレッド {thread_id}: 有効な開催詳細データが1件も取得できませんでした。"
             )
@@ -173,160 +305,17 @@ class Step2Updater:
             }
 
         self.logger.info(
-            f"スレッド {thread_id}: 合計 {len(all_api_responses)} 件の開催詳細APIレスポンスを取得完了。整形・保存フェーズへ移行します。"
-        )
-
-        # --- 2. データ抽出・整形フェーズ (cup_id ごとにまとめる) ---
-        schedules_to_save_for_saver: Dict[str, List[Dict[str, Any]]] = {}
-        races_to_save_for_saver: Dict[str, List[Dict[str, Any]]] = {}
-        valid_schedule_ids_map: Dict[str, set[str]] = {}
-
-        for api_response in all_api_responses:
-            cup_info = api_response.get("cup", {})
-            current_cup_id = str(cup_info.get("id"))
-            if not current_cup_id:
-                self.logger.warning(
-                    f"APIレスポンスからcup_idが取得できませんでした。スキップ: {api_response.get('cup', {}).get('name', 'Unknown Cup')}"
-                )
-                continue
-
-            if current_cup_id not in schedules_to_save_for_saver:
-                schedules_to_save_for_saver[current_cup_id] = []
-                valid_schedule_ids_map[current_cup_id] = set()
-            if current_cup_id not in races_to_save_for_saver:
-                races_to_save_for_saver[current_cup_id] = []
-
-            api_schedules_raw = api_response.get("schedules", [])
-            for schedule_api_data in api_schedules_raw:
-                schedule_id = schedule_api_data.get("id")
-                if not schedule_id:
-                    self.logger.warning(
-                        f"Cup ID {current_cup_id} のスケジュールにIDがありません。スキップ: {schedule_api_data}"
-                    )
-                    continue
-
-                schedule_id_str = str(schedule_id)
-                transformed_schedule_data = {
-                    "id": schedule_id_str,
-                    "cup_id": current_cup_id,
-                    "date": schedule_api_data.get("date"),
-                    "day": self._safe_int_convert(schedule_api_data.get("day")),
-                    "entriesUnfixed": (
-                        1 if schedule_api_data.get("entriesUnfixed") else 0
-                    ),
-                    "index": self._safe_int_convert(
-                        schedule_api_data.get("schedule_index")
-                        or schedule_api_data.get("index")
-                    ),
-                }
-                schedules_to_save_for_saver[current_cup_id].append(
-                    transformed_schedule_data
-                )
-                valid_schedule_ids_map[current_cup_id].add(schedule_id_str)
-
-            api_races_raw = api_response.get("races", [])
-            for race_api_data in api_races_raw:
-                race_id = race_api_data.get("id")
-                schedule_id_from_api = race_api_data.get(
-                    "scheduleId"
-                ) or race_api_data.get("schedule_id")
-
-                if not race_id:
-                    self.logger.warning(
-                        f"Cup ID {current_cup_id} のレースにIDがありません。スキップ: {race_api_data}"
-                    )
-                    continue
-
-                final_schedule_id_for_race = None
-                if schedule_id_from_api:
-                    schedule_id_str = str(schedule_id_from_api)
-                    if schedule_id_str in valid_schedule_ids_map.get(
-                        current_cup_id, set()
-                    ):
-                        final_schedule_id_for_race = schedule_id_str
-                    else:
-                        self.logger.warning(
-                            f"Cup ID {current_cup_id}, Race ID {race_id}: schedule_id '{schedule_id_str}' はこのCupの有効なスケジュールリストに存在しません。NULLとして扱います。"
-                        )
-                else:
-                    self.logger.warning(
-                        f"Cup ID {current_cup_id}, Race ID {race_id}: APIレスポンスに scheduleId がありません。NULLとして扱います。"
-                    )
-
-                transformed_race_data = {
-                    "race_id": str(race_id),
-                    "schedule_id": final_schedule_id_for_race,
-                    "cup_id": current_cup_id,
-                    "number": self._safe_int_convert(
-                        race_api_data.get("number") or race_api_data.get("raceNumber")
-                    ),
-                    "class": race_api_data.get("class_name")
-                    or race_api_data.get("class"),
-                    "race_type": race_api_data.get("race_type_name")
-                    or race_api_data.get("raceType"),
-                    "start_at": self._to_timestamp(
-                        race_api_data.get("startAt")
-                        or race_api_data.get("start_time_str")
-                    ),
-                    "close_at": self._to_timestamp(race_api_data.get("closeAt")),
-                    "status": self._safe_int_convert(
-                        race_api_data.get("race_status_code")
-                        or race_api_data.get("status")
-                    ),
-                    "cancel": bool(
-                        race_api_data.get("cancel") or race_api_data.get("is_canceled")
-                    ),
-                    "cancel_reason": race_api_data.get("cancelReason"),
-                    "weather": race_api_data.get("weather"),
-                    "wind_speed": (
-                        str(race_api_data.get("windSpeed"))
-                        if race_api_data.get("windSpeed") is not None
-                        else None
-                    ),
-                    "race_type3": race_api_data.get("raceType3"),
-                    "distance": self._safe_int_convert(race_api_data.get("distance")),
-                    "lap": self._safe_int_convert(
-                        race_api_data.get("lapCount") or race_api_data.get("lap")
-                    ),
-                    "entries_number": self._safe_int_convert(
-                        race_api_data.get("entriesCount")
-                        or race_api_data.get("entriesNumber")
-                    ),
-                    "is_grade_race": bool(race_api_data.get("isGradeRace")),
-                    "has_digest_video": bool(race_api_data.get("hasDigestVideo")),
-                    "digest_video": race_api_data.get("digestVideoUrl")
-                    or race_api_data.get("digestVideo"),
-                    "digest_video_provider": (
-                        str(
-                            race_api_data.get("digestVideoProviderName")
-                            or race_api_data.get("digestVideoProvider")
-                        )
-                        if (
-                            race_api_data.get("digestVideoProviderName")
-                            or race_api_data.get("digestVideoProvider")
-                        )
-                        is not None
-                        else None
-                    ),
-                    "decided_at": self._to_timestamp(race_api_data.get("decidedAt")),
-                }
-                races_to_save_for_saver[current_cup_id].append(transformed_race_data)
-
-        total_schedules_to_save_count = sum(
-            len(s_list) for s_list in schedules_to_save_for_saver.values()
-        )
-        total_races_to_save_count = sum(
-            len(r_list) for r_list in races_to_save_for_saver.values()
+            f"スレッド {thread_id}: 合計 {len(succeeded_cup_ids)} 件の開催詳細APIレスポンスを取得・整形しました。"
         )
+        cache_hits = getattr(self.api, "cup_detail_cache_hits", 0) - cache_hits_before
+        if cache_hits:
+            self.logger.info(
+                f"スレッド {thread_id}: うち {cache_hits} 件は未更新 (304) のためキャッシュを使用しました。"
+            )
         self.logger.info(
-            f"スレッド {thread_id}: 整形完了 - スケジュール総数: {total_schedules_to_save_count}件, レース総数: {total_races_to_save_count}件 (Cup ID数: {len(schedules_to_save_for_saver)})"
+            f"スレッド {thread_id}: 整形完了 - スケジュール総数: {total_schedules_to_save_count}件, レース総数: {total_races_to_save_count}件 (Cup ID数: {len(succeeded_cup_ids)})"
         )
 
-        # --- 3. 一括保存フェーズ (cup_id ごとにループして保存) ---
-        overall_save_success = True
-        total_saved_schedules_count = 0  # 保存成功した総数をカウント
-        total_saved_races_count = 0  # 保存成功した総数をカウント
-
         if not total_schedules_to_save_count and not total_races_to_save_count:
             self.logger.warning(
                 f"スレッド {thread_id}: 保存対象のスケジュール・レースデータがありません。"
@@ -340,92 +329,6 @@ class Step2Updater:
                 "saved_races": 0,
             }
 
-        self.logger.info(
-            f"スレッド {thread_id}: Saver ({type(self.saver).__name__}) を使用してバッチ保存を開始します (cup_id ごと)..."
-        )
-
-        for cup_id_to_process in succeeded_cup_ids:  # API取得成功したcup_idのみ処理
-            current_schedules_for_saver = schedules_to_save_for_saver.get(
-                cup_id_to_process, []
-            )
-            current_races_for_saver = races_to_save_for_saver.get(cup_id_to_process, [])
-
-            cup_data_save_successful_this_iteration = True  # このcup_idの保存成否フラグ
-
-            if current_schedules_for_saver:
-                try:
-                    self.logger.debug(
-                        f"スレッド {thread_id}: Cup ID {cup_id_to_process} のスケジュール {len(current_schedules_for_saver)}件を保存開始..."
-                    )
-                    self.saver.save_schedules_batch(
-                        current_schedules_for_saver, cup_id_to_process
-                    )
-                    total_saved_schedules_count += len(
-                        current_schedules_for_saver
-                    )  # エラーなければ全件成功とみなす
-                    self.logger.info(
-                        f"スレッド {thread_id}: Cup ID {cup_id_to_process} のスケジュール {len(current_schedules_for_saver)}件の保存呼び出し完了。"
-                    )
-                except Exception as e_sch:
-                    self.logger.error(
-                        f"スレッド {thread_id}: Cup ID {cup_id_to_process} のスケジュール保存中にエラー: {e_sch}",
-                        exc_info=True,
-                    )
-                    overall_save_success = False
-                    cup_data_save_successful_this_iteration = (
-                        False  # このcupのスケジュール保存は失敗
-                    )
-
-            # スケジュール保存が成功した場合のみ、またはレースデータが存在する場合にレース保存を試みる
-            if cup_data_save_successful_this_iteration and current_races_for_saver:
-                try:
-                    self.logger.debug(
-                        f"スレッド {thread_id}: Cup ID {cup_id_to_process} のレース {len(current_races_for_saver)}件を保存開始..."
-                    )
-                    race_save_result = self.saver.save_races_batch(
-                        current_races_for_saver, cup_id_to_process
-                    )
-
-                    if race_save_result and isinstance(race_save_result, dict):
-                        saved_count_for_this_batch = race_save_result.get("count", 0)
-                        total_saved_races_count += saved_count_for_this_batch
-                        if race_save_result.get("error_details"):
-                            self.logger.error(
-                                f"スレッド {thread_id}: Cup ID {cup_id_to_process} のレース保存中にSaverからエラー返却: {race_save_result['error_details']}"
-                            )
-                            overall_save_success = False
-                            # cup_data_save_successful_this_iteration は既にFalseの可能性もあるが、レースで失敗したら明確にFalse
-                            # ただし、一部成功・一部失敗のケースはSaver側の返り値 count で判断
-                            if saved_count_for_this_batch < len(
-                                current_races_for_saver
-                            ):
-                                self.logger.warning(
-                                    f"Cup ID {cup_id_to_process}: レース保存で一部失敗の可能性 (要求: {len(current_races_for_saver)}, 成功: {saved_count_for_this_batch})"
-                                )
-                        else:
-                            self.logger.info(
-                                f"スレッド {thread_id}: Cup ID {cup_id_to_process} のレース {saved_count_for_this_batch}件の保存呼び出し完了。"
-                            )
-                    else:
-                        self.logger.error(
-                            f"スレッド {thread_id}: Cup ID {cup_id_to_process} のレース保存の返り値が不正です: {race_save_result}"
-                        )
-                        overall_save_success = False
-                        # この場合も cup_data_save_successful_this_iteration を False にすべきだが、
-                        # ループの最後にまとめて警告を出すため、ここでは overall_save_success のみ更新
-
-                except Exception as e_race_outer:
-                    self.logger.error(
-                        f"スレッド {thread_id}: Cup ID {cup_id_to_process} のレース保存呼び出し中に予期せぬエラー: {e_race_outer}",
-                        exc_info=True,
-                    )
-                    overall_save_success = False
-
-            # このcup_idの処理でエラーがあったかどうかを最終的に判断 (スケジュールorレース)
-            # (現状の cup_data_save_successful_this_iteration はスケジュール保存失敗しか見ていないため、レース保存失敗も考慮が必要)
-            # よりシンプルには、overall_save_success がこのループ内で一度でもFalseになったら、そのcup_idが問題あった可能性があると考える
-            # ここでは詳細なエラー追跡より、全体の成否で判断
-
         if not overall_save_success:
             self.logger.error(
                 f"スレッド {thread_id}: 1つ以上のデータ保存処理でエラーが発生しました。詳細は各Cup IDのログを確認してください。"
@@ -445,16 +348,63 @@ class Step2Updater:
             "save_process_errors": not overall_save_success,
         }
 
+    def _save_cups_bulk(
+        self,
+        cup_ids: List[str],
+        schedules_by_cup: Dict[str, List[Dict[str, Any]]],
+        races_by_cup: Dict[str, List[Dict[str, Any]]],
+    ) -> Optional[Tuple[int, int, List[str]]]:
+        """
+        指定開催分のスケジュール・レースを Saver の save_cups_bulk でまとめて保存し、
+        Saver が行の添字で返したエラーを cup_id に戻して報告する。
+
+        Returns:
+            Optional[Tuple[int, int, List[str]]]: (保存スケジュール数, 保存レース数,
+                保存できなかった行がある cup_id のリスト)。
+                トランザクション自体が失敗した場合は None
+        """
+        all_schedules = list(
+            chain.from_iterable(schedules_by_cup.get(cup_id, []) for cup_id in cup_ids)
+        )
+        all_races = list(
+            chain.from_iterable(races_by_cup.get(cup_id, []) for cup_id in cup_ids)
+        )
+        try:
+            result = self.saver.save_cups_bulk(all_schedules, all_races)
+        except Exception as e:
+            self.logger.error(
+                f"スケジュール・レースの一括保存に失敗しました: {e}", exc_info=True
+            )
+            return None
+
+        def cup_ids_of(rows: List[Dict[str, Any]], row_errors: list) -> List[str]:
+            return list(
+                dict.fromkeys(str(rows[idx].get("cup_id")) for idx, _ in row_errors)
+            )
+
+        skipped_schedule_cup_ids = cup_ids_of(all_schedules, result["schedule_skipped"])
+        if skipped_schedule_cup_ids:
+            self.logger.warning(
+                f"整形できないスケジュールがあった Cup ID: {skipped_schedule_cup_ids}"
+            )
+        skipped_cup_ids = cup_ids_of(all_races, result["skipped"])
+        if skipped_cup_ids:
+            self.logger.warning(f"整形できないレースがあった Cup ID: {skipped_cup_ids}")
+        failed_cup_ids = list(
+            dict.fromkeys(
+                cup_ids_of(all_schedules, result["schedule_errors"])
+                + cup_ids_of(all_races, result["errors"])
+            )
+        )
+        if failed_cup_ids:
+            self.logger.error(f"保存できなかった行がある Cup ID: {failed_cup_ids}")
+        return result["saved_schedules"], result["count"], failed_cup_ids
+
     # --- ここからヘルパーメソッドを追加 ---
     def _safe_int_convert(
         self, value: Any, default: Optional[int] = 0
     ) -> Optional[int]:
-        if value is None:
-            return default
-        try:
-            return int(value)
-        except (ValueError, TypeError):
-            return default
+        return safe_int(value, default)
 
     def _safe_float_convert(
         self, value: Any, default: Optional[float] = 0.0
@@ -467,55 +417,8 @@ class Step2Updater:
             return default
 
     def _to_timestamp(self, date_input: Optional[Any]) -> Optional[int]:
-        """
-        日付/日時文字列 (YYYY-MM-DD HH:MM:SS や ISOフォーマット) またはUnixタイムスタンプ数値をUnixタイムスタンプ (秒) に変換する。
-        変換できない場合はNoneを返す。
-        '0000-00-00 00:00:00' のような無効な日付もNoneとして扱う。
-        """
-        if date_input is None:
-            return None
-
-        # もし入力が既に数値 (int or float) なら、それをタイムスタンプとして扱う
-        if isinstance(date_input, (int, float)):
-            try:
-                return int(date_input)
-            except (ValueError, TypeError):
-                self.logger.debug(
-                    f"タイムスタンプ変換失敗 (数値だがintに変換できない): {date_input}"
-                )
-                return None
-
-        # 文字列の場合の処理
-        if not isinstance(date_input, str) or date_input == "0000-00-00 00:00:00":
-            # self.logger.debug(f"タイムスタンプ変換入力が文字列でないか、無効な日付文字列です: {date_input}") # 必要ならログ出す
-            return None
-
-        date_str = str(date_input)  # ここで文字列であることを確定させる
-
-        try:
-            # 一般的なISO 8601形式 (例: '2023-10-26T10:00:00Z', '2023-10-26T19:00:00+09:00')
-            if "T" in date_str:
-                dt_obj = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                return int(dt_obj.timestamp())
-
-            # YYYY-MM-DD HH:MM:SS 形式
-            dt_obj = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-            return int(dt_obj.timestamp())
-        except ValueError:
-            try:
-                # YYYY-MM-DD 形式 (時刻なし)
-                dt_obj = datetime.strptime(date_str, "%Y-%m-%d")
-                return int(dt_obj.timestamp())
-            except ValueError:
-                self.logger.debug(
-                    f"タイムスタンプ変換失敗 (サポート外フォーマットか無効な値): {date_str}"
-                )
-                return None
-        except Exception as e:  # その他の予期せぬエラー
-            self.logger.error(
-                f"タイムスタンプ変換中に予期せぬエラー: {date_str} - {e}", exc_info=True
-            )
-            return None
+        """日時文字列または数値をUnixタイムスタンプ (秒) に変換する。変換できない場合は None"""
+        return to_timestamp(date_input, self.logger)
 
 
 # 旧メソッド update_cups_from_db は完全に削除
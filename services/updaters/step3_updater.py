@@ -5,11 +5,12 @@
 import logging
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Executor, ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 # Step3Saver と APIクライアント(仮に BaseKeirinAPI) をインポート
 from services.savers.step3_saver import Step3Saver  # パスは環境に合わせてください
+from utils.bounded_executor import BoundedExecutor
 
 # from datetime import datetime # Step3Saverに移動したか、不要になったか
 
@@ -36,6 +37,8 @@ class Step3Updater:
         logger: logging.Logger = None,
         max_workers: int = 3,
         rate_limit_wait: float = 1.0,
+        executor: Optional[Executor] = None,
+        cancel_event: Optional[threading.Event] = None,
     ):
         """
         初期化
@@ -45,6 +48,8 @@ class Step3Updater:
             logger (logging.Logger, optional): ロガーオブジェクト。 Defaults to None.
             max_workers (int): 並列処理の最大ワーカー数
             rate_limit_wait (float): API呼び出し間の待機時間（秒）
+            executor (Executor, optional): 他の Updater と共有する executor。None の場合はバッチごとに作成する。
+            cancel_event (threading.Event, optional): セットされたら次のバッチに進まずに終了する
         """
         self.api = api_client
         # self.db = db_instance # db_instance は不要なので削除
@@ -52,6 +57,17 @@ class Step3Updater:
         self.logger = logger or logging.getLogger(__name__)
         self.max_workers = max_workers
         self.rate_limit_wait = rate_limit_wait
+        self.executor = executor
+        self.cancel_event = cancel_event
+
+    def _worker_pool(self):
+        """
+        API取得用の executor を返す。
+        共有 executor が渡されていれば同時実行数を max_workers に制限して使い、なければバッチごとに作成する。
+        """
+        if self.executor is not None:
+            return BoundedExecutor(self.executor, self.max_workers)
+        return ThreadPoolExecutor(max_workers=self.max_workers)
 
     def _fetch_race_detail_worker(
         self, race_identifier: Dict[str, Any]
@@ -225,6 +241,11 @@ class Step3Updater:
         )
 
         for i in range(0, total_races_to_fetch, RACE_BATCH_SIZE):
+            if self.cancel_event and self.cancel_event.is_set():
+                self.logger.info(
+                    "[Step3 Updater] キャンセルされたため残りのバッチを中止します"
+                )
+                break
             current_batch_race_identifiers = active_races_to_fetch_api[
                 i : i + RACE_BATCH_SIZE
             ]
@@ -273,7 +294,7 @@ class Step3Updater:
                 self.logger.info(
                     f"バッチ {batch_num}: レース詳細情報の一括取得を並列処理で開始"
                 )
-                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                with self._worker_pool() as executor:
                     for race_info in current_batch_race_identifiers:
                         # 'processing' 更新失敗でスキップされたレースは除外
                         if race_info.get("race_id") not in race_ids_api_failed:
@@ -793,6 +814,16 @@ class Step3Updater:
             else True
         )
 
+        # 呼び出し側で開催ごとにエラーを集計できるよう、失敗レースを cup_id 別に数える
+        cup_id_by_race = {
+            r["race_id"]: r.get("cup_id") for r in races_to_process if "race_id" in r
+        }
+        failures_by_cup: Dict[str, int] = {}
+        for race_id in failed_overall:
+            cup_id = cup_id_by_race.get(race_id)
+            if cup_id:
+                failures_by_cup[cup_id] = failures_by_cup.get(cup_id, 0) + 1
+
         result_message = "Step3 Update process completed."
 
         result_details = {
@@ -818,6 +849,7 @@ class Step3Updater:
             "saved_entries_total": total_saved_entries_all_batches,
             "saved_player_records_total": total_saved_player_results_all_batches,
             "saved_line_predictions_total": total_saved_race_lines_all_batches,
+            "failures_by_cup": failures_by_cup,
         }
         self.logger.info(
             f"{result_message} Summary: Input={total_races_input}, Skipped={len(race_ids_skipped_finished)}, AttemptedAPI={total_races_to_fetch}, FinalCompleted={succeeded_overall_count}, FinalFailed={failed_overall_count}"
@@ -5,13 +5,14 @@
 import logging
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 from api.winticket_api import WinticketAPI  # WinticketAPI をインポート
 
 # from api.yenjoy_api import YenjoyAPI # F401: imported but unused
 from services.savers.step4_saver import Step4Saver
+from utils.bounded_executor import BoundedExecutor
 
 # from database.db_accessor import KeirinDataAccessor # KeirinDataAccessor は未使用のため削除
 
@@ -35,6 +36,8 @@ class Step4Updater:
         logger: Optional[logging.Logger] = None,
         max_workers: int = 3,
         rate_limit_wait: float = 1.0,
+        executor: Optional[Executor] = None,
+        cancel_event: Optional[threading.Event] = None,
     ):
         """
         初期化
@@ -44,12 +47,16 @@ class Step4Updater:
             logger: ロガーインスタンス
             max_workers: API呼び出しの並列処理時の最大ワーカー数
             rate_limit_wait: 順次処理時のAPI呼び出し間隔 (秒)
+            executor: 他の Updater と共有する executor。None の場合はバッチごとに作成する
+            cancel_event: キャンセル通知用のイベント。セットされたら残りのバッチを処理しない
         """
         self.api_client = api_client
         self.saver = step4_saver  # Step4Saverのインスタンスを保持
         self.logger = logger or logging.getLogger(__name__)
         self.max_workers = max_workers
         self.rate_limit_wait = rate_limit_wait
+        self.executor = executor
+        self.cancel_event = cancel_event
 
         # オッズデータ変換用の設定（Saverから移動）
         self.odds_table_configs = {
@@ -298,6 +305,12 @@ class Step4Updater:
             )
             return race_id, None, False  # API呼び出し失敗
 
+    def _worker_pool(self):
+        """オッズ取得ワーカー用の executor。共有分は同時実行数を max_workers までに抑える"""
+        if self.executor is not None:
+            return BoundedExecutor(self.executor, self.max_workers)
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+
     def update_odds_bulk(
         self,
         races_to_update: List[Dict[str, Any]],
@@ -427,6 +440,11 @@ class Step4Updater:
         )
 
         for i in range(0, total_races_to_fetch_api, RACE_BATCH_SIZE):
+            if self.cancel_event and self.cancel_event.is_set():
+                self.logger.info(
+                    "[Step4 Updater] キャンセルされたため残りのバッチを中止します"
+                )
+                break
             current_batch_races = active_races_to_process[i : i + RACE_BATCH_SIZE]
             batch_num = i // RACE_BATCH_SIZE + 1
             total_batches = (
@@ -471,7 +489,7 @@ class Step4Updater:
                     and len(current_batch_races) > 1
                     and self.max_workers > 1
                 ):
-                    with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    with self._worker_pool() as executor:
                         for race_info in current_batch_races:
                             # 'processing' 更新失敗でスキップされたレースは除外
                             if race_info.get("race_id") not in race_ids_api_failed:
@@ -727,6 +745,16 @@ class Step4Updater:
 
         self.logger.info("[Step4 Updater] 最終ステータス更新完了。")
 
+        # 呼び出し側で開催ごとにエラーを集計できるよう、失敗レースを cup_id 別に数える
+        cup_id_by_race = {
+            r["race_id"]: r.get("cup_id") for r in races_to_update if "race_id" in r
+        }
+        failures_by_cup: Dict[str, int] = {}
+        for race_id in ids_to_mark_failed:
+            cup_id = cup_id_by_race.get(race_id)
+            if cup_id:
+                failures_by_cup[cup_id] = failures_by_cup.get(cup_id, 0) + 1
+
         # --- 結果サマリ ---
         overall_success = (
             len(successful_save_ids) > 0 or len(race_ids_skipped_finished) > 0
@@ -750,6 +778,7 @@ class Step4Updater:
             ),  # 実際にcompletedになった数
             "final_no_data_count": len(ids_to_mark_no_data),
             "final_failed_count": len(ids_to_mark_failed),
+            "failures_by_cup": failures_by_cup,
         }
         self.logger.info(f"[Step4 Updater] 完了。結果: {result_summary}")
 
@@ -6,7 +6,7 @@ import logging
 import re
 import time
 import unicodedata
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
 import json
 import threading
 
@@ -23,6 +23,7 @@ from api.yenjoy_api import (  # YenJoyApiClient の正しいインポートパ
 )
 from database.db_accessor import KeirinDataAccessor
 from services.savers.step5_saver import Step5Saver
+from utils.bounded_executor import BoundedExecutor
 
 # import requests # requests は api_client が担当するので不要
 
@@ -50,6 +51,8 @@ class Step5Updater:
         logger: Optional[logging.Logger] = None,
         max_workers: int = 5,
         rate_limit_wait_html: float = 0.5,
+        executor: Optional[Executor] = None,
+        cancel_event: Optional[threading.Event] = None,
     ):
         self.api_client = api_client
         self.saver = step5_saver
@@ -57,6 +60,10 @@ class Step5Updater:
         self.logger = logger or logging.getLogger(__name__)
         self.max_workers = max_workers
         self.rate_limit_wait_html = rate_limit_wait_html
+        # 他の Updater と共有する executor (None の場合はバッチごとに作成する)
+        self.executor = executor
+        # セットされたらバッチの切れ目で処理を打ち切る
+        self.cancel_event = cancel_event
         # _processing_races_lock は update_results_bulk 内でローカルに使用するか、より粒度の細かいロックを検討
         # self._processing_races_lock = threading.RLock()
 
@@ -970,6 +977,14 @@ class Step5Updater:
             )
         return player_id_map
 
+    def _worker_pool(self):
+        """HTML取得・パースのワーカー用 executor (共有 executor がなければバッチごとに作る)"""
+        if self.executor is not None:
+            return BoundedExecutor(self.executor, self.max_workers)
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="Step5Worker"
+        )
+
     def update_results_bulk(
         self,
         start_date_str: str,
@@ -995,6 +1010,21 @@ class Step5Updater:
                 "details": {},
             }
 
+        return self.update_results_bulk_for_races(races_to_process_info)
+
+    def update_results_bulk_for_races(
+        self, races_to_process_info: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        呼び出し側で抽出済みのレース情報リストを対象に、HTML取得・パース・保存を行う。
+
+        Args:
+            races_to_process_info (List[Dict[str, Any]]): Step5DataExtractor などで抽出した
+                レース情報 (race_id と URL 構築に必要なキーを含む) のリスト
+
+        Returns:
+            Dict[str, Any]: update_results_bulk と同じ形式の結果辞書
+        """
         if not races_to_process_info:
             self.logger.info("Step5 更新対象レースなし。")
             return {
@@ -1010,6 +1040,9 @@ class Step5Updater:
         empty_html_parse_ids: Set[str] = set()  # データなしだったrace_idを格納
 
         for i in range(0, len(races_to_process_info), RACE_BATCH_SIZE_FOR_PROCESSING):
+            if self.cancel_event and self.cancel_event.is_set():
+                self.logger.info("Step5: キャンセルされたため残りのバッチを中止します")
+                break
             batch_race_infos = races_to_process_info[
                 i : i + RACE_BATCH_SIZE_FOR_PROCESSING
             ]
@@ -1023,9 +1056,7 @@ class Step5Updater:
                 )
 
             futures = {}
-            with ThreadPoolExecutor(
-                max_workers=self.max_workers, thread_name_prefix="Step5Worker"
-            ) as executor:
+            with self._worker_pool() as executor:
                 for race_info_item in batch_race_infos:
                     if not race_info_item.get("race_id"):
                         self.logger.warning(
@@ -1089,9 +1120,6 @@ class Step5Updater:
                 list(successful_html_parse_ids), "saving_html_data"
             )
 
-        data_for_saver_race_results = []
-        data_for_saver_inspection_reports = []
-        data_for_saver_race_comments = []
         # lap_data_by_section は race_id ごとに辞書として渡す必要があるかもしれない
         # Saver側の save_lap_positions_batch の実装に依存する
         # ここでは、各レースの lap_data_by_section をリストに格納し、race_idも添える形を想定
@@ -1107,14 +1135,6 @@ class Step5Updater:
                 )
                 continue
 
-            if parsed_data_item.get("race_results"):
-                data_for_saver_race_results.extend(parsed_data_item["race_results"])
-            if parsed_data_item.get("inspection_reports"):
-                data_for_saver_inspection_reports.extend(
-                    parsed_data_item["inspection_reports"]
-                )
-            if parsed_data_item.get("race_comments"):
-                data_for_saver_race_comments.extend(parsed_data_item["race_comments"])
             if parsed_data_item.get("lap_positions"):
                 all_lap_data_for_saver.append(
                     {
@@ -1127,53 +1147,51 @@ class Step5Updater:
 
         save_errors_occurred_ids: Set[str] = set()
         try:
-            # data_for_saver_race_results は使わずに、all_parsed_data_from_html をループする
-            # if data_for_saver_race_results: # 変更前
-            #     self.saver.save_race_results_batch(data_for_saver_race_results)
-
-            for parsed_item in all_parsed_data_from_html:  # 変更後
-                current_race_id = parsed_item.get("race_id")
-                if not current_race_id:
-                    continue
-
-                race_results_to_save = parsed_item.get("race_results")
-                if race_results_to_save:
-                    save_success = self.saver.save_race_results_batch(
-                        current_race_id, race_results_to_save
-                    )
-                    if not save_success:
-                        save_errors_occurred_ids.add(current_race_id)
+            # 全レース分の保存要求を先に batch_writer へ投入し、複数レースを
+            # まとめたトランザクションで書き込ませてから結果を回収する。ライターは
+            # この保存の間だけ動かし、抜けるときに残りを書き込んで終了させる
+            with self.saver.batch_writing() as batch_writer:
+                save_futures: List[Tuple[str, Any]] = []
+                for parsed_item in all_parsed_data_from_html:
+                    current_race_id = parsed_item.get("race_id")
+                    if not current_race_id:
+                        continue
 
-            # 他のデータ保存処理は変更なし (それぞれのSaverメソッドが race_id を含むデータを期待しているか確認が必要)
-            # 現状、inspection_reports, race_comments, lap_positions は race_id を含む辞書のリストを期待しているように見える
-            # もしそれらが race_id を別途引数で取るなら、ここも同様のループ処理が必要
-
-            # inspection_reports の保存処理
-            for parsed_item in all_parsed_data_from_html:
-                current_race_id = parsed_item.get("race_id")
-                inspection_reports_to_save = parsed_item.get("inspection_reports")
-                if current_race_id and inspection_reports_to_save:
-                    save_success = self.saver.save_inspection_reports_batch(
-                        current_race_id, inspection_reports_to_save
-                    )
-                    if not save_success:
-                        save_errors_occurred_ids.add(current_race_id)
+                    # 周回データは全レース分をまとめて別途保存するため、ここでは渡さない
+                    race_results_to_save = parsed_item.get("race_results")
+                    race_comments_to_save = parsed_item.get("race_comments")
+                    inspection_reports_to_save = parsed_item.get("inspection_reports")
+                    if (
+                        race_results_to_save
+                        or race_comments_to_save
+                        or inspection_reports_to_save
+                    ):
+                        save_futures.append(
+                            (
+                                current_race_id,
+                                batch_writer.submit_all_for_race(
+                                    current_race_id,
+                                    race_results=race_results_to_save,
+                                    race_comments=race_comments_to_save,
+                                    inspection_reports=inspection_reports_to_save,
+                                ),
+                            )
+                        )
 
-            # レースコメントの保存
-            if data_for_saver_race_comments:
-                save_success_comments = self.saver.save_race_comments_batch(
-                    current_race_id, data_for_saver_race_comments
+                lap_positions_future = (
+                    batch_writer.submit_lap_positions(all_lap_data_for_saver)
+                    if all_lap_data_for_saver
+                    else None
                 )
-                if not save_success_comments:
-                    self.logger.error(
-                        f"Race ID {current_race_id}: レースコメントの保存に失敗しました。"
-                    )
-                    save_errors_occurred_ids.add(current_race_id)
 
-            if (
-                all_lap_data_for_saver
-            ):  # lap_positionsは現状のままと仮定（Saver側の実装による）
-                self.saver.save_lap_positions_batch(all_lap_data_for_saver)
+                for current_race_id, save_future in save_futures:
+                    if not save_future.result():
+                        self.logger.error(
+                            f"Race ID {current_race_id}: HTML由来データの保存に失敗しました。"
+                        )
+                        save_errors_occurred_ids.add(current_race_id)
+                if lap_positions_future is not None:
+                    lap_positions_future.result()
 
             self.logger.info(
                 f"{len(successful_html_parse_ids)}件のレースのHTML由来データ保存試行完了。"
@@ -0,0 +1,77 @@
+"""
+utils.bounded_executor.iter_completed / iter_in_order のテスト
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.bounded_executor import BoundedExecutor, iter_completed, iter_in_order
+
+
+def test_iter_completed_keeps_submissions_within_window():
+    submitted = []
+
+    def fetch(item):
+        return item * 10
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        executor = BoundedExecutor(pool, 2)
+        submit = executor.submit
+
+        def recording_submit(fn, item):
+            submitted.append(item)
+            return submit(fn, item)
+
+        executor.submit = recording_submit
+
+        results = []
+        for result in iter_completed(executor, fetch, range(10), 4):
+            # 返していない結果 (未完了 + 完了済み) は常に window 件以下
+            assert len(submitted) - len(results) <= 4
+            results.append(result)
+
+    assert sorted(results) == [item * 10 for item in range(10)]
+    assert submitted == list(range(10))
+
+
+def test_iter_completed_stops_submitting_when_closed():
+    submitted = []
+
+    def recording_fetch(item):
+        return item
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+
+        class RecordingExecutor:
+            def submit(self, fn, item):
+                submitted.append(item)
+                return pool.submit(fn, item)
+
+        results = iter_completed(RecordingExecutor(), recording_fetch, range(100), 3)
+        next(results)
+        results.close()
+
+    assert len(submitted) <= 4
+
+
+def test_iter_in_order_returns_results_in_input_order():
+    submitted = []
+
+    def fetch(item):
+        # 先に投入した要素ほど遅く終わるようにする
+        time.sleep(0.001 * (5 - item % 5))
+        return item
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+
+        class RecordingExecutor:
+            def submit(self, fn, item):
+                submitted.append(item)
+                return pool.submit(fn, item)
+
+        results = []
+        for result in iter_in_order(RecordingExecutor(), fetch, range(12), 3):
+            assert len(submitted) - len(results) <= 3
+            results.append(result)
+
+    assert results == list(range(12))
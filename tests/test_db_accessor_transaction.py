@@ -0,0 +1,82 @@
+"""
+KeirinDataAccessor.transaction() のデッドロック時の挙動のテスト
+
+実際の MySQL には接続せず、_get_new_connection をモック接続に差し替えて確認する。
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+mysql_connector = pytest.importorskip("mysql.connector")
+
+from database.db_accessor import KeirinDataAccessor  # noqa: E402
+
+
+@pytest.fixture
+def accessor():
+    with patch.object(
+        KeirinDataAccessor,
+        "_load_mysql_config",
+        return_value={"host": "127.0.0.1", "database": "keirin_test"},
+    ):
+        return KeirinDataAccessor(config_path="unused.ini")
+
+
+def _connection_deadlocking_on(prefix, executed):
+    """prefix で始まる文でデッドロック (errno 1213) を起こすモック接続"""
+
+    def execute(query, params=None):
+        executed.append(query)
+        if query.startswith(prefix):
+            raise mysql_connector.Error(msg="Deadlock found", errno=1213)
+
+    conn = MagicMock()
+    conn.connection_id = 1
+    conn.cursor.return_value.execute.side_effect = execute
+    conn.cursor.return_value.executemany.side_effect = execute
+    conn.cursor.return_value.with_rows = False
+    return conn
+
+
+def test_deadlock_stops_later_statements_in_transaction(accessor):
+    executed = []
+    conn = _connection_deadlocking_on("INSERT INTO regions", executed)
+
+    with patch.object(accessor, "_get_new_connection", return_value=conn):
+        with pytest.raises(mysql_connector.Error) as tx_error:
+            with accessor.transaction():
+                with pytest.raises(mysql_connector.Error):
+                    accessor.execute_query("INSERT INTO regions VALUES (%s)", (1,))
+                # 呼び出し側がエラーを捕捉して処理を続けても、以降の SQL は送られない
+                with pytest.raises(mysql_connector.Error):
+                    accessor.execute_query("INSERT INTO venues VALUES (%s)", (2,))
+                with pytest.raises(mysql_connector.Error):
+                    accessor.execute_many("INSERT INTO cups VALUES (%s)", [(3,)])
+                with pytest.raises(mysql_connector.Error):
+                    accessor.execute_in_transaction(lambda c: None)
+
+    assert tx_error.value.errno == 1213
+    assert executed == ["INSERT INTO regions VALUES (%s)"]
+    conn.commit.assert_not_called()
+    conn.rollback.assert_called_once()
+
+
+def test_next_transaction_after_deadlock_runs_normally(accessor):
+    executed = []
+    broken_conn = _connection_deadlocking_on("INSERT INTO regions", executed)
+    with patch.object(accessor, "_get_new_connection", return_value=broken_conn):
+        with pytest.raises(mysql_connector.Error):
+            with accessor.transaction():
+                try:
+                    accessor.execute_query("INSERT INTO regions VALUES (%s)", (1,))
+                except mysql_connector.Error:
+                    pass
+
+    conn = _connection_deadlocking_on("never", executed)
+    with patch.object(accessor, "_get_new_connection", return_value=conn):
+        with accessor.transaction():
+            accessor.execute_query("INSERT INTO venues VALUES (%s)", (2,))
+
+    assert executed[-1] == "INSERT INTO venues VALUES (%s)"
+    conn.commit.assert_called_once()
@@ -0,0 +1,54 @@
+"""
+Step5Saver.batch_writing() と Step5BatchWriter の起動・終了のテスト
+"""
+
+import logging
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("mysql.connector")
+
+from services.savers.step5_saver import Step5Saver  # noqa: E402
+
+_RACE_RESULTS = [{"bracket_number": 1, "player_id": "p1", "rank": "1"}]
+
+
+def _saver():
+    accessor = MagicMock()
+    accessor.execute_in_transaction.side_effect = lambda func: func(MagicMock())
+    del accessor.multi_statements
+    return Step5Saver(accessor, logging.getLogger(__name__)), accessor
+
+
+def test_batch_writing_stops_writer_thread_after_block():
+    saver, accessor = _saver()
+
+    with saver.batch_writing() as batch_writer:
+        futures = [
+            batch_writer.submit_all_for_race(race_id, race_results=_RACE_RESULTS)
+            for race_id in ("r1", "r2", "r3")
+        ]
+
+    assert [future.result(timeout=1) for future in futures] == [True, True, True]
+    assert not batch_writer._thread.is_alive()
+    assert saver._batch_writer is None
+    assert accessor.execute_in_transaction.called
+
+
+def test_nested_batch_writing_shares_writer_until_outer_exits():
+    saver, _ = _saver()
+
+    with saver.batch_writing() as outer:
+        with saver.batch_writing() as inner:
+            assert inner is outer
+        assert outer._thread.is_alive()
+    assert not outer._thread.is_alive()
+
+
+def test_save_all_for_race_without_batch_writing_saves_directly():
+    saver, accessor = _saver()
+
+    assert saver.save_all_for_race("r1", race_results=_RACE_RESULTS)
+    accessor.execute_in_transaction.assert_called_once()
+    assert saver._batch_writer is None
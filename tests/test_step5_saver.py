@@ -0,0 +1,109 @@
+"""
+Step5Saver.save_parsed_html_data のテスト
+
+実際の MySQL には接続せず、accessor をモックに差し替えて確認する。
+"""
+
+import logging
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("mysql.connector")
+
+from services.savers.step5_saver import Step5Saver  # noqa: E402
+
+
+def _parsed_data():
+    return {
+        "race_results": [{"bracket_number": 1, "player_id": "p1", "rank": "1"}],
+        "race_comments": [{"comment_text": "hello"}],
+        "inspection_reports": [],
+        "lap_positions": None,
+    }
+
+
+def _accessor():
+    accessor = MagicMock()
+    accessor.execute_in_transaction.side_effect = lambda func: func(MagicMock())
+    del accessor.multi_statements
+    return accessor
+
+
+@pytest.mark.parametrize("parallel_sibling_saves", [False, True])
+def test_parsed_html_data_keys_are_consumed(parallel_sibling_saves):
+    saver = Step5Saver(
+        _accessor(),
+        logging.getLogger(__name__),
+        parallel_sibling_saves=parallel_sibling_saves,
+    )
+    parsed_data = _parsed_data()
+
+    assert saver.save_parsed_html_data("r1", parsed_data)
+    assert parsed_data == {}
+
+
+def test_sibling_failure_logs_failed_data_kind(caplog):
+    saver = Step5Saver(
+        _accessor(), logging.getLogger(__name__), parallel_sibling_saves=True
+    )
+    saver._save_race_comments_batch_with_cursor = MagicMock(
+        side_effect=RuntimeError("comments failed")
+    )
+
+    with caplog.at_level(logging.ERROR):
+        assert not saver.save_parsed_html_data("r1", _parsed_data())
+
+    assert "(race_comments)" in caplog.text
+
+
+class _OuterTransactionAccessor:
+    """
+    execute_in_transaction の代わりにモック接続で save 側の関数を実行し、
+    関数の実行中にコミット/ロールバックが呼ばれていないかを記録する
+    """
+
+    def __init__(self, fail_on=None):
+        self.conn = MagicMock()
+        self.calls_inside = []
+        if fail_on is not None:
+
+            def execute(sql, params=None, **kwargs):
+                if sql.startswith(fail_on):
+                    raise RuntimeError(f"{fail_on} failed")
+
+            self.conn.cursor.return_value.execute.side_effect = execute
+            self.conn.cursor.return_value.executemany.side_effect = execute
+
+    def execute_in_transaction(self, func):
+        try:
+            return func(self.conn)
+        finally:
+            self.calls_inside.extend(
+                name
+                for name, _, _ in self.conn.mock_calls
+                if name in ("commit", "rollback")
+            )
+
+
+@pytest.mark.parametrize("fail_on", [None, "INSERT INTO race_results"])
+def test_save_closures_leave_commit_and_rollback_to_outer_transaction(fail_on):
+    accessor = _OuterTransactionAccessor(fail_on)
+    saver = Step5Saver(accessor, logging.getLogger(__name__))
+    lap_hs = '[[1, "A", 10, 20, true]]'
+
+    saver.save_parsed_html_data("r1", _parsed_data())
+    saver.save_all_for_race(
+        "r2", race_results=[{"bracket_number": 1, "player_id": "p1"}]
+    )
+    saver.save_lap_positions_batch(
+        [{"race_id": "r3", "data": {"lap_data_by_section": {"lap_hs": lap_hs}}}]
+    )
+    saver.update_race_step5_status_batch(["r1", "r2"], "completed")
+    with saver.batch_writing() as batch_writer:
+        batch_writer.submit_all_for_race(
+            "r4", race_comments=[{"comment_text": "hello"}]
+        ).result(timeout=1)
+
+    assert accessor.conn.cursor.return_value.execute.called
+    assert accessor.calls_inside == []
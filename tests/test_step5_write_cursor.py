@@ -0,0 +1,150 @@
+"""
+Step5 の複数文一括送信 (_Step5WriteCursor / KeirinDataAccessor.multi_statements) のテスト
+
+実際の MySQL には接続せず、モック接続・mysql.connector.connect の差し替えで確認する。
+"""
+
+import logging
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+mysql_connector = pytest.importorskip("mysql.connector")
+
+from database.db_accessor import KeirinDataAccessor  # noqa: E402
+from services.savers.step5_saver import Step5Saver, _Step5WriteCursor  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def reset_multi_unsupported():
+    _Step5WriteCursor._multi_unsupported = False
+    yield
+    _Step5WriteCursor._multi_unsupported = False
+
+
+@pytest.fixture
+def accessor():
+    with patch.object(
+        KeirinDataAccessor,
+        "_load_mysql_config",
+        return_value={"host": "127.0.0.1", "database": "keirin_test"},
+    ):
+        return KeirinDataAccessor(config_path="unused.ini")
+
+
+def _write_pending(cursor):
+    cursor.execute("UPDATE races SET status = %s WHERE race_id = %s", (1, "r1"))
+    cursor.executemany(
+        "INSERT INTO race_comments (race_id, comment) VALUES (%s, %s)",
+        [("r1", "a"), ("r1", "b")],
+    )
+
+
+def test_flush_sends_pending_statements_in_one_multi_execute():
+    conn = MagicMock()
+    conn.cursor.return_value.execute.return_value = iter([])
+    cursor = _Step5WriteCursor(
+        conn, False, logging.getLogger(__name__), use_multi_statements=True
+    )
+
+    _write_pending(cursor)
+    cursor.flush()
+
+    conn.cursor.return_value.execute.assert_called_once_with(
+        "UPDATE races SET status = %s WHERE race_id = %s;\n"
+        "INSERT INTO race_comments (race_id, comment) VALUES (%s, %s),(%s, %s)",
+        (1, "r1", "r1", "a", "r1", "b"),
+        multi=True,
+    )
+
+
+def test_flush_falls_back_to_single_statements_without_multi_support():
+    sent = []
+
+    def execute(sql, params=None, **kwargs):
+        if kwargs:
+            raise TypeError("execute() got an unexpected keyword argument 'multi'")
+        sent.append((sql, params))
+
+    conn = MagicMock()
+    conn.cursor.return_value.execute.side_effect = execute
+    cursor = _Step5WriteCursor(
+        conn, False, logging.getLogger(__name__), use_multi_statements=True
+    )
+
+    _write_pending(cursor)
+    cursor.flush()
+
+    assert sent == [
+        ("UPDATE races SET status = %s WHERE race_id = %s", (1, "r1")),
+        (
+            "INSERT INTO race_comments (race_id, comment) VALUES (%s, %s),(%s, %s)",
+            ("r1", "a", "r1", "b"),
+        ),
+    ]
+    # 以降に作るカーソルは最初から1文ずつ送る
+    assert _Step5WriteCursor._multi_unsupported
+    next_cursor = _Step5WriteCursor(
+        conn, False, logging.getLogger(__name__), use_multi_statements=True
+    )
+    assert not next_cursor._use_multi_statements
+
+
+def test_multi_statements_flag_only_inside_opt_in(accessor):
+    with patch.object(mysql_connector, "connect") as connect:
+        accessor._get_new_connection()
+        with accessor.multi_statements() as enabled:
+            accessor._get_new_connection()
+
+    assert enabled
+    assert "client_flags" not in connect.call_args_list[0].kwargs
+    assert connect.call_args_list[1].kwargs["client_flags"] == [
+        mysql_connector.constants.ClientFlag.MULTI_STATEMENTS
+    ]
+
+
+def test_lap_positions_chunks_bypass_prepared_statements():
+    conn = MagicMock()
+    plain_cursor = MagicMock()
+    conn.cursor.side_effect = lambda prepared=False: (
+        MagicMock() if prepared else plain_cursor
+    )
+    saver = Step5Saver(MagicMock(), lap_positions_chunk_size=2)
+    cursor = _Step5WriteCursor(conn, True, logging.getLogger(__name__))
+    rows = [(f"r{i}", "[]", "[]", "[]", "[]", "[]") for i in range(3)]
+
+    # 2行と1行のチャンクで文の形が変わっても、プリペアドステートメントは作らない
+    saver._insert_lap_positions_with_cursor(rows, cursor)
+
+    assert plain_cursor.execute.call_count == 2
+    conn.cursor.assert_called_once_with()
+
+
+def test_tolerated_lap_status_failure_does_not_abort_buffered_statements():
+    sent = []
+
+    def execute(sql, params=None, **kwargs):
+        for statement in sql.split(";\n"):
+            if statement.startswith("INSERT INTO lap_data_status"):
+                raise mysql_connector.Error(msg="lap_data_status locked", errno=1205)
+        sent.append(sql)
+        return iter([])
+
+    conn = MagicMock()
+    conn.cursor.return_value.execute.side_effect = execute
+    conn.cursor.return_value.executemany.side_effect = execute
+    saver = Step5Saver(MagicMock(), use_multi_statements=True)
+    cursor = _Step5WriteCursor(
+        conn, False, logging.getLogger(__name__), use_multi_statements=True
+    )
+
+    lap_hs = '[[1, "A", 10, 20, true]]'
+
+    # is_processed の更新失敗は記録だけして続ける (例外を送出しない)
+    saver._save_lap_positions_batch_with_cursor(
+        [{"race_id": "r1", "data": {"lap_data_by_section": {"lap_hs": lap_hs}}}],
+        cursor,
+    )
+    cursor.flush()
+
+    assert any(sql.startswith("INSERT INTO lap_positions") for sql in sent)
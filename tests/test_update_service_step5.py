@@ -0,0 +1,45 @@
+"""
+UpdateService._update_step5 の対象レース抽出失敗時の挙動のテスト
+"""
+
+import logging
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("mysql.connector")
+pytest.importorskip("requests")
+
+from database.extractors.extract_data_for_step5 import (  # noqa: E402
+    Step5DataExtractor,
+)
+from services.update_service import UpdateService  # noqa: E402
+
+
+def _service_with_failing_db():
+    database = MagicMock()
+    del database.get_yenjoy_races_to_update_for_step5
+    database.execute_query.side_effect = RuntimeError("DB down")
+    service = UpdateService.__new__(UpdateService)
+    service.logger = logging.getLogger(__name__)
+    service.__dict__["step5_extractor"] = Step5DataExtractor(database, service.logger)
+    service.__dict__["step5_updater"] = MagicMock()
+    return service
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"start_date": "2024-01-01", "end_date": "2024-01-02"},
+        {"start_date": None, "end_date": None, "specific_race_ids": ["r1"]},
+    ],
+)
+def test_extraction_error_fails_step5(kwargs):
+    service = _service_with_failing_db()
+
+    success, message, count = service._update_step5(**kwargs)
+
+    assert not success
+    assert "DB Error" in message
+    assert count == 0
+    service.step5_updater.update_results_bulk_for_races.assert_not_called()
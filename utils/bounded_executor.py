@@ -0,0 +1,87 @@
+"""
+共有 ThreadPoolExecutor のラッパー
+
+複数の Updater で1つの executor を共有しつつ、Updater ごとの同時実行数の上限を保つために使う。
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from itertools import islice
+from typing import Any, Callable, Deque, Iterable, Iterator, Set
+
+
+class BoundedExecutor:
+    """
+    共有 executor に投入するタスクの同時実行数を max_in_flight までに制限する。
+    with 文で使えるが、終了時に共有 executor を shutdown しない (結果は各 Future から取得する)。
+    """
+
+    def __init__(self, executor: Executor, max_in_flight: int):
+        self._executor = executor
+        self._semaphore = threading.BoundedSemaphore(max(1, max_in_flight))
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """上限に達している場合は空きが出るまで待ってから投入する"""
+        self._semaphore.acquire()
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._semaphore.release()
+            raise
+        future.add_done_callback(lambda _: self._semaphore.release())
+        return future
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+def iter_completed(
+    executor: Executor, fn: Callable[[Any], Any], items: Iterable[Any], window: int
+) -> Iterator[Any]:
+    """
+    items の要素ごとに fn(item) を executor に投入し、終わった順に結果を返す。
+
+    未完了の Future を window 件までに抑え、結果を1件返すごとに次の要素を投入する
+    (全件を先に投入して待たされたり、返し終えた Future を保持し続けたりしない)。
+    途中で反復をやめた場合、まだ始まっていないタスクは取り消す。
+    """
+    remaining = iter(items)
+    pending: Set[Future] = {
+        executor.submit(fn, item) for item in islice(remaining, max(1, window))
+    }
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            while done:
+                result = done.pop().result()
+                yield result
+                for item in islice(remaining, 1):
+                    pending.add(executor.submit(fn, item))
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def iter_in_order(
+    executor: Executor, fn: Callable[[Any], Any], items: Iterable[Any], window: int
+) -> Iterator[Any]:
+    """
+    iter_completed と同じく window 件までを先行して投入するが、結果は items の順に返す
+    """
+    remaining = iter(items)
+    pending: Deque[Future] = deque(
+        executor.submit(fn, item) for item in islice(remaining, max(1, window))
+    )
+    try:
+        while pending:
+            result = pending.popleft().result()
+            yield result
+            for item in islice(remaining, 1):
+                pending.append(executor.submit(fn, item))
+    finally:
+        for future in pending:
+            future.cancel()
@@ -4,8 +4,8 @@
 このモジュールには、日付操作に関連するユーティリティ関数が含まれています。
 """
 
-from datetime import datetime, timedelta
-from typing import List, Tuple
+from datetime import date, datetime, timedelta
+from typing import List, Tuple, Union
 
 
 def get_yesterday() -> str:
@@ -70,6 +70,58 @@ def format_date(date: datetime) -> str:
     return date.strftime("%Y%m%d")
 
 
+def to_ymd(value: Union[str, date, datetime]) -> str:
+    """
+    日付を「YYYY-MM-DD」形式の文字列にする (strftime を使わない高速版)
+
+    Args:
+        value: 日付文字列（YYYY-MM-DD で始まる形式）、date または datetime
+
+    Returns:
+        str: 日付文字列（YYYY-MM-DD形式）
+    """
+    if isinstance(value, str):
+        return value[:10]
+    return value.isoformat()[:10]
+
+
+def parse_ymd(date_str: str) -> date:
+    """
+    「YYYYMMDD」または「YYYY-MM-DD」形式の文字列を date に変換する (strptime を使わない高速版)
+
+    Args:
+        date_str: 日付文字列
+
+    Returns:
+        date: 変換された date
+
+    Raises:
+        ValueError: 日付として解釈できない場合
+    """
+    digits = date_str.replace("-", "")
+    if len(digits) != 8 or not digits.isdigit():
+        raise ValueError(f"日付形式が不正です: {date_str}")
+    return date(int(digits[:4]), int(digits[4:6]), int(digits[6:8]))
+
+
+def iter_months(first: date, last: date) -> List[Tuple[int, int]]:
+    """
+    first の月から last の月までの (年, 月) のリストを返す
+
+    Args:
+        first: 開始日
+        last: 終了日
+
+    Returns:
+        List[Tuple[int, int]]: (年, 月) のリスト（first > last の場合は空）
+    """
+    first_index = first.year * 12 + first.month - 1
+    last_index = last.year * 12 + last.month - 1
+    return [
+        (index // 12, index % 12 + 1) for index in range(first_index, last_index + 1)
+    ]
+
+
 def format_date_display(date_str: str) -> str:
     """
     日付文字列を表示用に整形する